@@ -0,0 +1,105 @@
+// C interface of the solver used by the Python module src/native.py.
+//
+// The problem is passed as plain arrays indexed by the node id (sources first,
+// then the nodes to visit, and the depot last), so that nothing is parsed again.
+//
+// Build:  c++ -O3 -std=c++17 -shared -fPIC binding.cc -o libmstop.so
+
+#include <vector>
+
+#include "utils.h"
+#include "solver.h"
+
+
+using std::vector;
+
+
+// codes used for the kind of each node (same as src/shared.py)
+const int NODE = 0, SOURCE = 1, DEPOT = 2;
+
+// codes of the algorithms
+const int HEURISTIC = 0, METAHEURISTIC = 1, INTENSIVE_METAHEURISTIC = 2;
+
+
+
+extern "C" {
+
+
+int mstop_solve (
+    // the problem
+    int n_nodes, int n_vehicles, float Tmax, const float* dists, const float* coords,
+    const int* kinds, const int* revenues, const int* vehicles,
+    // the algorithm and its parameters (alpha < 0 means it is optimised, seed 0 means non deterministic)
+    int algorithm, float* alpha, float minbeta, float maxbeta, int maxiter, int nelites, unsigned int seed,
+    // the solution
+    int* revenue, float* cost, int* mapping,
+    int* route_sources, int* route_lengths, int* route_nodes, float* route_costs, int* route_revenues
+) {
+
+    // seed the random engines (they are global, so the seed of a call must not leak into the next one)
+    seed_engines(seed);
+
+    // build the problem
+    vector<vector<float>> matrix (n_nodes, vector<float>(n_nodes));
+    vector<Node*> sources, nodes;
+    Node* depot = nullptr;
+    vector<Edge*> edges;
+
+    for (int i = 0; i < n_nodes; i++) {
+        for (int j = 0; j < n_nodes; j++)
+            matrix[i][j] = dists[i * n_nodes + j];
+
+        Node* node = new Node(i, coords[2 * i], coords[2 * i + 1], revenues[i], kinds[i] == SOURCE, kinds[i] == DEPOT, vehicles[i]);
+        if (kinds[i] == SOURCE) sources.push_back(node);
+        else if (kinds[i] == DEPOT) depot = node;
+        else nodes.push_back(node);
+    }
+
+    for (Node* inode : nodes)
+        for (Node* jnode : nodes)
+            if (inode != jnode)
+                edges.push_back(new Edge(inode, jnode, matrix[inode->id][jnode->id]));
+
+    Problem problem (n_nodes, n_vehicles, Tmax, matrix, sources, nodes, depot, edges);
+
+    // set the savings
+    if (*alpha < 0.0f)
+        *alpha = optimize_alpha(problem);
+    set_savings(problem, *alpha);
+
+    // solve
+    Solution* solution;
+    if (algorithm == METAHEURISTIC)
+        solution = metaheuristic(problem, minbeta, maxbeta, maxiter);
+    else if (algorithm == INTENSIVE_METAHEURISTIC)
+        solution = intensive_metaheuristic(problem, minbeta, maxbeta, maxiter, nelites);
+    else
+        solution = heuristic(problem, GREEDY_BETA);
+
+    // export the solution
+    int S = sources.size();
+    int N = nodes.size();
+    *revenue = solution->revenue;
+    *cost = solution->cost;
+
+    for (int s = 0; s < S; s++)
+        for (int n = 0; n < S + N; n++)
+            mapping[s * (S + N) + n] = solution->mapping[s][n];
+
+    int n_routes = 0, k = 0;
+    for (Route* route : solution->routes) {
+        route_sources[n_routes] = route->source->id;
+        route_lengths[n_routes] = route->nodes.size();
+        route_costs[n_routes] = route->cost;
+        route_revenues[n_routes] = route->revenue;
+        for (Node* node : route->nodes)
+            route_nodes[k++] = node->id;
+        n_routes++;
+    }
+
+    delete solution;
+    return n_routes;
+}
+
+
+}
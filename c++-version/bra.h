@@ -12,6 +12,34 @@ mt19937 random_engine(random_device{}());
 uniform_real_distribution<float> rndfloat (0.0000001, 1.0);
 
 
+// master seed of the random engines (0 means non deterministic) and number of engines created
+unsigned int master_seed = 0;
+unsigned int engines_count = 0;
+
+
+// set the master seed and reset the engines (e.g., for reproducible benchmarks),
+// the seed 0 makes them non deterministic again
+void seed_engines (unsigned int seed) {
+    master_seed = seed;
+    engines_count = 0;
+    if (seed == 0) {
+        random_engine.seed(random_device{}());
+        return;
+    }
+    seed_seq sequence {seed};
+    random_engine.seed(sequence);
+}
+
+
+// a new random engine (each engine is seeded differently from the master seed)
+mt19937 make_engine () {
+    if (master_seed == 0)
+        return mt19937(random_device{}());
+    seed_seq sequence {master_seed, ++engines_count};
+    return mt19937(sequence);
+}
+
+
 int BRA (int n_options, float beta) {
     int i = (int) log(rndfloat(random_engine)) / log( 1.0 - beta );
     int idx = i % n_options;
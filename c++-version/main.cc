@@ -2,6 +2,7 @@
 #include <chrono>
 #include <fstream>
 #include <string>
+#include <algorithm>
 
 #include "utils.h"
 #include "solver.h"
@@ -15,9 +16,21 @@ using namespace std::chrono;
 
 
 
-int main ()
+// Usage: ./main [<seed> [<output> [<instance> <instance> ...]]]
+//
+// With a seed different from 0 the random engines are deterministic, the results
+// are written in the output file (results.txt by default), and, if some instances
+// are given, only those instances are solved.
+int main (int argc, char* argv[])
 {
 
+  unsigned int seed = (argc > 1) ? (unsigned int) std::stoul(argv[1]) : 0;
+  string output = (argc > 2) ? argv[2] : "results.txt";
+  vector<string> selected (argv + std::min(argc, 3), argv + argc);
+
+  if (seed != 0)
+    seed_engines(seed);
+
   
   auto filenames = vector<vector<string>> {
     {"g12_4_k.txt","p1.4.k.txt","p2.4.k.txt",""},
@@ -79,13 +92,23 @@ int main ()
   };
 
 
+  // keep only the selected instances
+  if (!selected.empty()) {
+    vector<vector<string>> filtered;
+    for (vector<string> filename : filenames)
+      if (std::find(selected.begin(), selected.end(), filename[0]) != selected.end())
+        filtered.push_back(filename);
+    filenames = filtered;
+  }
+
+
   // clean the file 
-  ofstream toclean ("results.txt");
+  ofstream toclean (output);
   toclean << "";
   toclean.close();
 
   // header
-  ofstream outfile ("results.txt", std::ios_base::app);
+  ofstream outfile (output, std::ios_base::app);
   if (outfile.is_open()) {
     outfile << "Problem, P1, P2, P3, HeurC, HeurR, HeurT, RTMetaC, RTMetaR, RTMetaT, IntMetaC, IntMetaR, IntMetaT, SepHeurC, SepHeurR, SepHeurT, SepMetaC, SepMetaR, SepMetaT,\n";
     outfile.close();
@@ -94,7 +117,7 @@ int main ()
 
   for (vector<string> filename : filenames) {
     
-    ofstream outfile ("results.txt", std::ios_base::app);
+    ofstream outfile (output, std::ios_base::app);
 
     if (outfile.is_open()) {
       // read multi source problem
@@ -167,16 +190,17 @@ int main ()
 
         Problem ss_problem = read_single_source("../tests/single/" + filename[i]);
         ss_problem.Tmax = problem.Tmax;
+        set_savings(ss_problem, alpha);
 
         unordered_map<int,Node*> nodes;
 
-        for (Node* n : problem.nodes) {
+        for (Node* n : ss_problem.nodes) {
           nodes[n->id] = n;
         }
 
         start = high_resolution_clock::now();
 
-        PJS_Solution* pjs_solution = PJS(problem, problem.sources[0], problem.depot, nodes, GREEDY_BETA);
+        PJS_Solution* pjs_solution = PJS(ss_problem, ss_problem.sources[0], ss_problem.depot, nodes, GREEDY_BETA);
 
         stop = high_resolution_clock::now();
 
@@ -204,16 +228,17 @@ int main ()
 
         Problem ss_problem = read_single_source("../tests/single/" + filename[i]);
         ss_problem.Tmax = problem.Tmax;
+        set_savings(ss_problem, alpha);
 
         unordered_map<int,Node*> nodes;
 
-        for (Node* n : problem.nodes) {
+        for (Node* n : ss_problem.nodes) {
           nodes[n->id] = n;
         }
 
         start = high_resolution_clock::now();
 
-        PJS_Solution* pjs_solution = MultiStartPJS(problem, problem.sources[0], problem.depot, nodes, 0.1, 0.3, 1000);
+        PJS_Solution* pjs_solution = MultiStartPJS(ss_problem, ss_problem.sources[0], ss_problem.depot, nodes, 0.1, 0.3, 1000);
 
         stop = high_resolution_clock::now();
 
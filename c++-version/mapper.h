@@ -22,7 +22,7 @@ using Mapping = vector<vector<int>>;
 Mapping mapper (const Problem& problem, float beta) {
 
     // move useful variables to the stack 
-    auto dists = problem.dists;
+    const auto& dists = problem.dists;
     int N = problem.nodes.size();
     int S = problem.sources.size();
     auto sources = problem.sources;
@@ -65,9 +65,12 @@ Mapping mapper (const Problem& problem, float beta) {
 
     }
 
-    // sort preferences 
+    // sort preferences (stable, so that ties keep the order of the nodes as in the Python
+    // version, instead of being broken by the addresses of the nodes)
     for (Node* source : sources) {
-        sort(source->preferences.begin(), source->preferences.end());
+        stable_sort(source->preferences.begin(), source->preferences.end(), [](const pair<float, Node*>& a, const pair<float, Node*>& b) {
+            return a.first < b.first;
+        });
     }
 
     // round-robin assignment process
@@ -53,7 +53,7 @@ struct PJS_Solution {
 PJS_Solution*   PJS (Problem& problem, Node* source, Node* depot, const unordered_map<int,Node*>& nodes, float beta) {
 
     // move useful variables to the stack
-    auto dists = problem.dists;
+    const auto& dists = problem.dists;
     int sourceid = source->id;
     int depotid = depot->id;
     float Tmax = problem.Tmax;
@@ -87,8 +87,8 @@ PJS_Solution*   PJS (Problem& problem, Node* source, Node* depot, const unordere
     }
 
 
-    // sort the savings list 
-    sort( edges.begin(), edges.end(), [&]( Edge* iedge, Edge* jedge){
+    // sort the savings list (stable, as in the Python version)
+    stable_sort( edges.begin(), edges.end(), [&]( Edge* iedge, Edge* jedge){
         return iedge->savings[sourceid] > jedge->savings[sourceid];
     });
 
@@ -121,6 +121,7 @@ PJS_Solution*   PJS (Problem& problem, Node* source, Node* depot, const unordere
         // if all conditions are respected, the routes are merged 
         iroute->merge(jroute, edge);
         routes.erase( std::find(routes.begin(), routes.end(), jroute) );
+        delete jroute;
 
     }
 
@@ -133,6 +134,8 @@ PJS_Solution*   PJS (Problem& problem, Node* source, Node* depot, const unordere
             return iroute->revenue > jroute->revenue;
         });
 
+        for (auto r = routes.begin() + n_vehicles; r != routes.end(); ++r)
+            delete *r;
         routes.resize(n_vehicles);
     }
 
@@ -53,7 +53,7 @@ struct Solution {
 
 void set_savings (Problem& problem, float alpha) {
 
-    auto dists = problem.dists;
+    const auto& dists = problem.dists;
     auto depotid = problem.depot->id;
 
     for (Edge* edge : problem.edges) {
@@ -97,6 +97,10 @@ Solution* heuristic (Problem& problem, float beta) {
         revenue += pjs_solution->revenue;
         routes.insert( routes.end(), pjs_solution->routes.begin(), pjs_solution->routes.end() );
 
+        // the routes are now owned by the solution
+        pjs_solution->routes.clear();
+        delete pjs_solution;
+
     }
 
     return new Solution (mapping, routes, revenue, cost);
@@ -138,7 +142,7 @@ float optimize_alpha ( Problem& problem )
 Solution* metaheuristic ( Problem& problem, float minbeta, float maxbeta, int maxiter) {
 
     // random engine
-    std::mt19937 random_engine(std::random_device{}());
+    std::mt19937 random_engine = make_engine();
     std::uniform_real_distribution<float> randombeta (minbeta, maxbeta);
 
     // generate starting greedy solution
@@ -154,7 +158,10 @@ Solution* metaheuristic ( Problem& problem, float minbeta, float maxbeta, int ma
 
         // eventually update new best
         if ( newSolution->revenue > best->revenue ) {
+            delete best;
             best = newSolution;
+        } else {
+            delete newSolution;
         }
 
     }
@@ -169,7 +176,7 @@ Solution* metaheuristic ( Problem& problem, float minbeta, float maxbeta, int ma
 Solution* intensive_metaheuristic ( Problem& problem, float minbeta, float maxbeta, int maxiter, int nelites) {
 
     // random engine
-    std::mt19937 random_engine(std::random_device{}());
+    std::mt19937 random_engine = make_engine();
     std::uniform_real_distribution<float> randombeta (minbeta, maxbeta);
 
     // generate the heap of elite solutions (i.e., sorted form the worst to the best)
@@ -195,13 +202,15 @@ Solution* intensive_metaheuristic ( Problem& problem, float minbeta, float maxbe
         if ( newSolution->revenue > worst_revenue || elites.size() < nelites ) {
             elites.push_back(make_pair (-newSolution->revenue, newSolution) );
             push_heap( elites.begin(), elites.end() );
+        } else {
+            delete newSolution;
         }
         
         // if elites heap is getting too long remove the worst solution
         if ( elites.size() > nelites ){
             pop_heap(elites.begin(), elites.end());
+            delete elites.back().second;
             elites.pop_back();
-            delete worst_element.second;
         } 
     }
 
@@ -215,9 +224,11 @@ Solution* intensive_metaheuristic ( Problem& problem, float minbeta, float maxbe
     for ( pair<int, Solution*> elite : elites ) {
         
         // consider the current elite mapping and delete the solution
+        // (unless it is the current best)
         Solution* elite_solution = elite.second;
         Mapping mapping = elite_solution->mapping;
-        delete elite_solution;
+        if (elite_solution != best)
+            delete elite_solution;
 
         // generate a new solution
         vector<Route*> routes;
@@ -249,8 +260,12 @@ Solution* intensive_metaheuristic ( Problem& problem, float minbeta, float maxbe
                 // generate new solution
                 PJS_Solution* new_pjs_solution = PJS(problem, source, problem.depot, nodes, beta);
 
-                if (new_pjs_solution->revenue > pjs_solution->revenue)
+                if (new_pjs_solution->revenue > pjs_solution->revenue) {
+                    delete pjs_solution;
                     pjs_solution = new_pjs_solution;
+                } else {
+                    delete new_pjs_solution;
+                }
 
             }
 
@@ -258,11 +273,20 @@ Solution* intensive_metaheuristic ( Problem& problem, float minbeta, float maxbe
             revenue += pjs_solution->revenue;
             routes.insert( routes.end(), pjs_solution->routes.begin(), pjs_solution->routes.end() );
 
+            // the routes are now owned by the elite solution
+            pjs_solution->routes.clear();
+            delete pjs_solution;
+
         } 
 
         // if the elite is better than the best, update the best solution
-        if (revenue > best->revenue) 
+        if (revenue > best->revenue) {
+            delete best;
             best = new Solution (mapping, routes, revenue, cost);
+        } else {
+            for (auto r : routes)
+                delete r;
+        }
 
     }
 
@@ -279,7 +303,7 @@ PJS_Solution* MultiStartPJS ( Problem& problem, Node* source, Node* depot, const
 {
 
     // random engine
-    std::mt19937 random_engine(std::random_device{}());
+    std::mt19937 random_engine = make_engine();
     std::uniform_real_distribution<float> randombeta (minbeta, maxbeta);
 
     PJS_Solution* best = PJS(problem, source, problem.depot, nodes, GREEDY_BETA);
@@ -294,8 +318,12 @@ PJS_Solution* MultiStartPJS ( Problem& problem, Node* source, Node* depot, const
         // generate new solution
         PJS_Solution* newsol = PJS(problem, source, problem.depot, nodes, beta);
 
-        if (newsol->revenue > best->revenue)
+        if (newsol->revenue > best->revenue) {
+            delete best;
             best = newsol;
+        } else {
+            delete newsol;
+        }
 
     }
 
@@ -0,0 +1,111 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import time
+
+
+
+class Trajectory:
+    """
+    An instance of this class records the trajectory of the incumbent (i.e., the best
+    revenue found so far) during a search, as points (elapsed time, iteration, revenue)
+    added each time the incumbent improves.
+
+    The same trajectory can be passed to several phases of an algorithm (e.g., the
+    multistart that keeps the elites and then the optimisation of the elites), the
+    iterations and the time keep counting from one phase to the next.
+
+    The trajectories of parallel processes can be merged (see extend) when they are
+    started at the same time (time.perf_counter is the same clock for all the processes
+    of a machine).
+    """
+    def __init__(self, start=None):
+        """
+        Initialise.
+
+        :param start: The time.perf_counter() the clock starts from (by default now).
+
+        :attr points: The improvements of the incumbent as (elapsed, iteration, revenue).
+        :attr iterations: The number of iterations recorded.
+        :attr elapsed: The time of the last iteration recorded.
+        """
+        self.points = []
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.start = time.perf_counter() if start is None else start
+
+    @property
+    def revenue (self):
+        """ The revenue of the incumbent (None if nothing has been recorded). """
+        return self.points[-1][2] if self.points else None
+
+    def record (self, revenue, iterations=1):
+        """
+        This method records some iterations and the revenue of the solution they found.
+
+        :param revenue: The revenue of the solution (None if unknown, e.g., pruned).
+        :param iterations: The number of iterations made to find it.
+        """
+        self.iterations += iterations
+        self.elapsed = time.perf_counter() - self.start
+        if revenue is not None and (not self.points or revenue > self.points[-1][2]):
+            self.points.append((self.elapsed, self.iterations, revenue))
+
+    def extend (self, points):
+        """
+        This method merges the points recorded by another trajectory with the same start
+        (e.g., in another process): the points that do not improve the incumbent at their
+        time are discarded.
+
+        NOTE: The iteration of a point is the one of the trajectory that recorded it.
+
+        :param points: The points as (elapsed, iteration, revenue).
+        """
+        merged = []
+        for point in sorted(self.points + list(points)):
+            if not merged or point[2] > merged[-1][2]:
+                merged.append(point)
+        self.points = merged
+        self.elapsed = max(self.elapsed, merged[-1][0] if merged else 0.0)
+
+    def reached (self, target):
+        """
+        The first point whose revenue is at least the target.
+
+        :param target: The revenue to reach.
+        :return: The point as (elapsed, iteration, revenue), or None if it was never reached.
+        """
+        for point in self.points:
+            if point[2] >= target:
+                return point
+        return None
+
+
+
+def time_to_target (trajectories, target):
+    """
+    The distribution of the time to reach a target over many runs (e.g., different seeds).
+
+    :param trajectories: The trajectories of the runs.
+    :param target: The revenue to reach.
+    :return: The sorted times of the runs that reached the target, and the number of runs
+            that did not reach it.
+    """
+    points = [t.reached(target) for t in trajectories]
+    return sorted(p[0] for p in points if p is not None), sum(p is None for p in points)
+
+
+
+def quantiles (values, qs=(0.25, 0.5, 0.75)):
+    """ The quantiles of a sorted list of values (the nearest lower one, None if empty). """
+    return tuple(values[min(int(q * len(values)), len(values) - 1)] if values else None for q in qs)
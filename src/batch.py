@@ -0,0 +1,130 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import time
+import random
+import collections
+import concurrent.futures
+
+import utils
+import iterators
+import solver
+import shared
+
+
+# The result of an instance solved in a batch
+BatchResult = collections.namedtuple("BatchResult", ("index", "name", "revenue", "mapping", "routes", "alpha", "duration"))
+
+
+
+def _n_nodes (instance, path):
+    """ The number of nodes of an instance (only the first line of a file is read). """
+    if isinstance(instance, utils.Problem):
+        return instance.n_nodes
+    with open(path + instance, 'r') as file:
+        return int(next(file).replace('\n','').split(' ')[1])
+
+
+
+def _solve_task (index, instance, path, single, algorithm, maxiter, betarange, nelites, seed):
+    """
+    Solve an instance in a worker process.
+
+    :param instance: The name of the file, or the spec of a shared problem.
+    :return: The BatchResult (routes are sent back as (source id, nodes ids, revenue, cost)).
+    """
+    _start = time.perf_counter()
+    if isinstance(instance, dict):
+        problem = shared.attach(instance)
+    else:
+        read = utils.read_single_source if single else utils.read_multi_source
+        problem = read(instance, path=path)
+
+    alpha = solver.alpha_optimisation(problem)
+    if seed is not None:
+        random.seed(seed)
+
+    if algorithm == "heuristic":
+        revenue, mapping, routes = solver.heuristic(problem, iterators.greedy, alpha)
+    elif algorithm == "multistart":
+        revenue, mapping, routes = solver.multistart(problem, alpha, maxiter, betarange)
+    elif algorithm == "optimise_elites":
+        elites = solver.multistart_keep_elites(problem, alpha, maxiter, betarange, nelites)
+        revenue, mapping, routes = solver.optimise_elites(problem, elites, alpha, maxiter, betarange)
+    else:
+        raise Exception(f"Unknown algorithm {algorithm}.")
+
+    routes = tuple((r.source.id, tuple(n.id for n in r.nodes), r.revenue, r.cost) for r in routes)
+    return BatchResult(index, problem.name, revenue, mapping, routes, alpha, time.perf_counter() - _start)
+
+
+
+def solve_batch (instances, algorithm="multistart", maxiter=1000, betarange=(0.1, 0.3), nelites=5, *,
+                 path="../tests/multi/", single=False, processes=None, seed=None):
+    """
+    This method solves many instances in a single call, on a pool of processes.
+
+    The instances are scheduled from the most expensive to the cheapest (i.e., by
+    number of nodes times number of iterations) so that the longest ones do not
+    start last and delay the end of the batch.
+    Problem instances are passed to the workers through shared memory.
+
+    :param instances: The names of the files and/or the Problem instances to solve.
+    :param algorithm: The algorithm (i.e., heuristic, multistart, or optimise_elites).
+    :param maxiter: The number of iterations.
+    :param betarange: The range of the beta parameter to use in the biased randomisation.
+    :param nelites: The number of elite solutions (only optimise_elites).
+    :param path: The path where the files are.
+    :param single: True if the files are single-source instances.
+    :param processes: The number of processes (by default the number of cores).
+    :param seed: If given, the instance in position i is solved with seed + i.
+    :return: A generator of BatchResult in the order the instances are solved, where
+            index is the position of the instance in the given list.
+    """
+    iterations = 1 if algorithm == "heuristic" else maxiter
+    order = sorted(range(len(instances)), key=lambda i: _n_nodes(instances[i], path) * iterations, reverse=True)
+
+    shared_problems = []
+    try:
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = []
+            for i in order:
+                instance = instances[i]
+                if isinstance(instance, utils.Problem):
+                    shared_problems.append(shared.SharedProblem(instance))
+                    instance = shared_problems[-1].spec
+                futures.append(executor.submit(_solve_task, i, instance, path, single, algorithm, maxiter,
+                                               betarange, nelites, None if seed is None else seed + i))
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+    finally:
+        for shared_problem in shared_problems:
+            shared_problem.close()
+
+
+
+
+if __name__ == "__main__":
+
+    filenames = sorted(os.listdir("../tests/multi/"))
+
+    _start = time.time()
+
+    for result in solve_batch(filenames, "multistart", maxiter=100, seed=0):
+
+        print(f"{result.name:<15} revenue: {result.revenue:<6} time: {result.duration:.2f}s")
+
+    print(f"Total time: {time.time() - _start:.2f}s")
+
+    print("Program concluded \u2764\uFE0F")
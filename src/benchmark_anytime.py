@@ -0,0 +1,95 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+
+import utils
+import solver
+import anytime
+from pjs import multistartPJS
+
+
+# The fractions of the best revenue used as targets
+TARGETS = (0.95, 0.99, 1.0)
+
+
+
+def run (algorithm, problem, alpha, maxiter, seed):
+    """
+    A run of an algorithm with its trajectory.
+    NOTE: The cache of the PJS is cleared, so that no run reuses the routes of another one.
+    """
+    problem.routes_cache.clear()
+    trace = anytime.Trajectory()
+    if algorithm == "multistart":
+        solver.multistart(problem, alpha, maxiter, seed=seed, trace=trace)
+    elif algorithm == "elites":
+        elites = solver.multistart_keep_elites(problem, alpha, maxiter, seed=seed, trace=trace)
+        solver.optimise_elites(problem, elites, alpha, maxiter // 10, seed=seed, trace=trace)
+    elif algorithm == "multistartPJS":
+        multistartPJS(problem, problem.sources[0], problem.nodes, problem.depot, alpha, maxiter, (0.1, 0.3), seed=seed, trace=trace)
+    return trace
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_anytime.py [<seeds> [<iterations> [<multi-source instance> <single-source instance>]]]
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    maxiter = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    multi, single = sys.argv[3:5] if len(sys.argv) > 4 else ("g26_2_k.txt", "p6.2.k.txt")
+
+    experiments = (
+        (utils.read_multi_source(multi), ("multistart", "elites")),
+        (utils.read_single_source(single), ("multistartPJS",)),
+    )
+
+    with open("../results/Trajectories.csv", "w") as file:
+        file.write("Algorithm,Problem,Seed,Elapsed,Iteration,Revenue\n")
+    with open("../results/TimeToTarget.csv", "w") as file:
+        file.write("Algorithm,Problem,Target,Reached,Runs,Q1,Median,Q3\n")
+
+    for problem, algorithms in experiments:
+
+        alpha = solver.alpha_optimisation(problem)
+        solver.set_savings(problem, alpha)
+
+        trajectories = {a: [run(a, problem, alpha, maxiter, seed) for seed in range(seeds)] for a in algorithms}
+
+        with open("../results/Trajectories.csv", "a") as file:
+            for a, traces in trajectories.items():
+                for seed, trace in enumerate(traces):
+                    for elapsed, iteration, revenue in trace.points:
+                        file.write(f"{a},{problem.name},{seed},{elapsed:.6f},{iteration},{revenue}\n")
+
+        # The targets are relative to the best revenue found by any run on the problem
+        best = max(t.revenue for traces in trajectories.values() for t in traces)
+        print(f"{problem.name}    best revenue: {best}")
+
+        for a, traces in trajectories.items():
+
+            # When each run reached 99% of its own final revenue (as a fraction of its iterations)
+            fractions = sorted(t.reached(0.99 * t.revenue)[1] / t.iterations for t in traces)
+            print(f"    {a:<14} {sum(t.elapsed for t in traces) / seeds:8.3f} s/run    99% of the final revenue after "
+                  f"{anytime.quantiles(fractions, (0.5,))[0] * 100:5.1f}% of the iterations (median)")
+
+            for fraction in TARGETS:
+                times, missed = anytime.time_to_target(traces, fraction * best)
+                q1, median, q3 = anytime.quantiles(times)
+                with open("../results/TimeToTarget.csv", "a") as file:
+                    file.write(f"{a},{problem.name},{fraction * best},{len(times)},{seeds},{q1 or ''},{median or ''},{q3 or ''}\n")
+                times_str = "never reached" if not times else f"Q1 {q1:7.3f} s  median {median:7.3f} s  Q3 {q3:7.3f} s"
+                print(f"        target {fraction * 100:5.1f}% ({fraction * best:8.1f})   reached {len(times):>3}/{seeds}   {times_str}")
+
+    print("Program concluded \u2764\uFE0F")
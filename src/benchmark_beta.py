@@ -0,0 +1,58 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import random
+import statistics
+
+import utils
+import solver
+from reactive import ReactiveBeta
+
+
+
+def compare (problem, alpha, betarange=(0.05, 0.8), maxiter=300, seeds=range(3)):
+    """
+    This method compares the multistart with a uniform beta and with a reactive one.
+
+    :return: The mean revenue and the mean iteration the best solution was found at,
+            for the uniform and the reactive beta, and the last learned distribution.
+    """
+    results = {}
+    for mode in ("uniform", "reactive"):
+        revenues, iterations = [], []
+        for seed in seeds:
+            random.seed(seed)
+            stats, reactive = {}, ReactiveBeta(betarange, period=25) if mode == "reactive" else None
+            revenue, _, _ = solver.multistart(problem, alpha, maxiter, betarange, prune=True, stats=stats, reactive=reactive)
+            revenues.append(revenue)
+            iterations.append(stats["best_iteration"])
+        results[mode] = (statistics.fmean(revenues), statistics.fmean(iterations))
+    return results["uniform"], results["reactive"], reactive.distribution()
+
+
+
+
+if __name__ == "__main__":
+
+    for filename in sorted(os.listdir("../tests/multi/"), key=lambda i : len(i)):
+
+        problem = utils.read_multi_source(filename)
+        alpha = solver.alpha_optimisation(problem)
+
+        (revenue, iteration), (rrevenue, riteration), distribution = compare(problem, alpha)
+
+        print(f"{filename:<15} uniform: {revenue:8.1f} (best at {iteration:5.1f})    reactive: {rrevenue:8.1f} (best at {riteration:5.1f})    "
+              f"probabilities: {' '.join(f'{p:.2f}' for _, p in distribution)}")
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,48 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import time
+
+import utils
+import solver
+from delta import DeltaRouter
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_delta.py [<iterations> [<maxchange> <maxchange> ...]]
+    maxiter = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    maxchanges = [float(m) for m in sys.argv[2:]] or [0.1, 0.25, 0.5]
+
+    for filename in ("g26_2_k.txt", "g26_4_k.txt", "g456_2_c.txt", "g456_4_c.txt"):
+
+        problem = utils.read_multi_source(filename)
+        alpha = 0.3
+        solver.set_savings(problem, alpha)
+
+        for maxchange in [None] + maxchanges:
+            # NOTE: The cache is cleared, so that no run reuses the routes of another one
+            problem.routes_cache.clear()
+            delta = DeltaRouter(maxchange) if maxchange is not None else None
+
+            _start = time.perf_counter()
+            revenue, _, _ = solver.multistart(problem, alpha, maxiter, seed=0, delta=delta)
+            elapsed = time.perf_counter() - _start
+
+            mode = "PJS" if delta is None else f"delta {maxchange:.2f}"
+            info = "" if delta is None else f"   updates: {delta.updates:<6} rebuilds: {delta.rebuilds:<6} mean change: {delta.changed / max(delta.updates, 1):.1f} nodes"
+            print(f"{filename:<14} {mode:<11} revenue: {revenue:<6} {elapsed * 1000 / maxiter:8.2f} ms/iteration{info}")
+
+    print("Program concluded \u2764\uFE0F")
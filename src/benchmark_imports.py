@@ -0,0 +1,66 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import subprocess
+import statistics
+
+
+# The modules a worker process needs to solve a problem
+CORE_MODULES = ("iterators", "mapper", "pjs", "solver")
+
+# The modules that should never be loaded by a worker that does not plot
+PLOTTING_MODULES = ("matplotlib", "networkx")
+
+# The code executed by each fresh interpreter
+_SNIPPET = """
+import sys, time
+_start = time.perf_counter()
+import {modules}
+duration = time.perf_counter() - _start
+print(duration, *(m in sys.modules for m in {plotting}))
+"""
+
+
+
+def import_time (modules, repeat=10):
+    """
+    This method measures the time needed to import some modules in a fresh
+    interpreter (i.e., as it happens in a new pool worker).
+
+    :param modules: The names of the modules to import.
+    :param repeat: The number of fresh interpreters to start.
+    :return: The median import time in seconds, and the plotting modules
+            loaded as a side effect of the import.
+    """
+    code = _SNIPPET.format(modules=", ".join(modules), plotting=PLOTTING_MODULES)
+    times, loaded = [], set()
+    for _ in range(repeat):
+        output = subprocess.run((sys.executable, "-c", code), capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+        loaded.update(m for m, flag in zip(PLOTTING_MODULES, output[1:]) if flag == "True")
+    return statistics.median(times), loaded
+
+
+
+
+if __name__ == "__main__":
+
+    for modules in (CORE_MODULES, ("utils",), CORE_MODULES + ("utils",)):
+
+        duration, loaded = import_time(modules)
+
+        print(f"{', '.join(modules):<40} {duration * 1000:8.2f} ms    plotting loaded: {', '.join(sorted(loaded)) or 'none'}")
+
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,96 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import random
+import multiprocessing
+
+import utils
+import solver
+import shared
+import islands
+import anytime
+
+
+
+def _independent_task (alpha, maxiter, betarange, nelites, pjsiter, seed, start):
+    """ An independent run of multistart_keep_elites and optimise_elites in a worker process. """
+    problem = shared.worker_problem()
+    random.seed(seed)
+    trace = anytime.Trajectory(start)
+    elites = solver.multistart_keep_elites(problem, alpha, maxiter, betarange, nelites, trace=trace)
+    revenue, _, _ = solver.optimise_elites(problem, elites, alpha, pjsiter, betarange, trace=trace)
+    return revenue, trace.points
+
+
+
+def independent_runs (shared_problem, alpha, runs=4, maxiter=1000, betarange=(0.05, 0.5), nelites=5, pjsiter=1000, seed=0, trace=None):
+    """
+    This method executes independent runs of multistart_keep_elites and optimise_elites
+    in parallel, and returns the best revenue (the improvements of all the runs are merged
+    in the trace, see islands.island_model).
+    """
+    start = None if trace is None else trace.start
+    tasks = [(alpha, maxiter, betarange, nelites, pjsiter, seed + i, start) for i in range(runs)]
+    with multiprocessing.Pool(runs, initializer=shared.initializer, initargs=(shared_problem.spec,)) as pool:
+        results = pool.starmap(_independent_task, tasks)
+    if trace is not None:
+        for _, points in results:
+            trace.extend(points)
+    return max(revenue for revenue, _ in results)
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_islands.py [<seeds> [<instance> <instance> ...]]
+    # NOTE: The two algorithms have the same budget: each island (or run) makes EPOCHS * ITERATIONS
+    # iterations and optimises NELITES elites with PJSITER iterations of the multistart PJS.
+    ISLANDS, EPOCHS, ITERATIONS, NELITES, PJSITER, TARGETS = 4, 10, 50, 5, 200, (0.99, 1.0)
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    filenames = sys.argv[2:] or ["g26_2_k.txt", "g35_4_n.txt", "g146_2_c.txt"]
+
+    for filename in filenames:
+
+        problem = utils.read_multi_source(filename)
+        alpha = solver.alpha_optimisation(problem)
+        traces = {"independent": [], "islands": []}
+
+        with shared.SharedProblem(problem) as shared_problem:
+            for seed in range(seeds):
+                # NOTE: Each island (or run) uses the seed of the run plus its index
+                trace = anytime.Trajectory()
+                independent_runs(shared_problem, alpha, ISLANDS, EPOCHS * ITERATIONS, nelites=NELITES, pjsiter=PJSITER,
+                                 seed=seed * ISLANDS, trace=trace)
+                traces["independent"].append(trace)
+
+                trace = anytime.Trajectory()
+                islands.island_model(shared_problem, alpha, ISLANDS, EPOCHS, ITERATIONS, nelites=NELITES, maxiter=PJSITER,
+                                     seed=seed * ISLANDS, trace=trace)
+                traces["islands"].append(trace)
+
+        # The targets are relative to the best revenue found by any run on the problem
+        best = max(t.revenue for ts in traces.values() for t in ts)
+        print(f"{filename:<15} best revenue: {best}")
+        for name, ts in traces.items():
+            line = f"    {name:<12} final revenue (median): {anytime.quantiles(sorted(t.revenue for t in ts), (0.5,))[0]:<6}"
+            for fraction in TARGETS:
+                # NOTE: The runs that did not reach the target count as infinitely long
+                times, missed = anytime.time_to_target(ts, fraction * best)
+                median = anytime.quantiles(times + [float("inf")] * missed, (0.5,))[0]
+                line += f"   {fraction * 100:5.1f}%: {len(times)}/{seeds} reached, median " + (
+                    "   -    " if median == float("inf") else f"{median:6.2f} s")
+            print(line)
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,74 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import time
+import random
+
+import utils
+import iterators
+import solver
+import kernels
+from pjs import PJS, PJS_array
+
+
+
+def time_pjs (pjs, problem, repeat=50, betarange=(0.1, 0.3), seed=0):
+    """
+    This method measures the time needed by a PJS implementation to route
+    the nodes assigned to each source by the greedy mapper.
+
+    :param pjs: The PJS implementation.
+    :param problem: The problem instance (its savings must be already set).
+    :param repeat: The number of executions for each source.
+    :param betarange: The range of beta.
+    :param seed: The seed of the random module.
+    :return: The total time in seconds.
+    """
+    random.seed(seed)
+    subproblems = [(source, tuple(source.nodes)) for source in problem.sources]
+    _start = time.perf_counter()
+    for source, nodes in subproblems:
+        for _ in range(repeat):
+            pjs(problem, source, nodes, problem.depot, beta=random.uniform(*betarange))
+    return time.perf_counter() - _start
+
+
+
+
+if __name__ == "__main__":
+
+    print(f"Kernel compiled: {kernels.JIT}")
+
+    total_pjs, total_array = 0.0, 0.0
+
+    for filename in sorted(os.listdir("../tests/multi/"), key=lambda i : len(i)):
+
+        problem = utils.read_multi_source(filename)
+        alpha = solver.alpha_optimisation(problem)
+        solver.heuristic(problem, iterators.greedy, alpha)
+
+        # Warm up (i.e., the compilation of the kernel is not measured)
+        time_pjs(PJS_array, problem, repeat=1)
+
+        duration_pjs = time_pjs(PJS, problem)
+        duration_array = time_pjs(PJS_array, problem)
+        total_pjs += duration_pjs
+        total_array += duration_array
+
+        print(f"{filename:<15} PJS: {duration_pjs:8.3f} s    PJS_array: {duration_array:8.3f} s    speedup: {duration_pjs / duration_array:6.2f}x")
+
+
+    print(f"{'Total':<15} PJS: {total_pjs:8.3f} s    PJS_array: {total_array:8.3f} s    speedup: {total_pjs / total_array:6.2f}x")
+
+    print("Program concluded \u2764\uFE0F")
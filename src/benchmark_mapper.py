@@ -0,0 +1,53 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import time
+import random
+import functools
+
+import iterators
+import generator
+from mapper import mapper
+
+
+
+def time_mapper (problem, iterator, repeat=20):
+    """ The mean time of a call to the mapper in seconds. """
+    _start = time.perf_counter()
+    for _ in range(repeat):
+        mapper(problem, iterator)
+    return (time.perf_counter() - _start) / repeat
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_mapper.py [<nodes> <sources> <sources> ...]
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    n_sources = [int(s) for s in sys.argv[2:]] or [5, 10, 20, 40, 60]
+
+    random.seed(0)
+
+    for S in n_sources:
+
+        problem = generator.generate(n_nodes, S, layout="clustered", seed=0)
+
+        greedy = time_mapper(problem, iterators.greedy)
+        bra = time_mapper(problem, functools.partial(iterators.BRA, beta=0.3))
+
+        print(f"nodes: {n_nodes:<6} sources: {S:<4} greedy: {greedy * 1000:8.2f} ms ({greedy * 1000 / S:6.3f} ms per source)    "
+              f"BRA: {bra * 1000:8.2f} ms ({bra * 1000 / S:6.3f} ms per source)")
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,166 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+import utils
+import iterators
+import solver
+import native
+from pjs import PJS, multistartPJS
+from streams import derive
+
+
+# The algorithms compared (same names as the columns of the C++ results.txt)
+ALGORITHMS = ("Heur", "RTMeta", "IntMeta", "SepHeur", "SepMeta")
+
+
+
+def run_native (instances, seed, executable=None):
+    """
+    This method runs the main of the C++ version on some instances and reads its results.
+
+    :param instances: The names of the multi-source instances.
+    :param seed: The master seed of the random engines of the C++ version.
+    :param executable: The compiled main (see native.build_executable).
+    :return: A dictionary {instance: (singles, {algorithm: (revenue, cost, seconds)})}, where
+            singles are the names of the single-source problems combined in the instance.
+    """
+    executable = executable or native.build_executable()
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "results.txt")
+        subprocess.run((executable, str(seed), output, *instances), cwd=native.CPP_DIR, check=True, stdout=subprocess.DEVNULL)
+        with open(output, "r") as file:
+            lines = file.readlines()[1:]
+
+    results = {}
+    for line in lines:
+        fields = [f.strip() for f in line.split(",")]
+        singles = tuple(f for f in fields[1:4] if f)
+        values = [float(f) for f in fields[4:4 + 3 * len(ALGORITHMS)]]
+        # NOTE: In results.txt each algorithm is written as cost, revenue, and milliseconds
+        results[fields[0]] = (singles, {a: (values[3 * k + 1], values[3 * k], values[3 * k + 2] / 1000)
+                                        for k, a in enumerate(ALGORITHMS)})
+    return results
+
+
+
+def _timed (function):
+    """ The revenue, the cost, and the seconds of a function that returns (revenue, routes). """
+    _start = time.time()
+    revenue, routes = function()
+    return revenue, sum(r.cost for r in routes), time.time() - _start
+
+
+
+def run_python (instance, singles, seed, maxiter=1000, betarange=(0.1, 0.3), nelites=5):
+    """
+    This method runs the Python version with the same algorithms and parameters of the
+    main of the C++ version.
+
+    :param instance: The name of the multi-source instance.
+    :param singles: The names of the single-source problems combined in the instance.
+    :param seed: The master seed of the random streams (see streams).
+    :return: A dictionary {algorithm: (revenue, cost, seconds)}.
+    """
+    problem = utils.read_multi_source(instance)
+    alpha = solver.alpha_optimisation(problem)
+    solver.set_savings(problem, alpha)
+
+    def _heuristic ():
+        revenue, mapping, routes = solver.heuristic(problem, iterators.greedy, alpha)
+        return revenue, routes
+
+    def _multistart ():
+        revenue, mapping, routes = solver.multistart(problem, alpha, maxiter, betarange, seed=seed)
+        return revenue, routes
+
+    def _intensive ():
+        elites = solver.multistart_keep_elites(problem, alpha, maxiter, betarange, nelites, seed=seed)
+        revenue, mapping, routes = solver.optimise_elites(problem, elites, alpha, maxiter, betarange, seed=seed)
+        return revenue, routes
+
+    results = {"Heur": _timed(_heuristic), "RTMeta": _timed(_multistart), "IntMeta": _timed(_intensive)}
+
+    # The single-source problems solved separately (the results are summed)
+    separated = {"SepHeur": [0, 0.0, 0.0], "SepMeta": [0, 0.0, 0.0]}
+    for k, name in enumerate(singles):
+        prob = utils.read_single_source(name)
+        prob.Tmax = problem.Tmax
+        solver.set_savings(prob, alpha)
+
+        def _pjs ():
+            routes = PJS(prob, prob.sources[0], prob.nodes, prob.depot, beta=0.9999)
+            return sum(r.revenue for r in routes), routes
+
+        def _mspjs ():
+            routes, revenue = multistartPJS(prob, prob.sources[0], prob.nodes, prob.depot, alpha, maxiter, betarange,
+                                            seed=derive(seed, k))
+            return revenue, routes
+
+        for algorithm, function in (("SepHeur", _pjs), ("SepMeta", _mspjs)):
+            separated[algorithm] = [x + y for x, y in zip(separated[algorithm], _timed(function))]
+
+    results.update((a, tuple(v)) for a, v in separated.items())
+    return results
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_native.py [<seed> [<tolerance> [<slowdown> [<instance> <instance> ...]]]]
+    # A QUALITY flag is raised when the revenues differ more than tolerance (relative to the C++
+    # version), and a SPEED flag when the Python version is more than slowdown times slower.
+    # NOTE: The two versions use different random generators, so with the same seed both are
+    # reproducible but the stochastic algorithms are only comparable on average.
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    slowdown = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    instances = sys.argv[4:] or sorted(os.listdir("../tests/multi/"), key=lambda i : len(i))
+
+    cc_results = run_native(instances, seed)
+
+    rows, flags = [], 0
+    for instance in instances:
+
+        if instance not in cc_results:
+            print(f"{instance:<15} not solved by the C++ version")
+            continue
+
+        singles, cc = cc_results[instance]
+        py = run_python(instance, singles, seed)
+
+        for algorithm in ALGORITHMS:
+            (py_revenue, py_cost, py_time), (cc_revenue, cc_cost, cc_time) = py[algorithm], cc[algorithm]
+            gap = (py_revenue - cc_revenue) / max(1, cc_revenue)
+            ratio = py_time / max(cc_time, 0.001)
+            flag = " ".join(f for f, raised in (("QUALITY", abs(gap) > tolerance), ("SPEED", ratio > slowdown)) if raised)
+            flags += bool(flag)
+            rows.append((instance, algorithm, py_revenue, cc_revenue, gap, py_cost, cc_cost, py_time, cc_time, ratio, flag))
+
+            print(f"{instance:<15} {algorithm:<8} revenue: {py_revenue:>6} / {cc_revenue:<6.0f} ({gap:+7.2%})   "
+                  f"cost: {py_cost:8.2f} / {cc_cost:<8.0f}   time: {py_time:8.3f} / {cc_time:<8.3f} s ({ratio:7.1f}x)   {flag}")
+
+    with open("Comparison.csv", "w") as file:
+        file.write("Problem,Algorithm,PyRevenue,CcRevenue,Gap,PyCost,CcCost,PyTime,CcTime,Slowdown,Flag\n")
+        for row in rows:
+            file.write(",".join(str(v) for v in row) + "\n")
+
+    print(f"{flags} divergences in {len(rows)} comparisons")
+
+    print("Program concluded \u2764\uFE0F")
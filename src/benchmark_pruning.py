@@ -0,0 +1,64 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import time
+import random
+
+import utils
+import solver
+
+
+
+def time_multistart (problem, alpha, prune, maxiter=200, seed=0):
+    """
+    This method measures the time of a multistart with or without pruning.
+
+    NOTE: The cache of the PJS is emptied before, so that both the executions
+    start in the same conditions.
+
+    :return: The revenue, the time in seconds, and the pruning rate.
+    """
+    problem.routes_cache.clear()
+    random.seed(seed)
+    stats = {}
+    _start = time.perf_counter()
+    revenue, _, _ = solver.multistart(problem, alpha, maxiter, prune=prune, stats=stats)
+    return revenue, time.perf_counter() - _start, stats["pruning_rate"]
+
+
+
+
+if __name__ == "__main__":
+
+    total, total_pruned = 0.0, 0.0
+
+    for filename in sorted(os.listdir("../tests/multi/"), key=lambda i : len(i)):
+
+        problem = utils.read_multi_source(filename)
+        alpha = solver.alpha_optimisation(problem)
+
+        revenue, duration, _ = time_multistart(problem, alpha, prune=False)
+        revenue_pruned, duration_pruned, rate = time_multistart(problem, alpha, prune=True)
+        total += duration
+        total_pruned += duration_pruned
+
+        # NOTE: Pruning never changes the result
+        assert revenue == revenue_pruned
+
+        print(f"{filename:<15} revenue: {revenue:<6} time: {duration:7.3f} s    pruned: {duration_pruned:7.3f} s    pruning rate: {rate:6.1%}")
+
+
+    print(f"{'Total':<15} time: {total:7.3f} s    pruned: {total_pruned:7.3f} s    speedup: {total / total_pruned:5.2f}x")
+
+    print("Program concluded \u2764\uFE0F")
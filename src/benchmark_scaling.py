@@ -0,0 +1,103 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+import utils
+import output
+import solver
+import iterators
+import generator
+from mapper import mapper
+from pjs import PJS
+
+
+
+def stages (n_nodes, n_sources, layout, path):
+    """
+    The stages measured, as (name, function) where each function receives
+    the result of the previous one.
+    """
+    def _generate (_):
+        return generator.generate(n_nodes, n_sources, layout=layout, seed=0)
+
+    def _export (problem):
+        output.export(problem, path)
+        return problem.name
+
+    def _read (filename):
+        return utils.read_multi_source(filename, path=path)
+
+    def _savings (problem):
+        return solver.set_savings(problem, alpha=0.3)
+
+    def _mapper (problem):
+        mapper(problem, iterators.greedy)
+        return problem
+
+    def _pjs (problem):
+        for source in problem.sources:
+            PJS(problem, source, tuple(source.nodes), problem.depot, beta=0.9999)
+        return problem
+
+    return (("generate", _generate), ("export", _export), ("read", _read),
+            ("savings", _savings), ("mapper", _mapper), ("pjs", _pjs))
+
+
+
+def measure (n_nodes, n_sources, layout="uniform", memory=False):
+    """
+    This method measures each stage on a generated problem.
+
+    :param memory: If True the peak of memory allocated by each stage is measured
+                instead of the time (tracing the memory slows down the execution).
+    :return: A dictionary with the time in seconds or the memory in MB of each stage.
+    """
+    results, value = {}, None
+    with tempfile.TemporaryDirectory() as path:
+        for name, function in stages(n_nodes, n_sources, layout, path + "/"):
+            if memory:
+                tracemalloc.start()
+                value = function(value)
+                results[name] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            else:
+                _start = time.perf_counter()
+                value = function(value)
+                results[name] = time.perf_counter() - _start
+    return results
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_scaling.py [<layout> <nodes> <nodes> ...]
+    layout = sys.argv[1] if len(sys.argv) > 1 else "uniform"
+    sizes = [int(n) for n in sys.argv[2:]] or [250, 500, 1000, 2000]
+
+    for n_nodes in sizes:
+
+        # NOTE: The number of sources grows with the number of nodes
+        n_sources = max(2, n_nodes // 100)
+
+        times = measure(n_nodes, n_sources, layout)
+        memory = measure(n_nodes, n_sources, layout, memory=True)
+
+        print(f"nodes: {n_nodes:<6} sources: {n_sources:<4} " + "  ".join(f"{name}: {times[name]:7.3f} s {memory[name]:8.1f} MB" for name in times))
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,75 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import sys
+import time
+import functools
+
+import solver
+import shared
+import iterators
+import generator
+from streams import stream
+
+
+
+def latency (problem, alpha, repeat, pool=None):
+    """
+    The mean time of a heuristic call in seconds.
+    NOTE: Each call uses a different mapping (i.e., the routes are not in the cache).
+    """
+    _start = time.perf_counter()
+    for i in range(repeat):
+        solver.heuristic(problem, functools.partial(iterators.BRA, beta=0.3, rng=stream(0, i)), alpha, pool=pool)
+    return (time.perf_counter() - _start) / repeat
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_sources.py [<nodes> [<repeat> [<sources> <sources> ...]]]
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    n_sources = [int(s) for s in sys.argv[3:]] or [2, 4, 8]
+
+    print(f"cores: {os.cpu_count()}")
+
+    for S in n_sources:
+
+        problem = generator.generate(n_nodes, S, layout="clustered", seed=0)
+        alpha = 0.3
+        solver.set_savings(problem, alpha)
+        elite = solver.heuristic(problem, iterators.greedy, alpha)
+        elite = (elite[0], 0, elite[1], elite[2])
+
+        with shared.SharedProblem(problem) as sp, shared.SourcePool(sp, S) as pool:
+
+            # Warm up the workers
+            latency(problem, alpha, 1, pool)
+
+            serial = latency(problem, alpha, repeat)
+            parallel = latency(problem, alpha, repeat, pool)
+
+            _start = time.perf_counter()
+            solver.optimise_elite(problem, elite, 0, alpha, 50, seed=0)
+            opt_serial = time.perf_counter() - _start
+            _start = time.perf_counter()
+            solver.optimise_elite(problem, elite, 0, alpha, 50, seed=0, pool=pool)
+            opt_parallel = time.perf_counter() - _start
+
+        print(f"sources: {S:<3} heuristic: {serial * 1000:8.1f} ms -> {parallel * 1000:8.1f} ms ({serial / parallel:5.2f}x)    "
+              f"optimise_elite: {opt_serial:7.2f} s -> {opt_parallel:7.2f} s ({opt_serial / opt_parallel:5.2f}x)")
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,57 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import sys
+import time
+
+import utils
+import solver
+import kernels
+import threads
+from pjs import PJS_array
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python benchmark_threads.py [<instance> [<iterations> [<threads> <threads> ...]]]
+    filename = sys.argv[1] if len(sys.argv) > 1 else "g26_2_k.txt"
+    maxiter = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    counts = [int(t) for t in sys.argv[3:]] or [1, 2, 4, 8, 16]
+
+    print(f"Kernel compiled: {kernels.JIT}    cores: {os.cpu_count()}")
+
+    problem = utils.read_multi_source(filename)
+    alpha = solver.alpha_optimisation(problem)
+    elites = solver.multistart_keep_elites(problem, alpha, maxiter, nelites=8, seed=0)
+
+    # Warm up (i.e., the compilation of the kernel is not measured)
+    threads.threaded_optimise_elites(problem, elites[:1], alpha, 1, threads=1, pjs=PJS_array)
+
+    base = {}
+    for T in counts:
+
+        _start = time.perf_counter()
+        ms_revenue, _, _ = threads.threaded_multistart(problem, alpha, maxiter, threads=T, seed=0)
+        ms_time = time.perf_counter() - _start
+
+        _start = time.perf_counter()
+        opt_revenue, _, _ = threads.threaded_optimise_elites(problem, elites, alpha, maxiter, threads=T, seed=0, pjs=PJS_array)
+        opt_time = time.perf_counter() - _start
+
+        base = base or {"ms": ms_time, "opt": opt_time}
+        print(f"threads: {T:<3} multistart: {ms_time:8.3f} s ({base['ms'] / ms_time:5.2f}x) revenue {ms_revenue:<6}   "
+              f"optimise_elites: {opt_time:8.3f} s ({base['opt'] / opt_time:5.2f}x) revenue {opt_revenue}")
+
+    print("Program concluded \u2764\uFE0F")
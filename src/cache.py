@@ -0,0 +1,162 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import pickle
+import hashlib
+
+
+# The modules whose source code changes the results of the algorithms
+# NOTE: utils is here because of Problem, the readers, and merge, while the plot and the export
+# of the problems are in output, so that changing them does not invalidate the cache.
+ALGORITHM_MODULES = ("solver", "mapper", "iterators", "pjs", "kernels", "native", "edge", "node",
+                     "streams", "elites", "solution", "reactive", "utils", "distances", "delta",
+                     "checkpoint", "threads", "shared")
+
+
+
+def file_hash (filename, path=""):
+    """ The hash of the content of a file (e.g., an instance). """
+    with open(os.path.join(path, filename), "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+
+def code_version (modules=ALGORITHM_MODULES):
+    """
+    The version of the code as the hash of the source files of some modules (those
+    missing are skipped), so that the cached results are invalidated when they change.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for module in modules:
+        filename = os.path.join(here, f"{module}.py")
+        if os.path.exists(filename):
+            digest.update(module.encode())
+            digest.update(file_hash(filename).encode())
+    return digest.hexdigest()
+
+
+
+class ResultCache:
+    """
+    An instance of this class is an on-disk cache of the results of the algorithms
+    (one pickle file per entry), so that a rerun only computes what changed.
+
+    When the size of the cache exceeds the limit, the least recently used entries
+    are removed.
+
+    NOTE: Keys are built from the parameters of the run, so everything that changes
+    the result must be part of them (e.g., the seed --unseeded runs must not be cached).
+    """
+    def __init__(self, path="../cache/", maxsize=256 * 1024 * 1024, version=None):
+        """
+        Initialise.
+
+        :param path: The directory of the cache.
+        :param maxsize: The maximum size of the cache in bytes.
+        :param version: The version of the code (by default see code_version).
+
+        :attr hits: The number of results found in the cache.
+        :attr misses: The number of results computed.
+        :attr evictions: The number of entries removed to respect the size.
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.version = version or code_version()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        os.makedirs(path, exist_ok=True)
+
+    def key (self, *parts, **params):
+        """ The key of a result given the instance, the algorithm, its parameters, and seed. """
+        data = repr((self.version, parts, sorted(params.items())))
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _filename (self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def get (self, key, default=None):
+        """ The cached result (or default) --the entry is marked as recently used. """
+        filename = self._filename(key)
+        try:
+            with open(filename, "rb") as file:
+                value = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+        os.utime(filename)
+        return value
+
+    def put (self, key, value):
+        """ This method stores a result and eventually evicts old entries. """
+        filename = self._filename(key)
+        with open(filename + ".tmp", "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(filename + ".tmp", filename)
+        self.evict()
+
+    def cached (self, key, function):
+        """
+        The cached result if any, otherwise the result of function() which is stored.
+
+        :param key: The key of the result (see key).
+        :param function: The function that computes the result.
+        :return: The result.
+        """
+        value = self.get(key, default=_missing)
+        if value is not _missing:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = function()
+        self.put(key, value)
+        return value
+
+    def entries (self):
+        """ The entries of the cache as (last use, size, filename), least recently used first. """
+        entries = []
+        for filename in os.listdir(self.path):
+            if filename.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.path, filename))
+                entries.append((stat.st_mtime, stat.st_size, filename))
+        return sorted(entries)
+
+    @property
+    def size (self):
+        """ The size of the cache in bytes. """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict (self):
+        """ This method removes the least recently used entries until the cache respects its size. """
+        entries = self.entries()
+        size = sum(s for _, s, _ in entries)
+        for _, s, filename in entries:
+            if size <= self.maxsize:
+                break
+            os.remove(os.path.join(self.path, filename))
+            size -= s
+            self.evictions += 1
+
+    def clear (self):
+        """ This method removes all the entries. """
+        for _, _, filename in self.entries():
+            os.remove(os.path.join(self.path, filename))
+
+    def report (self):
+        """ A summary of the use of the cache. """
+        total = self.hits + self.misses
+        return (f"cache: {self.hits} hits, {self.misses} misses ({self.hits / max(total, 1):.0%} hit rate), "
+                f"{self.evictions} evictions, {self.size / 1024:.1f} KB in {self.path}")
+
+
+# Sentinel of the missing entries (None may be a result)
+_missing = object()
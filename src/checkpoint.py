@@ -0,0 +1,170 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import random
+import numpy as np
+
+import pjs
+
+
+
+def rng_state ():
+    """ The state of the random module as an array. """
+    version, internal, gauss = random.getstate()
+    return np.array((version, *internal, -1 if gauss is None else 0), dtype="int64"), np.float64(gauss or 0.0)
+
+
+def set_rng_state (state, gauss):
+    """ Restore the state of the random module saved by rng_state. """
+    state = state.tolist()
+    random.setstate((state[0], tuple(state[1:-1]), None if state[-1] == -1 else float(gauss)))
+
+
+
+def pack_solutions (solutions):
+    """
+    This method encodes a list of solutions as arrays.
+
+    The mappings are stacked in a single matrix of bytes, while the nodes of all the
+    routes are concatenated in a single array and each route is identified by its
+    offset in it.
+
+    :param solutions: The solutions as tuples (revenue, mapping, routes).
+    :return: A dictionary of arrays.
+    """
+    revenues, mappings, sources, offsets, nodes, rrevenues, costs, rcounts = [], [], [], [0], [], [], [], []
+    for revenue, mapping, routes in solutions:
+        revenues.append(revenue)
+        mappings.append(mapping)
+        rcounts.append(len(routes))
+        for route in routes:
+            sources.append(route.source.id)
+            nodes.extend(node.id for node in route.nodes)
+            offsets.append(len(nodes))
+            rrevenues.append(route.revenue)
+            costs.append(route.cost)
+    return {
+        "revenues": np.array(revenues, dtype="int64"),
+        "mappings": np.array(mappings, dtype="uint8"),
+        "routes_count": np.array(rcounts, dtype="int64"),
+        "routes_source": np.array(sources, dtype="int32"),
+        "routes_offset": np.array(offsets, dtype="int64"),
+        "routes_nodes": np.array(nodes, dtype="int32"),
+        "routes_revenue": np.array(rrevenues, dtype="int64"),
+        "routes_cost": np.array(costs, dtype="float64"),
+    }
+
+
+def unpack_solutions (problem, arrays):
+    """
+    This method decodes the solutions encoded by pack_solutions, rebuilding
+    the routes on the nodes of the given problem.
+
+    :param problem: The problem instance.
+    :param arrays: The dictionary of arrays.
+    :return: The solutions as tuples (revenue, mapping, routes).
+    """
+    allnodes = {node.id: node for node in problem.iternodes()}
+    offsets, nodes = arrays["routes_offset"].tolist(), arrays["routes_nodes"].tolist()
+    sources, rrevenues, costs = arrays["routes_source"].tolist(), arrays["routes_revenue"].tolist(), arrays["routes_cost"].tolist()
+    solutions, r = [], 0
+    for revenue, mapping, count in zip(arrays["revenues"].tolist(), arrays["mappings"], arrays["routes_count"].tolist()):
+        routes = tuple(pjs.build_route(allnodes[sources[k]], problem.depot, [allnodes[i] for i in nodes[offsets[k]:offsets[k + 1]]],
+                                       rrevenues[k], costs[k]) for k in range(r, r + count))
+        r += count
+        solutions.append((revenue, mapping.astype("float64"), routes))
+    return solutions
+
+
+
+class Checkpoint:
+    """
+    An instance of this class keeps the state of a long run on disk, so that
+    the run can be resumed where it stopped (e.g., if the process is killed).
+
+    The state is made of sections (one for each phase of the run), all saved
+    in the same compressed numpy file.
+
+    NOTE: The state includes the one of the random module, which is restored on
+    resume, so a resumed run gives exactly the same results of an uninterrupted one.
+    The parameters of each phase are saved too, and a phase is never resumed with
+    different parameters (e.g., another alpha or seed).
+    """
+    def __init__(self, filename, every=100):
+        """
+        Initialise.
+
+        :param filename: The file of the checkpoint (it is read if it already exists).
+        :param every: The number of iterations between two saves.
+
+        :attr sections: The saved state of each phase as a dictionary of arrays.
+        """
+        self.filename = filename
+        self.every = every
+        self.sections = {}
+        if os.path.exists(filename):
+            with np.load(filename) as data:
+                for key in data.files:
+                    section, name = key.split("/", 1)
+                    self.sections.setdefault(section, {})[name] = data[key]
+
+    def load (self, section, problem, parameters=None):
+        """
+        This method returns the saved state of a phase.
+
+        :param section: The name of the phase.
+        :param problem: The problem instance (it must be the one of the checkpoint).
+        :param parameters: The parameters of the phase by name (they must be the ones
+                        the state was saved with, see save).
+        :return: The dictionary of arrays, or None if the phase was never saved.
+        """
+        state = self.sections.get(section)
+        if state is None:
+            return None
+        if str(state["problem"]) != problem.name:
+            raise Exception(f"The checkpoint {self.filename} refers to {state['problem']}, not to {problem.name}.")
+        for name, value in (parameters or {}).items():
+            saved = state.get(f"parameter_{name}")
+            if saved is None or str(saved) != repr(value):
+                raise Exception(f"The checkpoint {self.filename} was saved with {name}={'unknown' if saved is None else saved}, not {value!r}.")
+        return state
+
+    def save (self, section, problem, parameters=None, **arrays):
+        """
+        This method saves the state of a phase together with the state of the random module.
+
+        NOTE: The file is written to a temporary file and then renamed, so a process
+        killed while saving never leaves a corrupted checkpoint.
+
+        :param section: The name of the phase.
+        :param problem: The problem instance.
+        :param parameters: The parameters of the phase by name (e.g., alpha, maxiter), saved
+                        as their repr (so they must be plain Python values).
+        :param arrays: The state of the phase.
+        """
+        arrays["rng"], arrays["gauss"] = rng_state()
+        arrays["problem"] = np.array(problem.name)
+        for name, value in (parameters or {}).items():
+            arrays[f"parameter_{name}"] = np.array(repr(value))
+        self.sections[section] = arrays
+        temporary = self.filename + ".tmp"
+        with open(temporary, "wb") as file:
+            np.savez_compressed(file, **{f"{s}/{k}": v for s, state in self.sections.items() for k, v in state.items()})
+        os.replace(temporary, self.filename)
+
+    def remove (self):
+        """ Delete the checkpoint (e.g., when the run is concluded). """
+        self.sections = {}
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
@@ -0,0 +1,127 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import operator
+import numpy as np
+
+from pjs import PJS_cache, build_route
+
+
+
+def _cost (dists, source_id, sequence, depot_id):
+    """ The length of the path from the source to the depot through the sequence of nodes. """
+    ids = [source_id] + [n.id for n in sequence] + [depot_id]
+    return float(sum(dists[i, j] for i, j in zip(ids[:-1], ids[1:])))
+
+
+
+class DeltaRouter:
+    """
+    An instance of this class routes the nodes assigned to each source starting from
+    the last routes of the source, instead of running the PJS from scratch: the nodes
+    taken away are removed from the routes, and those added are inserted where they
+    cost less (cheapest insertion, opening a new route if a vehicle is still free),
+    together with the nodes that could not be inserted the previous times. When the
+    nodes changed too much, the PJS is used (see pjs.PJS_cache).
+
+    The updated routes are feasible but usually worse than those of the PJS, so the
+    time saved is paid with the quality of the single solution.
+    """
+    def __init__(self, maxchange=0.25):
+        """
+        Initialise.
+
+        :param maxchange: The maximum number of nodes added or removed, relative to the
+                    nodes assigned to the source, for which the routes are updated.
+
+        :attr last: The last problem, alpha, nodes, and routes of each source (by source id),
+                    the routes are updated only when the problem and alpha are the same.
+        :attr updates: The number of times the routes have been updated.
+        :attr rebuilds: The number of times the PJS has been used.
+        :attr changed: The total number of nodes added or removed in the updates.
+        """
+        self.maxchange = maxchange
+        self.last = {}
+        self.updates = 0
+        self.rebuilds = 0
+        self.changed = 0
+
+    def route (self, problem, source, nodes, depot, alpha, pjs=None):
+        """
+        The routes of a source (see pjs.PJS_cache).
+
+        :param problem: The instance of the problem (its savings must be already set).
+        :param source: The source.
+        :param nodes: The nodes assigned to the source.
+        :param depot: The depot.
+        :param alpha: The alpha value used to calculate edges savings.
+        :param pjs: The implementation of the PJS used when the nodes changed too much.
+        :return: The routes.
+        """
+        nodes_set = frozenset(nodes)
+        last = self.last.get(source.id)
+        # NOTE: The routes of another problem (or of the same with a different alpha) are not a starting point
+        if last is not None and (last[0] is not problem or last[1] != alpha):
+            last = None
+        if last is not None and last[2] == nodes_set:
+            return last[3]
+        removed = None if last is None else last[2] - nodes_set
+        added = None if last is None else nodes_set - last[2]
+        if last is None or len(removed) + len(added) > self.maxchange * len(nodes_set):
+            routes = PJS_cache(problem, source, nodes, depot, alpha, pjs)
+            self.rebuilds += 1
+        else:
+            # The nodes assigned the previous times but left out of the routes are inserted again
+            routed = {n for r in last[3] for n in r.nodes}
+            unrouted = (last[2] & nodes_set) - routed
+            routes = self._update(problem, source, depot, last[3], removed, added | unrouted)
+            self.updates += 1
+            self.changed += len(removed) + len(added)
+        self.last[source.id] = (problem, alpha, nodes_set, routes)
+        return routes
+
+    def _update (self, problem, source, depot, routes, removed, added):
+        """ The routes updated removing and adding some nodes (the given routes are not changed). """
+        dists, Tmax = problem.dists, problem.Tmax + problem.tolerance
+        source_id, depot_id = source.id, depot.id
+
+        # Remove the nodes taken away (by the triangle inequality the routes stay feasible)
+        sequences = []
+        for r in routes:
+            sequence = [n for n in r.nodes if n not in removed]
+            if sequence:
+                cost = r.cost if len(sequence) == len(r.nodes) else _cost(dists, source_id, sequence, depot_id)
+                sequences.append([sequence, cost, sum(n.revenue for n in sequence)])
+
+        # Insert the nodes added (the most profitable first) where they cost less
+        for node in sorted(added, key=lambda n: (-n.revenue, n.id)):
+            best, best_extra = None, float("inf")
+            for k, (sequence, cost, _) in enumerate(sequences):
+                ids = np.array([source_id] + [n.id for n in sequence] + [depot_id])
+                prevs, nexts = ids[:-1], ids[1:]
+                extra = np.asarray(dists[prevs, node.id] + dists[nexts, node.id] - dists[prevs, nexts], dtype="float64")
+                position = int(extra.argmin())
+                if cost + extra[position] <= Tmax and extra[position] < best_extra:
+                    best, best_extra = (k, position), float(extra[position])
+            if best is not None:
+                k, position = best
+                sequences[k][0].insert(position, node)
+                sequences[k][1] += best_extra
+                sequences[k][2] += node.revenue
+            elif len(sequences) < source.vehicles:
+                cost = float(dists[source_id, node.id]) + float(dists[node.id, depot_id])
+                if cost <= Tmax:
+                    sequences.append([[node], cost, node.revenue])
+
+        routes = [build_route(source, depot, sequence, revenue, cost) for sequence, cost, revenue in sequences]
+        return sorted(routes, key=operator.attrgetter("revenue"), reverse=True)
@@ -0,0 +1,134 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import copy
+import math
+import collections
+import numpy as np
+
+
+
+class LazyDistances:
+    """
+    An instance of this class replaces the matrix of distances of a problem when it
+    would not fit in memory: the euclidean distances are computed from the coordinates
+    when they are needed, and only a bounded number of rows is kept.
+
+    It is indexed as the matrix (e.g., dists[i, j], dists[i, ids], dists[ids, j],
+    dists[np.ix_(a, b)]), and the distances are the same of the matrix.
+
+    NOTE: The distances are symmetric, so a column is the same of the respective row.
+    """
+
+    def __init__(self, coords, *, maxrows=1024, pinned=tuple(), dtype="float64"):
+        """
+        Initialise.
+
+        :param coords: The coordinates of the nodes (a row for each node id).
+        :param maxrows: The maximum number of rows kept in memory (besides the pinned ones).
+        :param pinned: The ids of the nodes whose rows are never removed (e.g., sources and depot).
+        :param dtype: The precision of the distances (see Problem).
+
+        :attr hits: The number of rows found in memory.
+        :attr misses: The number of rows computed.
+        """
+        coords = np.asarray(coords, dtype="float64")
+        self.x, self.y = coords[:, 0].copy(), coords[:, 1].copy()
+        self._xs, self._ys = self.x.tolist(), self.y.tolist()
+        self.dtype = np.dtype(dtype)
+        self.shape = (len(coords), len(coords))
+        self.ndim = 2
+        self.maxrows = maxrows
+        self.pinned = {i: None for i in pinned}
+        self._rows = collections.OrderedDict()
+        self.hits, self.misses = 0, 0
+
+    def fork (self):
+        """
+        A copy that shares the coordinates and the pinned rows already computed, but keeps
+        its own rows (e.g., for another thread, the rows in memory are not thread-safe).
+        """
+        other = copy.copy(self)
+        other.pinned = dict(self.pinned)
+        other._rows = collections.OrderedDict()
+        other.hits, other.misses = 0, 0
+        return other
+
+    def __len__ (self):
+        return self.shape[0]
+
+    @property
+    def nbytes (self):
+        """ The memory used by the rows kept. """
+        return sum(r.nbytes for r in self._rows.values()) + sum(r.nbytes for r in self.pinned.values() if r is not None)
+
+    def compute (self, i, j):
+        """ The distances between the nodes i and the nodes j (as arrays of ids or ids). """
+        # NOTE: Same operations of utils.euclidean, so that the distances are the same of the matrix
+        # (float_power calls the pow of the C library as Python does, while ** 2 multiplies).
+        return np.sqrt(np.float_power(self.x[i] - self.x[j], 2) + np.float_power(self.y[i] - self.y[j], 2)).astype(self.dtype, copy=False)
+
+    def row (self, i):
+        """ The distances from the node i to all the nodes (kept in memory as most recently used). """
+        if i in self.pinned:
+            row = self.pinned[i]
+            if row is None:
+                self.misses += 1
+                row = self.pinned[i] = self.compute(i, slice(None))
+            else:
+                self.hits += 1
+            return row
+        row = self._rows.get(i)
+        if row is not None:
+            self.hits += 1
+            self._rows.move_to_end(i)
+            return row
+        self.misses += 1
+        row = self._rows[i] = self.compute(i, slice(None))
+        if len(self._rows) > self.maxrows:
+            self._rows.popitem(last=False)
+        return row
+
+    def __getitem__ (self, key):
+        i, j = key if isinstance(key, tuple) else (key, slice(None))
+        iscalar, jscalar = isinstance(i, (int, np.integer)), isinstance(j, (int, np.integer))
+        if iscalar and jscalar:
+            # A single distance is taken from a pinned row or a row in memory, otherwise it is computed
+            # NOTE: The rows in memory are not marked as used, single distances are too many.
+            for a, b in ((i, j), (j, i)):
+                if a in self.pinned:
+                    return self.row(a)[b]
+            for a, b in ((i, j), (j, i)):
+                row = self._rows.get(a)
+                if row is not None:
+                    return row[b]
+            return self.dtype.type(math.sqrt((self._xs[i] - self._xs[j])**2 + (self._ys[i] - self._ys[j])**2))
+        if iscalar:
+            return self.row(int(i))[j]
+        if jscalar:
+            return self.row(int(j))[i]
+        if isinstance(i, slice) or isinstance(j, slice):
+            ids = np.arange(self.shape[0])
+            i, j = np.asarray(ids[i] if isinstance(i, slice) else i)[:, None], np.asarray(ids[j] if isinstance(j, slice) else j)[None, :]
+        # Any other selection (e.g., np.ix_) is computed without keeping it
+        return self.compute(np.asarray(i), np.asarray(j))
+
+    def __array__ (self, dtype=None, copy=None):
+        """ The whole matrix of distances (e.g., for the native backend) --it may be huge. """
+        ids = np.arange(self.shape[0])
+        return self.compute(ids[:, None], ids[None, :]).astype(dtype or self.dtype, copy=False)
+
+    def info (self):
+        """ A summary of the use of the rows. """
+        return (f"rows: {len(self._rows)} + {sum(r is not None for r in self.pinned.values())} pinned, "
+                f"{self.hits} hits, {self.misses} misses, {self.nbytes / 1024**2:.1f} MB")
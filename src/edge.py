@@ -18,15 +18,21 @@ class Edge:
 
     Only edges connecting nodes to visit to each other are instantiated.
     We don't need edges connecting sources to nodes and nodes to depot.
+
+    NOTE: Edges are slotted because a problem with n nodes has O(n^2) of them.
     """
+    __slots__ = ("inode", "jnode", "cost")
+
     def __init__(self, inode, jnode, cost):
         """
         Initialise.
         :param inode: The starting node.
         :param jnode: The ending node.
         :param cost: The length of the path from inode to jnode.
+
+        NOTE: The savings of the edges are stored in the matrix problem.savings
+        (see solver.set_savings).
         """
         self.inode = inode
         self.jnode = jnode
         self.cost = cost
-        self.savings = dict()
@@ -0,0 +1,188 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import heapq
+import numpy as np
+
+from solution import CompactSolution
+from streams import SeededSolution
+
+
+
+def mapping_key (mapping):
+    """ The hashable key of a mapping. """
+    return mapping.tobytes()
+
+
+def routes_key (routes):
+    """ The hashable key of a set of routes (the order of the routes does not matter). """
+    return frozenset(tuple(node.id for node in route.nodes) for route in routes)
+
+
+def distance (mapping, other):
+    """
+    The distance between two mappings --i.e., the number of nodes assigned
+    to a different source.
+    """
+    return int(np.count_nonzero(mapping != other)) // 2
+
+
+def decode (problem, elite):
+    """
+    The revenue, the mapping, and the routes of an elite (compact, seeded, or not).
+
+    :param problem: The problem instance the routes of a compact elite are rebuilt on
+                (or the solution of a seeded elite is rebuilt on).
+    :param elite: The elite.
+    :return: The revenue, the mapping, and the routes.
+    """
+    if isinstance(elite[2], SeededSolution):
+        return elite[2].solve(problem)
+    if isinstance(elite[2], CompactSolution):
+        return elite[0], elite[2].mapping(), elite[2].routes(problem)
+    return elite[0], elite[2], elite[3]
+
+
+
+class ElitePool:
+    """
+    An instance of this class keeps the best solutions found so far in a heap,
+    rejecting the duplicates --i.e., solutions whose mapping or set of routes is
+    already in the pool-- and, optionally, the solutions too similar to a better
+    elite.
+
+    The elites are stored as tuples (revenue, count, mapping, routes), where count
+    is the order of insertion used to avoid the comparison of not comparable elements,
+    or as tuples (revenue, count, solution) where solution is a CompactSolution, or a
+    SeededSolution (only the iteration that generated it, see push).
+    """
+    def __init__(self, nelites=5, mindistance=0, compact=False):
+        """
+        Initialise.
+
+        :param nelites: The number of elite solutions we keep in memory.
+        :param mindistance: The minimum distance between the mappings of two elites
+                            (0 means that only duplicates are rejected).
+        :param compact: If True the elites are stored as CompactSolution.
+
+        :attr heap: The heap of the elite solutions.
+        :attr duplicates: The number of solutions rejected because already in the pool.
+        :attr similar: The number of solutions rejected because too similar to a better elite.
+        """
+        self.nelites = nelites
+        self.mindistance = mindistance
+        self.compact = compact
+        self.heap = []
+        self.duplicates = 0
+        self.similar = 0
+        self._count = 0
+        self._keys = set()
+
+    def __len__ (self):
+        return len(self.heap)
+
+    def _elite_keys (self, elite):
+        """ The keys of the mapping and of the routes of an elite. """
+        if isinstance(elite[2], SeededSolution):
+            return elite[2].keys
+        if self.compact:
+            return elite[2].mapping_key(), elite[2].routes_key()
+        return mapping_key(elite[2]), routes_key(elite[3])
+
+    def _distance (self, elite, other):
+        """ The distance between the mappings of two elites. """
+        if self.compact:
+            return int(np.count_nonzero(elite[2].assignment != other[2].assignment))
+        return distance(elite[2], other[2])
+
+    def _remove (self, elite):
+        """ Remove an elite from the pool and forget its keys. """
+        for key in self._elite_keys(elite):
+            self._keys.discard(key)
+
+    def push (self, revenue, mapping, routes, seeded=None):
+        """
+        This method eventually inserts a new solution into the pool.
+
+        :param revenue: The revenue of the solution.
+        :param mapping: The mapping of the solution.
+        :param routes: The routes of the solution.
+        :param seeded: An optional SeededSolution stored instead of mapping and routes
+                    (only the hashes of their keys are kept to reject the duplicates).
+        :return: True if the solution has been inserted, False otherwise.
+        """
+        heap = self.heap
+        # Solutions worse than the worst elite are discarded before hashing
+        if len(heap) == self.nelites and revenue <= heap[0][0]:
+            return False
+
+        # Reject the duplicates
+        if seeded is not None:
+            if self.mindistance > 0:
+                raise Exception("The distance between seeded elites is not supported.")
+            seeded.keys = (hash(mapping_key(mapping)), hash(routes_key(routes)))
+            elite = (revenue, self._count, seeded)
+        elif self.compact:
+            elite = (revenue, self._count, CompactSolution(revenue, mapping, routes))
+        else:
+            elite = (revenue, self._count, mapping, routes)
+        mkey, rkey = self._elite_keys(elite)
+        if mkey in self._keys or rkey in self._keys:
+            self.duplicates += 1
+            return False
+
+        # Reject the solutions too similar to a better elite and remove
+        # the worse elites too similar to the new solution
+        if self.mindistance > 0:
+            close = [e for e in heap if self._distance(elite, e) < self.mindistance]
+            if any(e[0] >= revenue for e in close):
+                self.similar += 1
+                return False
+            if close:
+                for other in close:
+                    self._remove(other)
+                counts = {e[1] for e in close}
+                heap[:] = [e for e in heap if e[1] not in counts]
+                heapq.heapify(heap)
+
+        # Insert the new solution
+        self._count += 1
+        self._keys.update((mkey, rkey))
+        if len(heap) == self.nelites:
+            self._remove(heapq.heappushpop(heap, elite))
+        else:
+            heapq.heappush(heap, elite)
+        return True
+
+    def counters (self):
+        """ The number of solutions inserted, of duplicates, and of similar solutions rejected so far. """
+        return self._count, self.duplicates, self.similar
+
+    def restore (self, elites, count, duplicates=0, similar=0):
+        """
+        This method restores the state of the pool (e.g., from a checkpoint).
+
+        :param elites: The elite solutions in the order of the heap.
+        :param count: The number of solutions inserted so far.
+        :param duplicates: The number of duplicates rejected so far.
+        :param similar: The number of similar solutions rejected so far.
+        """
+        self.heap = list(elites)
+        self._count, self.duplicates, self.similar = count, duplicates, similar
+        self._keys = set()
+        for elite in self.heap:
+            self._keys.update(self._elite_keys(elite))
+
+    def elites (self):
+        """ The elite solutions as a tuple (the first one is the worst). """
+        return tuple(self.heap)
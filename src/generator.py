@@ -0,0 +1,130 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import random
+
+import node
+import utils
+import output
+
+
+
+def _point (rng, x, y, sd, size):
+    """ A point normally distributed around (x, y), kept inside the square and rounded as in the files. """
+    return (round(min(max(rng.gauss(x, sd), 0.0), size), 1),
+            round(min(max(rng.gauss(y, sd), 0.0), size), 1))
+
+
+
+def single_source (name, n_nodes, n_vehicles, Tmax, *, layout="uniform", clusters=3, spread=0.05, size=100.0,
+                   maxrevenue=10, rng=random, dtype="float64", lazy=False):
+    """
+    This method generates a random single-source Team Orienteering Problem.
+    The nodes lie in a square with the depot in its centre and the source in
+    a random position.
+
+    :param name: The name of the problem.
+    :param n_nodes: The number of nodes (including source and depot).
+    :param n_vehicles: The number of vehicles.
+    :param Tmax: The maximum length of a route.
+    :param layout: "uniform" (the nodes are spread over the whole square) or "clustered"
+                (the nodes are grouped in clusters around the source).
+    :param clusters: The number of clusters (only clustered).
+    :param spread: The standard deviation of a cluster relative to the size of the square.
+    :param size: The side of the square.
+    :param maxrevenue: The revenue of each node is an integer between 1 and maxrevenue.
+    :param rng: The random generator.
+    :param dtype: The precision used to store the distances (see Problem).
+    :param lazy: If True the distances are computed when needed (see Problem).
+    :return: The problem instance.
+    """
+    if layout not in ("uniform", "clustered"):
+        raise Exception(f"Unknown layout {layout}.")
+    centre = size / 2.0
+    sx, sy = round(rng.uniform(0, size), 1), round(rng.uniform(0, size), 1)
+    source = node.Source(0, sx, sy, 0, vehicles=n_vehicles)
+    depot = node.Node(n_nodes - 1, centre, centre, 0, isdepot=True)
+
+    # Centres of the clusters (around the source)
+    centres = [_point(rng, sx, sy, size * 0.15, size) for _ in range(clusters)]
+
+    nodes = []
+    for i in range(1, n_nodes - 1):
+        if layout == "uniform":
+            x, y = round(rng.uniform(0, size), 1), round(rng.uniform(0, size), 1)
+        else:
+            x, y = _point(rng, *rng.choice(centres), size * spread, size)
+        nodes.append(node.Node(i, x, y, rng.randint(1, maxrevenue)))
+
+    return utils.Problem(name, n_nodes, n_vehicles, Tmax, (source,), tuple(nodes), depot, dtype=dtype, lazy=lazy)
+
+
+
+def generate (n_nodes, n_sources, vehicles=2, Tmax=75.0, *, layout="uniform", seed=0, name=None, dtype="float64", lazy=False,
+              **kwargs):
+    """
+    This method generates a random multi-source problem merging (see utils.merge)
+    a single-source problem for each source. All the single-source problems share
+    the same depot, and the customers are divided among them as evenly as possible.
+
+    :param n_nodes: The number of nodes (including sources and depot).
+    :param n_sources: The number of sources.
+    :param vehicles: The number of vehicles of each source.
+    :param Tmax: The maximum length of a route.
+    :param layout: "uniform" or "clustered" (see single_source).
+    :param seed: The seed of the generator (the same seed gives the same problem).
+    :param name: The name of the problem (by default built from the parameters).
+    :param dtype: The precision used to store the distances (see Problem).
+    :param lazy: If True the distances are computed when needed (see Problem).
+    :param kwargs: Other parameters of single_source (e.g., clusters, spread, size, maxrevenue).
+    :return: The problem instance.
+    """
+    customers = n_nodes - n_sources - 1
+    if customers < n_sources:
+        raise Exception("There must be at least a customer for each source.")
+    rng = random.Random(seed)
+    name = name or f"synthetic_{layout}_{n_nodes}_{n_sources}_{seed}.txt"
+    problems = [single_source(f"{name}_{i}", customers // n_sources + (i < customers % n_sources) + 2, vehicles, Tmax,
+                              layout=layout, rng=rng, dtype=dtype, lazy=lazy, **kwargs)
+                for i in range(n_sources)]
+    return utils.merge(*problems, name=name, dtype=dtype, lazy=lazy)
+
+
+
+def generate_file (path, *args, **kwargs):
+    """
+    This method generates a random multi-source problem (see generate) and exports it.
+
+    :param path: The directory where the problem is saved.
+    :return: The name of the file.
+    """
+    problem = generate(*args, **kwargs)
+    output.export(problem, path)
+    return problem.name
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python generator.py <path> <nodes> <sources> [<vehicles> <Tmax> <layout> <seed>]
+    path, n_nodes, n_sources = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+    vehicles = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+    Tmax = float(sys.argv[5]) if len(sys.argv) > 5 else 75.0
+    layout = sys.argv[6] if len(sys.argv) > 6 else "uniform"
+    seed = int(sys.argv[7]) if len(sys.argv) > 7 else 0
+
+    print(generate_file(path, n_nodes, n_sources, vehicles, Tmax, layout=layout, seed=seed))
+
+    print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,197 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import queue
+import random
+import multiprocessing
+
+import solver
+import anytime
+import shared
+from pjs import PJS_cache
+from elites import ElitePool
+
+
+
+def solve_mapping (problem, alpha, mapping):
+    """
+    This method routes the nodes of a given mapping (e.g., received from
+    another process) with the deterministic PJS.
+
+    :param problem: The problem instance (its savings must be already set).
+    :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param mapping: The mapping.
+    :return: The revenue, the mapping, and the routes.
+    """
+    S, routes = len(problem.sources), []
+    for i, source in enumerate(problem.sources):
+        nodes = tuple(node for node, v in zip(problem.nodes, mapping[i, S:]) if v == 1)
+        routes.extend(PJS_cache(problem, source, nodes, problem.depot, alpha))
+    return sum(r.revenue for r in routes), mapping, tuple(routes)
+
+
+
+def _routes_ids (routes):
+    """ The routes as (source id, nodes ids, revenue, cost), to send them to another process. """
+    return tuple((r.source.id, tuple(n.id for n in r.nodes), r.revenue, r.cost) for r in routes)
+
+
+
+def _island (index, spec, alpha, epochs, iterations, betarange, nelites, inbox, outbox, results, seed, start):
+    """
+    The search of an island: at the end of each epoch, the best elite is sent to the
+    next island and the elites received from the previous one are inserted in the pool.
+
+    NOTE: Migrants are never waited for, and the ones still in the queue when an
+    island concludes are lost.
+    """
+    problem = shared.attach(spec)
+    random.seed(seed)
+    outbox.cancel_join_thread()
+    pool, received, accepted = ElitePool(nelites), 0, 0
+    trace = anytime.Trajectory(start)
+
+    for epoch in range(epochs):
+        solver.multistart_keep_elites(problem, alpha, iterations, betarange, pool=pool, trace=trace)
+
+        # Send the best elite (not after the last epoch)
+        if epoch < epochs - 1:
+            revenue, _, mapping, _ = max(pool.elites(), key=lambda elite: elite[0])
+            outbox.put(mapping.astype("uint8"))
+
+        # Receive the migrants
+        while True:
+            try:
+                mapping = inbox.get_nowait()
+            except queue.Empty:
+                break
+            received += 1
+            accepted += pool.push(*solve_mapping(problem, alpha, mapping.astype("float64")))
+
+    results.put((index, [(e[0], e[2].astype("uint8"), _routes_ids(e[3])) for e in pool.elites()], received, accepted, trace.points))
+
+
+
+def _intensify_task (alpha, mapping, maxiter, betarange, seed, start):
+    """ Optimise an elite with the multistart PJS in a worker process (see shared.initializer). """
+    problem = shared.worker_problem()
+    random.seed(seed)
+    trace = anytime.Trajectory(start)
+    revenue, mapping, routes = solve_mapping(problem, alpha, mapping.astype("float64"))
+    revenue, mapping, routes = solver.optimise_elites(problem, ((revenue, 0, mapping, routes),), alpha, maxiter, betarange, trace=trace)
+    return revenue, mapping.astype("uint8"), _routes_ids(routes), trace.points
+
+
+
+def _collect (results, processes, poll=1.0):
+    """
+    The results of the islands, read before joining the processes.
+
+    NOTE: The queue is read with a timeout, so that an island that crashed (or was killed)
+    before sending its result raises an exception instead of waiting forever.
+    """
+    collected = []
+    while len(collected) < len(processes):
+        try:
+            collected.append(results.get(timeout=poll))
+        except queue.Empty:
+            failed = [(i, p.exitcode) for i, p in enumerate(processes) if p.exitcode is not None and p.exitcode != 0]
+            if failed or all(p.exitcode is not None for p in processes):
+                # NOTE: A result sent just before exiting may still be in the pipe
+                try:
+                    collected.append(results.get(timeout=poll))
+                    continue
+                except queue.Empty:
+                    pass
+                for p in processes:
+                    p.terminate()
+                if failed:
+                    raise Exception(f"The islands {[i for i, _ in failed]} exited with codes {[c for _, c in failed]} "
+                                    "without sending their elites.")
+                raise Exception("The islands concluded without sending their elites.")
+    return collected
+
+
+
+def island_model (shared_problem, alpha, islands=4, epochs=10, iterations=100, betarange=(0.05, 0.5), nelites=5,
+                  intensify=None, maxiter=1000, seed=0, stats=None, trace=None):
+    """
+    Cooperative parallel execution of multistart_keep_elites and optimise_elites.
+
+    Each island is a process with its own elite pool and its own part of the range of
+    beta. The islands are connected in a ring: after each epoch of iterations, an island
+    sends its best mapping to the next one. At the end, the elites of all the islands are
+    merged (without duplicates) and the best ones are optimised in parallel.
+
+    NOTE: With the default intensify, the budget is the one of an independent run of
+    multistart_keep_elites (epochs * iterations) and optimise_elites (nelites elites) for
+    each island, except for the rerouting of the migrants.
+
+    :param shared_problem: The SharedProblem owned by this process (its savings must be already set).
+    :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param islands: The number of islands (i.e., processes).
+    :param epochs: The number of migrations (plus one).
+    :param iterations: The number of iterations of each island in each epoch.
+    :param betarange: The range of beta, divided in equal parts among the islands.
+    :param nelites: The number of elites of each island (the final merge keeps islands * nelites).
+    :param intensify: The number of merged elites optimised (by default all of them).
+    :param maxiter: The number of iterations of the multistart PJS used to optimise the elites.
+    :param seed: The seed used by the first island (the others use the following ones).
+    :param stats: An optional dictionary filled with the number of migrants "received" and
+                "accepted" in the elite pools, and the revenue of the best elite before the
+                optimisation ("best_elite").
+    :param trace: An optional anytime.Trajectory where the improvements found by all the
+                processes are merged (its start is the start of the processes' clocks).
+    :return: The best solution found with the respective mapping and revenue.
+    """
+    spec, problem = shared_problem.spec, shared_problem.problem
+    minbeta, maxbeta = betarange
+    start = None if trace is None else trace.start
+    width = (maxbeta - minbeta) / islands
+
+    # Start the islands
+    queues = [multiprocessing.Queue() for _ in range(islands)]
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_island, args=(i, spec, alpha, epochs, iterations,
+                                         (minbeta + i * width, minbeta + (i + 1) * width), nelites,
+                                         queues[i], queues[(i + 1) % islands], results, seed + i, start))
+                 for i in range(islands)]
+    for process in processes:
+        process.start()
+    collected = _collect(results, processes)
+    for process in processes:
+        process.join()
+
+    # Merge the elites of the islands
+    pool = ElitePool(nelites * islands)
+    for _, elites, _, _, points in sorted(collected, key=lambda result: result[0]):
+        if trace is not None:
+            trace.extend(points)
+        for revenue, mapping, routes in elites:
+            pool.push(revenue, mapping.astype("float64"), tuple(shared._rebuild_route(problem, *r) for r in routes))
+    elites = sorted(pool.elites(), key=lambda elite: elite[0], reverse=True)[:intensify]
+
+    # Optimise the best elites in parallel
+    tasks = [(alpha, elite[2], maxiter, betarange, seed + islands + k, start) for k, elite in enumerate(elites)]
+    with multiprocessing.Pool(min(islands, len(tasks)), initializer=shared.initializer, initargs=(spec,)) as workers:
+        optimised = workers.starmap(_intensify_task, tasks)
+
+    if stats is not None:
+        stats.update(received=sum(r[2] for r in collected), accepted=sum(r[3] for r in collected), best_elite=elites[0][0])
+
+    if trace is not None:
+        for result in optimised:
+            trace.extend(result[3])
+
+    revenue, mapping, routes, _ = max(optimised, key=lambda result: result[0])
+    return revenue, mapping.astype("float64"), tuple(shared._rebuild_route(problem, *r) for r in routes)
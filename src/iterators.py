@@ -28,7 +28,7 @@ def greedy (preferences):
             yield node
 
 
-def BRA (preferences, beta=0.3):
+def BRA (preferences, beta=0.3, rng=random):
     """
     This method carry out a biased-randomised selection over the list of preferences.
     The selection is based on a quasi-geometric function:
@@ -37,12 +37,13 @@ def BRA (preferences, beta=0.3):
 
     :param preferences: The set of options already sorted from the best to the worst.
     :param beta: The parameter of the quasi-geometric distribution.
+    :param rng: The random generator (by default the random module).
     :return: The element picked at each iteration.
     """
     L = len(preferences)
     options = list(preferences)
     for _ in range(L):
-        idx = int(math.log(random.random(), 1.0 - beta)) % len(options)
+        idx = int(math.log(rng.random(), 1.0 - beta)) % len(options)
         _, node = options.pop(idx)
         if not node.assigned:
             yield node
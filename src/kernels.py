@@ -0,0 +1,140 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# True if the kernels are compiled, False if they run as pure Python
+JIT = numba is not None
+
+
+
+def _jit (function):
+    """
+    Compile a kernel with Numba (releasing the GIL) if it is installed,
+    otherwise leave it as pure Python code.
+    """
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+
+@_jit
+def xorshift (state):
+    """
+    One step of a 32-bit xorshift random generator.
+
+    NOTE: The generator is written so that it gives the same numbers when
+    compiled and when executed as pure Python.
+
+    :param state: The current state (never 0).
+    :return: The new state.
+    """
+    state ^= (state << 13) & 0xFFFFFFFF
+    state ^= state >> 17
+    state ^= (state << 5) & 0xFFFFFFFF
+    return state
+
+
+
+@_jit
+def merge_routes (order, inodes, jnodes, costs, from_source, to_depot, revenues, Tmax, n_vehicles, beta, seed,
+                  route, nxt, head, tail, rcost, rrevenue, alive, link_left, link_right):
+    """
+    The savings merge of the PJS over integer arrays.
+
+    The nodes are identified by their position in from_source, to_depot, and revenues.
+    A route is identified by the position of the node it has been created with, and
+    its nodes are kept as a linked list (head, tail, and nxt of each node).
+
+    :param order: The positions of the edges sorted by decreasing savings (modified in place).
+    :param inodes: The starting node of each edge.
+    :param jnodes: The ending node of each edge.
+    :param costs: The cost of each edge.
+    :param from_source: The distance from the source to each node.
+    :param to_depot: The distance from each node to the depot.
+    :param revenues: The revenue of each node.
+    :param Tmax: The maximum length of a route.
+    :param n_vehicles: The number of vehicles.
+    :param beta: The parameter of the biased randomised selection of the edges.
+    :param seed: The starting state of the random generator (not 0).
+
+    The following are buffers (one element per node) filled by the kernel:
+    :param route: The route of each node (-1 if the node cannot be visited).
+    :param nxt: The next node in the route (-1 for the last one).
+    :param head: The first node of each route.
+    :param tail: The last node of each route.
+    :param rcost: The cost of each route.
+    :param rrevenue: The revenue of each route.
+    :param alive: True if the route has not been merged into another one.
+    :param link_left: True if the node is linked to the source.
+    :param link_right: True if the node is linked to the depot.
+
+    :return: The number of routes.
+    """
+    # Build a dummy solution where a vehicle starts from the source, visits
+    # a single node, and then goes to the depot.
+    n_routes = 0
+    for n in range(len(from_source)):
+        alive[n] = False
+        if from_source[n] + to_depot[n] > Tmax:
+            route[n] = -1
+            continue
+        route[n], head[n], tail[n], nxt[n] = n, n, n, -1
+        rcost[n] = from_source[n] + to_depot[n]
+        rrevenue[n] = revenues[n]
+        alive[n], link_left[n], link_right[n] = True, True, True
+        n_routes += 1
+
+    # Merge the routes picking the edges with a biased randomised selection
+    L, start, state = len(order), 0, seed
+    logbase = math.log(1.0 - beta)
+    for _ in range(L):
+        state = xorshift(state)
+        pos = start + int(math.log(state / 4294967296.0) / logbase) % (L - start)
+        e = order[pos]
+        # Remove the edge from the options (shifting only the options before it)
+        for p in range(pos, start, -1):
+            order[p] = order[p - 1]
+        start += 1
+
+        i, j = inodes[e], jnodes[e]
+        iroute, jroute = route[i], route[j]
+        if iroute == -1 or jroute == -1 or iroute == jroute:
+            continue
+        # If i is the last of its route and j the first of its route, the merging is possible.
+        if link_right[i] and link_left[j]:
+            if rcost[iroute] - to_depot[i] + rcost[jroute] - from_source[j] + costs[e] <= Tmax:
+                rcost[iroute] += costs[e] - to_depot[i] + (rcost[jroute] - from_source[j])
+                rrevenue[iroute] += rrevenue[jroute]
+                link_right[i], link_left[j] = False, False
+                nxt[tail[iroute]] = head[jroute]
+                tail[iroute] = tail[jroute]
+                n = head[jroute]
+                while n != -1:
+                    route[n] = iroute
+                    n = nxt[n]
+                alive[jroute] = False
+                n_routes -= 1
+        # If the number of routes is already equal to the number of vehicles,
+        # interrupt the procedure.
+        if n_routes == n_vehicles:
+            break
+
+    return n_routes
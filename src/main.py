@@ -51,7 +51,7 @@ if __name__ == "__main__":
 
     #print(time.time() - _start)
 
-    #utils.plot(problem, mapping=mapping, routes=routes)
+    #output.plot(problem, mapping=mapping, routes=routes)
 
 
 
@@ -14,7 +14,6 @@ Date: January 2022
 import numpy as np
 import itertools
 import collections
-import operator
 
 
 
@@ -49,14 +48,30 @@ def mapper (problem, iterator):
     nodes = tuple(map(_reset_assignment, nodes))
 
     # Compute the absolute distances
-    abs_dists = np.array([[dists[s.id, n.id] for n in nodes] for s in sources]).astype("float32")
+    sids = np.fromiter((s.id for s in sources), dtype="int64", count=n_sources)
+    nids = np.fromiter((n.id for n in nodes), dtype="int64", count=n_nodes)
+    abs_dists = dists[np.ix_(sids, nids)].astype("float32")
     # NOTE: Suggestion to present
-    #abs_dists = np.array([[dists[s.id, n.id] + dists[n.id, depot.id] for n in nodes] for s in sources]).astype("float32")
+    #abs_dists = (dists[np.ix_(sids, nids)] + dists[nids, depot.id]).astype("float32")
+
+    # Compute the marginal distances --i.e., the distance from the source minus the
+    # distance from the closest other source. For the closest source of a node this
+    # is the second-best distance, for all the others it is the best one, so a single
+    # partial sort per node is needed.
+    if n_sources > 1:
+        best, second = np.partition(abs_dists, 1, axis=0)[:2]
+        closest = abs_dists.argmin(axis=0)
+        marginal_dists = abs_dists - np.where(np.arange(n_sources)[:, None] == closest, second, best)
+    else:
+        marginal_dists = abs_dists
+    # Sort the preferences of all the sources at once (stable, as the sorted of Python)
+    order = np.argsort(marginal_dists, axis=1, kind="stable")
+    objects = np.empty(n_nodes, dtype=object)
+    objects[:] = nodes
+    sorted_dists, sorted_nodes = np.take_along_axis(marginal_dists, order, axis=1).tolist(), objects[order].tolist()
 
-    # Compute the marginal distances
     for i, source in enumerate(sources):
-        marginal_dists = abs_dists[i,:] - np.concatenate((abs_dists[:i,:], abs_dists[i+1:,:],), axis=0).min(axis=0)
-        source.preferences = iterator(sorted(zip(marginal_dists, nodes), key=operator.itemgetter(0)))
+        source.preferences = iterator(list(zip(sorted_dists[i], sorted_nodes[i])))
         source.nodes = collections.deque()
 
 
@@ -67,6 +82,11 @@ def mapper (problem, iterator):
     _null_element = object()
     # NOTE: Until nodes are not concluded a source at each turn pick a number of preferred
     # nodes that depend on the number of vehicles it has.
+    # NOTE: The turns follow a fixed cyclic order and each turn assigns at least a node (the
+    # preferences of a source are exhausted only when all the nodes are assigned), so the loop
+    # makes at most n_nodes turns whatever the number of sources: a heap or buckets of sources
+    # would give the same order with more work per turn. The cost that grows with the sources
+    # is the one of sorting their preferences above.
     for source in itertools.islice(itertools.cycle(sources), n_nodes):
         # Consider the preferences of the currently considered source
         preferences = source.preferences
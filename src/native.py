@@ -0,0 +1,172 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import ctypes
+import subprocess
+import numpy as np
+
+import pjs
+
+
+# The directory of the C++ version and the compiled library
+CPP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "c++-version")
+LIBRARY = os.path.join(CPP_DIR, "libmstop.so")
+EXECUTABLE = os.path.join(CPP_DIR, "mstop")
+
+# The algorithms of the C++ version
+ALGORITHMS = {"heuristic": 0, "metaheuristic": 1, "intensive_metaheuristic": 2}
+
+# Codes used for the kind of each node (same as shared.py)
+NODE, SOURCE, DEPOT = 0, 1, 2
+
+
+_lib = None
+
+
+
+def _stale (artifact):
+    """ True if the compiled artifact does not exist or a source of the C++ version is newer. """
+    if not os.path.exists(artifact):
+        return True
+    built = os.path.getmtime(artifact)
+    return any(os.path.getmtime(os.path.join(CPP_DIR, f)) > built
+               for f in os.listdir(CPP_DIR) if f.endswith((".cc", ".h")))
+
+
+
+def build (force=False):
+    """
+    This method compiles the C++ version as a shared library by using the
+    compiler in the CXX environment variable (c++ by default).
+
+    :param force: If True the library is compiled even if it is up to date.
+    :return: The path of the library.
+    """
+    if force or _stale(LIBRARY):
+        compiler = os.environ.get("CXX", "c++")
+        subprocess.run((compiler, "-O3", "-std=c++17", "-shared", "-fPIC", "binding.cc", "-o", LIBRARY),
+                       cwd=CPP_DIR, check=True)
+    return LIBRARY
+
+
+
+def build_executable (force=False):
+    """
+    This method compiles the main of the C++ version (i.e., the benchmark that writes
+    results.txt) by using the compiler in the CXX environment variable (c++ by default).
+
+    :param force: If True the executable is compiled even if it is up to date.
+    :return: The path of the executable.
+    """
+    if force or _stale(EXECUTABLE):
+        compiler = os.environ.get("CXX", "c++")
+        subprocess.run((compiler, "-O3", "-std=c++17", "main.cc", "-o", EXECUTABLE), cwd=CPP_DIR, check=True)
+    return EXECUTABLE
+
+
+
+def load (build_if_missing=True):
+    """
+    This method loads the compiled C++ version (eventually compiling it).
+
+    :param build_if_missing: If True the library is compiled when it does not exist or
+                    it is older than the sources (see build).
+    :return: The loaded library.
+    """
+    global _lib
+    if _lib is None:
+        if build_if_missing:
+            build()
+        lib = ctypes.CDLL(LIBRARY)
+        f32 = np.ctypeslib.ndpointer(dtype=np.float32, flags="C_CONTIGUOUS")
+        i32 = np.ctypeslib.ndpointer(dtype=np.int32, flags="C_CONTIGUOUS")
+        lib.mstop_solve.restype = ctypes.c_int
+        lib.mstop_solve.argtypes = (
+            ctypes.c_int, ctypes.c_int, ctypes.c_float, f32, f32, i32, i32, i32,
+            ctypes.c_int, ctypes.POINTER(ctypes.c_float), ctypes.c_float, ctypes.c_float, ctypes.c_int, ctypes.c_int, ctypes.c_uint,
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_float), i32,
+            i32, i32, i32, f32, i32,
+        )
+        _lib = lib
+    return _lib
+
+
+
+def available ():
+    """ True if the C++ version can be used (i.e., it is compiled or it can be compiled). """
+    try:
+        load()
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+
+def solve (problem, algorithm="heuristic", alpha=None, maxiter=1000, betarange=(0.1, 0.3), nelites=5, seed=None):
+    """
+    This method solves a problem by using the C++ version.
+
+    NOTE: The C++ version works in single precision, uses its own random engines, and
+    it always uses a (nearly greedy) biased randomised mapper. Its results are therefore
+    close but not identical to the Python ones, even with the same seed.
+
+    :param problem: The problem instance to solve.
+    :param algorithm: The algorithm (i.e., heuristic, metaheuristic, or intensive_metaheuristic).
+    :param alpha: The alpha value used to calculate edges savings (if None it is optimised).
+    :param maxiter: The maximum number of iterations.
+    :param betarange: The range of the beta parameter to use in the biased randomisation.
+    :param nelites: The number of elite solutions (only intensive_metaheuristic).
+    :param seed: The master seed of the random engines (None or 0 for non deterministic
+                ones, as in main.cc).
+    :return: The solution as revenue, mapping (as in the mapper), and routes.
+    """
+    lib = load()
+    allnodes = sorted(problem.iternodes(), key=lambda n: n.id)
+    S, N = len(problem.sources), len(problem.nodes)
+    max_routes = sum(s.vehicles for s in problem.sources)
+
+    # The problem as arrays indexed by the node id
+    dists = np.ascontiguousarray(problem.dists, dtype=np.float32)
+    coords = np.array([(n.x, n.y) for n in allnodes], dtype=np.float32)
+    kinds = np.array([SOURCE if n.issource else DEPOT if n.isdepot else NODE for n in allnodes], dtype=np.int32)
+    revenues = np.array([n.revenue for n in allnodes], dtype=np.int32)
+    vehicles = np.array([n.vehicles for n in allnodes], dtype=np.int32)
+
+    # The buffers for the solution
+    c_alpha = ctypes.c_float(-1.0 if alpha is None else alpha)
+    revenue, cost = ctypes.c_int(0), ctypes.c_float(0.0)
+    mapping = np.zeros((S, S + N), dtype=np.int32)
+    route_sources = np.zeros(max_routes, dtype=np.int32)
+    route_lengths = np.zeros(max_routes, dtype=np.int32)
+    route_nodes = np.zeros(max(1, N), dtype=np.int32)
+    route_costs = np.zeros(max_routes, dtype=np.float32)
+    route_revenues = np.zeros(max_routes, dtype=np.int32)
+
+    n_routes = lib.mstop_solve(
+        problem.n_nodes, problem.n_vehicles, problem.Tmax, dists, coords, kinds, revenues, vehicles,
+        ALGORITHMS[algorithm], ctypes.byref(c_alpha), betarange[0], betarange[1], maxiter, nelites, seed or 0,
+        ctypes.byref(revenue), ctypes.byref(cost), mapping,
+        route_sources, route_lengths, route_nodes, route_costs, route_revenues,
+    )
+
+    # Rebuild the routes on the nodes of the problem
+    routes, k = [], 0
+    for i in range(n_routes):
+        length = int(route_lengths[i])
+        nodes = (allnodes[j] for j in route_nodes[k:k + length].tolist())
+        routes.append(pjs.build_route(allnodes[route_sources[i]], problem.depot, nodes,
+                                      int(route_revenues[i]), float(route_costs[i])))
+        k += length
+
+    return revenue.value, mapping.astype("float64"), tuple(routes)
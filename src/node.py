@@ -18,7 +18,14 @@ class Node:
     An instance of this class represents a node to visit or
     a source some vehicles are starting from.
     It is used for the depot too.
+
+    NOTE: Nodes are slotted (no __dict__) because problems instantiate many of them
+    and their attributes are accessed in the inner loops of Mapper and PJS.
+    The state used only by sources is kept in the Source subclass.
     """
+    __slots__ = ("id", "x", "y", "revenue", "issource", "vehicles", "isdepot",
+                 "assigned", "from_source", "to_depot", "route", "link_left", "link_right")
+
     def __init__(self, id, x, y, revenue, *, color='#FDDD71', issource=False, vehicles=0, isdepot=False):
         """
         Initialise.
@@ -34,8 +41,6 @@ class Node:
 
                     *** Parameters used by the Mapper ***
         :attr assigend: True if the node is assigned to a source and 0 otherwise
-        :attr preferences: Used in case of source node for the round-robin process.
-        :attr nodes: Used in case of source for keeping the nodes assigned to it.
 
                     *** Parameters used by the PJS ***
         :attr from_source: The length of the current path from the source to this node.
@@ -54,8 +59,6 @@ class Node:
 
         # Attributes used by the Mapper
         self.assigned = False
-        self.preferences = collections.deque()
-        self.nodes = collections.deque()
 
         # Attributes used by the PJS
         self.from_source = 0
@@ -65,8 +68,10 @@ class Node:
         self.link_right = False
 
     def __copy__(self):
-        obj = Node.__new__(self.__class__)
-        obj.__dict__.update(self.__dict__)
+        obj = self.__class__.__new__(self.__class__)
+        for cls in self.__class__.__mro__:
+            for attr in getattr(cls, "__slots__", tuple()):
+                setattr(obj, attr, getattr(self, attr))
         return obj
 
     def __repr__(self):
@@ -74,3 +79,31 @@ class Node:
 
     def __hash__(self):
         return self.id
+
+
+
+class Source(Node):
+    """
+    An instance of this class represents a source some vehicles are starting from.
+    It extends the Node with the attributes used only by the Mapper
+    during the round-robin assignment of nodes to sources.
+    """
+    __slots__ = ("preferences", "nodes")
+
+    def __init__(self, id, x, y, revenue, *, color='#8FDDF4', vehicles=0):
+        """
+        Initialise.
+
+        :param id: The unique id of the source.
+        :param x: The x-coordinateof the source.
+        :param y: The y-coordinate of the source.
+        :param revenue: The revenue.
+        :param vehicles: The number of vehicles starting from this source.
+
+                    *** Parameters used by the Mapper ***
+        :attr preferences: Used for the round-robin process.
+        :attr nodes: Used for keeping the nodes assigned to the source.
+        """
+        super().__init__(id, x, y, revenue, color=color, issource=True, vehicles=vehicles)
+        self.preferences = collections.deque()
+        self.nodes = collections.deque()
@@ -0,0 +1,102 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+The plot and the export of the problems, kept out of utils because they never change
+the results of the algorithms (see cache.ALGORITHM_MODULES).
+"""
+# Default colors for nodes, source nodes, adn depot
+NODES_COLOR = '#FDDD71'
+SOURCES_COLORS = ('#8FDDF4', '#8DD631', '#A5A5A5', '#DB35EF', '#8153AB')
+DEPOT_COLOR = '#F78181'
+
+
+
+def plot (problem, *, routes=tuple(), mapping=None, figsize=(6,4), title=None):
+    """
+    This method is used to plot a problem using a graph representation that
+    makes it easy-to-read.
+
+    :param figsize: The size of the plot.
+    :param title: The title of the plot.
+    :param routes: The eventual routes found.
+    """
+    # NOTE: Plotting dependencies are imported only when needed, so that
+    # processes which never plot do not pay for them (nor for the backend setup).
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=figsize)
+    if title:
+        plt.title(title)
+
+    # Build the graph of nodes
+    colors, pos = [], {}
+    G = nx.DiGraph()
+    source_id = 0
+
+    for node in problem.iternodes():
+        # Compile the graph
+        pos[node.id] = (node.x, node.y)
+        G.add_node(node.id)
+
+        # Define nodes colors
+        if node.issource:
+            colors.append(SOURCES_COLORS[source_id])
+            source_id += 1
+        elif node.isdepot:
+            colors.append(DEPOT_COLOR)
+        else:
+            if mapping is None:
+                colors.append(NODES_COLOR)
+            else:
+                for i in range(len(problem.sources)):
+                    if mapping[i, node.id] == 1:
+                        colors.append(SOURCES_COLORS[i] + "60")
+                        break
+
+    # Save the routes
+    edges = []
+    for r in routes:
+        # NOTE: Nodes of the route are supposed to always be in the order in which
+        # they are stored inside the deque.
+        nodes = tuple(r.nodes)
+        edges.extend([(r.source.id, nodes[0].id), (nodes[-1].id, r.depot.id)])
+        for n1, n2 in zip(nodes[:-1], nodes[1:]):
+            edges.append((n1.id, n2.id))
+
+    nx.draw(G, pos=pos, node_color=colors, edgelist=edges, with_labels=True, node_size=100, font_size=6, font_weight="bold")
+    plt.show()
+
+
+
+def export (problem, path):
+    """
+    This method exports the problem into a text file.
+
+    :param problem: The problem to export.
+    :param path: The directory where the problem will be saved.
+    """
+    with open(path + problem.name, 'w') as file:
+        # Export number of nodes, number of vehicles, and Tmax
+        file.write(f"n {problem.n_nodes}\n")
+        file.write(f"m {problem.n_vehicles}\n")
+        file.write(f"tmax {problem.Tmax}\n")
+        # For each node
+        for node in problem.iternodes():
+            # Export coordinates and reveneu
+            file.write(f"{round(node.x, 1)}\t{round(node.y, 1)}\t{node.revenue}\t")
+            # If multi-source import indicator of source nodes and number of
+            # vehicles starting from each source.
+            if problem.multi_source:
+                file.write(f"{int(node.issource)}\t{node.vehicles}")
+            file.write('\n')
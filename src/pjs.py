@@ -13,10 +13,14 @@ Date: January 2022
 """
 import operator
 import collections
-import functools
 import heapq
 import math
 import random
+import numpy as np
+
+import edge
+import kernels
+import streams
 
 
 
@@ -25,6 +29,8 @@ class Route:
     An instance of this class represents a Route --i.e., a path
     from the source to the depot made by a vehicle.
     """
+    __slots__ = ("source", "depot", "nodes", "revenue", "cost")
+
     def __init__(self, source, depot, starting_node):
         """
         Initialise.
@@ -68,23 +74,87 @@ class Route:
 
 
 
-def _bra (edges, beta):
+def build_route (source, depot, nodes, revenue, cost):
+    """
+    This method builds a route from the sequence of its nodes, without
+    touching the PJS attributes of the nodes (e.g., for routes received
+    from a worker process or from the native solver).
+
+    :param source: The source of the route.
+    :param depot: The depot of the route.
+    :param nodes: The nodes of the route in the order they are visited.
+    :param revenue: The total revenue of the route.
+    :param cost: The total cost of the route.
+    :return: The route.
+    """
+    route = Route.__new__(Route)
+    route.source, route.depot = source, depot
+    route.nodes = collections.deque(nodes)
+    route.revenue, route.cost = revenue, cost
+    return route
+
+
+
+def _bra (edges, beta, rng=random):
     """
     Biased randomised selection of the edges.
 
     :param edges: The list of edges.
     :param beta: The parameter of the quasi-geometric distribution.
+    :param rng: The random generator (by default the random module).
     :return: The retrieved edge.
     """
     L = len(edges)
     options = list(edges)
     for _ in range(L):
-        idx = int(math.log(random.random(), 1.0 - beta)) % len(options)
+        idx = int(math.log(rng.random(), 1.0 - beta)) % len(options)
         yield options.pop(idx)
 
 
 
-def PJS (problem, source, nodes, depot, beta):
+def _sorted_edges (problem, source_id, nodes):
+    """
+    The edges connecting the given nodes sorted by decreasing saving for the source.
+
+    The savings are stored only in the matrix of the problem (see solver.set_savings), so
+    the edges connecting the nodes are selected and sorted on the arrays of the edges (as
+    in PJS_array), and only the selected ones are built here. With lazy distances (see
+    Problem) there are no arrays of the edges, so their savings are computed here, with
+    the same order and precision.
+
+    :param problem: The instance of the problem (its savings must be already set).
+    :param source_id: The id of the source.
+    :param nodes: The set of nodes.
+    :return: The sorted edges.
+    """
+    if not problem.lazy:
+        iids, jids, costs, _ = problem.edges_arrays()
+        # Position of each node in the subset (-1 if the node is not part of it)
+        nodes = tuple(nodes)
+        position = np.full(problem.n_nodes, -1, dtype="int64")
+        position[np.fromiter((n.id for n in nodes), dtype="int64", count=len(nodes))] = np.arange(len(nodes))
+        selected = np.flatnonzero((position[iids] >= 0) & (position[jids] >= 0))
+        # NOTE: The stable sort of the opposite savings keeps the order of the edges with equal savings
+        selected = selected[np.argsort(-problem.savings[source_id, selected], kind="stable")]
+        ipos, jpos, costs = position[iids[selected]].tolist(), position[jids[selected]].tolist(), costs[selected].tolist()
+        return [edge.Edge(nodes[i], nodes[j], cost) for i, j, cost in zip(ipos, jpos, costs)]
+
+    # NOTE: The edges of the problem are ordered by the ids of their nodes
+    nodes = sorted(nodes, key=operator.attrgetter("id"))
+    K, dists, alpha = len(nodes), problem.dists, problem.alpha
+    ids = np.fromiter((n.id for n in nodes), dtype="int64", count=K)
+    revenues = np.fromiter((n.revenue for n in nodes), dtype="float64", count=K)
+    iids, jids = np.nonzero(~np.eye(K, dtype="bool"))
+    costs = dists[ids[:, None], ids][iids, jids].astype("float64")
+    savings = (1.0 - alpha)*(dists[ids, problem.depot.id].astype("float64")[iids] + dists[source_id, ids].astype("float64")[jids] - costs) \
+              + alpha*(revenues[iids] + revenues[jids])
+    order = np.argsort(-savings.astype(dists.dtype), kind="stable")
+    iids, jids, costs = iids[order].tolist(), jids[order].tolist(), costs[order].tolist()
+    return [edge.Edge(nodes[i], nodes[j], cost) for i, j, cost in zip(iids, jids, costs)]
+
+
+
+def PJS (problem, source, nodes, depot, beta, rng=random):
     """
     An implementation of the Panadero Juan Savings heuristic algorithm.
     It is generally used to solve a single source team orienteering problem.
@@ -94,16 +164,18 @@ def PJS (problem, source, nodes, depot, beta):
     :param nodes: The customers nodes to visit.
     :param depot: The destination depot.
     :param beta: The parameter of the biased randomisation (i.e. close to 1 for a greedy behaviour)
+    :param rng: The random generator used by the biased randomisation.
 
     :return: The routes the vehicles starting from source will make.
     """
     # Move useful references to the stack
     n_vehicles, nodes = source.vehicles, set(nodes),
-    dists, Tmax = problem.dists, problem.Tmax
+    # NOTE: Tmax is relaxed by the tolerance of reduced-precision distances
+    dists, Tmax = problem.dists, problem.Tmax + problem.tolerance
     source_id, depot_id = source.id, depot.id
 
     # Filter edges keeping only those that interest this subset of nodes and sort them
-    sorted_edges = sorted([e for e in problem.edges if e.inode in nodes and e.jnode in nodes], key=lambda edge: edge.savings[source_id], reverse=True)
+    sorted_edges = _sorted_edges(problem, source_id, nodes)
 
     # Build a dummy solution where a vehicle starts from the source, visits
     # a single node, and then goes to the depot.
@@ -126,7 +198,7 @@ def PJS (problem, source, nodes, depot, beta):
         routes.append(route)
 
     # Merge the routes giving priority to edges with highest efficiency
-    for edge in _bra(sorted_edges, beta):
+    for edge in _bra(sorted_edges, beta, rng):
         inode, jnode = edge.inode, edge.jnode
         # If the edge connect nodes already into the same route
         # next edge is considered
@@ -151,22 +223,143 @@ def PJS (problem, source, nodes, depot, beta):
     return sorted(routes, key=operator.attrgetter("revenue"), reverse=True)[:n_vehicles]
 
 
-@functools.lru_cache(maxsize=None)
-def PJS_cache (problem, source, nodes, depot, alpha):
+def PJS_array (problem, source, nodes, depot, beta, rng=random):
+    """
+    Same as the PJS, but the savings merge is made by a kernel working on integer
+    arrays (see kernels.merge_routes), compiled when Numba is installed.
+
+    NOTE: The nodes attributes used by the PJS are not modified, and the biased
+    randomised selection of the edges uses the random generator of the kernel
+    (seeded by rng), so the routes may differ from those of the PJS. The kernel
+    releases the GIL when it is compiled, so it can run in parallel threads.
+
+    :param problem: The instance of the problem to solve (its savings must be already set).
+    :param source: The source for which the PJS will be used.
+    :param nodes: The customers nodes to visit.
+    :param depot: The destination depot.
+    :param beta: The parameter of the biased randomisation (i.e. close to 1 for a greedy behaviour)
+    :param rng: The random generator used to seed the kernel.
+
+    :return: The routes the vehicles starting from source will make.
+    """
+    # Move useful references to the stack
+    n_vehicles, nodes = source.vehicles, tuple(set(nodes))
+    dists, Tmax = problem.dists, problem.Tmax + problem.tolerance
+    iids, jids, costs, _ = problem.edges_arrays()
+    K = len(nodes)
+
+    # Position of each node in the subset (-1 if the node is not part of it)
+    ids = np.fromiter((node.id for node in nodes), dtype="int64", count=K)
+    position = np.full(problem.n_nodes, -1, dtype="int64")
+    position[ids] = np.arange(K)
+
+    # Filter edges keeping only those that interest this subset of nodes and sort them
+    selected = np.flatnonzero((position[iids] >= 0) & (position[jids] >= 0))
+    selected = selected[np.argsort(-problem.savings[source.id, selected], kind="stable")]
+
+    args = [
+        np.arange(len(selected)), position[iids[selected]], position[jids[selected]], costs[selected],
+        dists[source.id, ids].astype("float64"), dists[ids, depot.id].astype("float64"),
+        np.fromiter((node.revenue for node in nodes), dtype="int64", count=K),
+    ]
+    buffers = [np.empty(K, dtype="int64") for _ in range(4)] + [np.empty(K, dtype="float64"),
+               np.empty(K, dtype="int64")] + [np.empty(K, dtype="bool") for _ in range(3)]
+    # NOTE: The pure Python kernel is much faster on lists than on numpy arrays
+    if not kernels.JIT:
+        args, buffers = [a.tolist() for a in args], [b.tolist() for b in buffers]
+    route, nxt, head, tail, rcost, rrevenue, alive, _, _ = buffers
+
+    kernels.merge_routes(*args, Tmax, n_vehicles, beta, rng.getrandbits(32) or 1, *buffers)
+
+    # Build the routes and return the best possible ones
+    best = sorted((r for r in range(K) if alive[r]), key=lambda r: rrevenue[r], reverse=True)[:n_vehicles]
+    routes = []
+    for r in best:
+        sequence, n = [], int(head[r])
+        while n != -1:
+            sequence.append(nodes[n])
+            n = int(nxt[n])
+        routes.append(build_route(source, depot, sequence, int(rrevenue[r]), float(rcost[r])))
+    return routes
+
+
+
+def revenue_bound (problem, source, nodes, depot):
+    """
+    An upper bound of the revenue the PJS can collect visiting the given nodes.
+
+    Each visited node costs at least half of its shortest incoming edge (from the source
+    or another node) plus half of its shortest outgoing edge (to another node or to
+    the depot), and each route has half of its first and last edges left, so the nodes
+    of a route cost at most Tmax minus half of the shortest ones. The bound is the one of
+    the resulting fractional knapsack, computed on the nodes a route can reach within Tmax.
+
+    :param problem: The instance of the problem.
+    :param source: The source the nodes are assigned to.
+    :param nodes: The nodes assigned to the source.
+    :param depot: The destination depot.
+    :return: The upper bound.
+    """
+    dists, Tmax = problem.dists, problem.Tmax + problem.tolerance
+    ids = np.fromiter((node.id for node in nodes), dtype="int64")
+    revenues = np.fromiter((node.revenue for node in nodes), dtype="float64", count=len(ids))
+    from_source, to_depot = dists[source.id, ids], dists[ids, depot.id]
+    # Keep only the nodes that can be visited
+    reachable = from_source + to_depot <= Tmax
+    ids, revenues, from_source, to_depot = ids[reachable], revenues[reachable], from_source[reachable], to_depot[reachable]
+    if len(ids) == 0:
+        return 0
+
+    # The minimum cost of each node
+    sub = dists[np.ix_(ids, ids)].astype("float64")
+    np.fill_diagonal(sub, np.inf)
+    weights = (np.minimum(from_source, sub.min(axis=0)) + np.minimum(to_depot, sub.min(axis=1))) / 2.0
+
+    # Fractional knapsack
+    capacity = source.vehicles * (Tmax - (from_source.min() + to_depot.min()) / 2.0)
+    if weights.sum() <= capacity:
+        return revenues.sum()
+    ratio = np.divide(revenues, weights, out=np.full(len(ids), np.inf), where=weights > 0)
+    order = np.argsort(-ratio, kind="stable")
+    weights, revenues = weights[order], revenues[order]
+    used = np.cumsum(weights)
+    k = int(np.searchsorted(used, capacity, side="right"))
+    bound = revenues[:k].sum()
+    if k < len(ids):
+        bound += revenues[k] * (capacity - (used[k - 1] if k > 0 else 0.0)) / weights[k]
+    return bound
+
+
+
+def PJS_cache (problem, source, nodes, depot, alpha, pjs=None):
     """
     Cached implementation of the PJS.
     Used only for heuristic and deterministic behaviour when we do not
     need to explore different solutions.
 
     :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param pjs: The implementation of the PJS (PJS by default, or PJS_array whose routes
+                may differ, see multistartPJS).
+
+    NOTE: The routes are cached in the problem (see Problem.routes_cache), so they are
+    released together with it (e.g., the copies of a problem made for each thread).
+
+    NOTE: The PJS uses its own random generator, so that the cached routes only depend
+    on the arguments and a cache miss does not move the state of the random module
+    (e.g., a run resumed from a checkpoint with an empty cache gives the same results).
 
     :return: The routes the vehicles starting from source will make.
     """
-    return PJS(problem, source, nodes, depot, beta=0.9999)
+    pjs = pjs or PJS
+    key = (source, nodes, depot, alpha, pjs)
+    routes = problem.routes_cache.get(key)
+    if routes is None:
+        routes = problem.routes_cache[key] = pjs(problem, source, nodes, depot, beta=0.9999, rng=random.Random(0))
+    return routes
 
 
 
-def multistartPJS (problem, source, nodes, depot, alpha, maxiter, betarange):
+def multistartPJS (problem, source, nodes, depot, alpha, maxiter, betarange, stop=None, reactive=None, seed=None, pjs=None, trace=None):
     """
     This method is a multi-start execution of the PJS.
     At each iteration, a new solution is generated by using a different beta
@@ -174,20 +367,50 @@ def multistartPJS (problem, source, nodes, depot, alpha, maxiter, betarange):
 
     :param maxiter: The maximum number of iterations.
     :param betarange: The range in which beta is randomly generated at each iteration.
+    :param stop: A function called at each iteration: when it returns True the search is
+                interrupted and the best solution found so far is returned.
+    :param reactive: An optional ReactiveBeta used to generate beta instead of the uniform
+                distribution over betarange (at the end it holds the learned distribution),
+                betarange must be the default one or the range of the reactive beta.
+    :param seed: If given, the iteration i draws its random numbers from streams.stream(seed, i)
+                instead of the random module.
+    :param pjs: The implementation of the PJS used to generate the solutions (PJS by
+                default, or PJS_array whose kernel releases the GIL).
+    :param trace: An optional anytime.Trajectory where the greedy solution and every
+                iteration are recorded.
     :return: The best solution found as a set of routes, and the respective revenue.
     """
+    pjs = pjs or PJS
+    if reactive is not None:
+        reactive.check(betarange)
+
     # Generate the starting greedy solution
     bestroutes = PJS_cache(problem, source, nodes, depot, alpha)
     bestrevenue = sum(r.revenue for r in bestroutes)
+    if trace is not None:
+        trace.record(bestrevenue, iterations=0)
 
     # Save beta ranges
     betamin, betamax = betarange
 
-    for _ in range(maxiter):
+    for i in range(maxiter):
+
+        # Eventually interrupt the search
+        if stop is not None and stop():
+            break
 
         # Generate a new solution
-        routes = PJS(problem, source, nodes, depot, beta=random.uniform(betamin, betamax))
+        rng = random if seed is None else streams.stream(seed, i)
+        if reactive is not None:
+            bucket, beta = reactive.sample(rng)
+        else:
+            beta = rng.uniform(betamin, betamax)
+        routes = pjs(problem, source, nodes, depot, beta=beta, rng=rng)
         revenue = sum(r.revenue for r in routes)
+        if reactive is not None:
+            reactive.update(bucket, revenue, revenue > bestrevenue)
+        if trace is not None:
+            trace.record(revenue)
 
         # Eventually update the best
         if revenue > bestrevenue:
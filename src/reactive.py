@@ -0,0 +1,131 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import random
+
+
+# The default range of beta of the multistart (see ReactiveBeta.check)
+DEFAULT_BETARANGE = (0.1, 0.3)
+
+
+
+class ReactiveBeta:
+    """
+    An instance of this class generates the beta parameter of the biased randomisation
+    learning which values work best on the instance (as in the Reactive GRASP).
+
+    The range of beta is divided into buckets. Beta is generated by picking a bucket
+    and then a value uniformly inside it. Every period solutions, the probability of
+    each bucket is set proportional to
+
+            (mean revenue of the bucket / best revenue) ^ delta * (1 + improvements) * completed
+
+    where improvements is the number of times the bucket improved the best solution, and
+    completed is the share of its solutions that were not pruned (their revenue is unknown,
+    but they could not improve the best one), so the buckets that give better solutions
+    are picked more often. A bucket whose solutions were all pruned keeps only the
+    minimum probability.
+    """
+    def __init__(self, betarange=(0.1, 0.3), buckets=5, period=50, delta=10, minprob=0.02):
+        """
+        Initialise.
+
+        :param betarange: The range of beta.
+        :param buckets: The number of buckets.
+        :param period: The number of solutions between two updates of the probabilities.
+        :param delta: The exponent that amplifies the differences between buckets.
+        :param minprob: The minimum probability of a bucket (so that none is abandoned).
+
+        :attr betarange: The range of beta.
+        :attr bounds: The range of beta of each bucket.
+        :attr probabilities: The probability to pick each bucket.
+        :attr trials: The number of solutions generated with each bucket.
+        :attr pruned: The number of solutions of each bucket that were pruned.
+        :attr improvements: The number of times each bucket improved the best solution.
+        :attr best: The best revenue seen.
+        """
+        if betarange[0] > betarange[1]:
+            raise Exception("Min beta should be higher than max beta.")
+        self.betarange = minbeta, maxbeta = tuple(betarange)
+        step = (maxbeta - minbeta) / buckets
+        self.bounds = tuple((minbeta + i * step, minbeta + (i + 1) * step) for i in range(buckets))
+        self.period = period
+        self.delta = delta
+        self.minprob = minprob
+        self.probabilities = [1.0 / buckets] * buckets
+        self.trials = [0] * buckets
+        self.pruned = [0] * buckets
+        self.improvements = [0] * buckets
+        self.best = None
+        self._totals = [0.0] * buckets
+        self._count = 0
+
+    def check (self, betarange):
+        """
+        This method raises an exception if a range of beta other than the default one
+        is given together with this reactive beta, and it is not the range of this
+        reactive beta (the range given would be silently ignored).
+
+        :param betarange: The range of beta given to the multistart.
+        """
+        if tuple(betarange) not in (DEFAULT_BETARANGE, self.betarange):
+            raise Exception(f"The range of beta is {self.betarange} as set in the reactive beta, not {tuple(betarange)}.")
+
+    def sample (self, rng=random):
+        """
+        This method generates a value of beta.
+
+        :param rng: The random generator (by default the random module), e.g. the
+                    stream of the iteration (see streams.stream).
+        :return: The bucket picked and the value of beta.
+        """
+        bucket = rng.choices(range(len(self.bounds)), weights=self.probabilities)[0]
+        return bucket, rng.uniform(*self.bounds[bucket])
+
+    def update (self, bucket, revenue, improved=False):
+        """
+        This method records the solution generated with a bucket.
+
+        :param bucket: The bucket used.
+        :param revenue: The revenue of the solution (None if it was pruned, i.e. it did not
+                    improve the best one, but its revenue is unknown).
+        :param improved: True if the solution improved the best one.
+        """
+        self.trials[bucket] += 1
+        if revenue is None:
+            self.pruned[bucket] += 1
+        else:
+            self._totals[bucket] += revenue
+            self.improvements[bucket] += improved
+            if self.best is None or revenue > self.best:
+                self.best = revenue
+        self._count += 1
+        if self._count % self.period == 0:
+            self._reweight()
+
+    def _reweight (self):
+        """ Update the probabilities of the buckets. """
+        if not self.best or self.best <= 0:
+            return
+        # NOTE: Buckets never tried are considered as good as the best, while buckets whose
+        # solutions were all pruned (none could improve the best) are considered the worst
+        # (their score is 0, so they keep only the minimum probability)
+        scores = [1.0 if n == 0 else 0.0 if n == p else ((total / (n - p)) / self.best) ** self.delta * (1 + imp) * (n - p) / n
+                  for n, p, total, imp in zip(self.trials, self.pruned, self._totals, self.improvements)]
+        total = sum(scores)
+        buckets = len(scores)
+        self.probabilities = [self.minprob + (1.0 - buckets * self.minprob) * s / total for s in scores]
+
+    def distribution (self):
+        """ The learned distribution as a list of ((min beta, max beta), probability). """
+        return list(zip(self.bounds, self.probabilities))
@@ -0,0 +1,71 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import random
+import functools
+
+import utils
+import solver
+import iterators
+from elites import ElitePool, distance
+
+
+
+def consistent (pool):
+    """ True if the keys of the pool are exactly those of the elites in the heap. """
+    keys = set()
+    for elite in pool.heap:
+        keys.update(pool._elite_keys(elite))
+    return keys == pool._keys
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python runelites.py [<instance>]
+    filename = sys.argv[1] if len(sys.argv) > 1 else "g26_2_k.txt"
+
+    problem = utils.read_multi_source(filename)
+    alpha = solver.alpha_optimisation(problem)
+
+    # Two different solutions, the worse one first
+    random.seed(0)
+    solutions = [solver.heuristic(problem, iterators.greedy, alpha)]
+    while len(solutions) < 2:
+        bra = functools.partial(iterators.BRA, beta=0.3)
+        revenue, mapping, routes = solver.heuristic(problem, bra, alpha)
+        if revenue != solutions[0][0] and distance(mapping, solutions[0][1]) > 0:
+            solutions.append((revenue, mapping, routes))
+    worse, better = sorted(solutions, key=lambda s: s[0])
+    close = distance(worse[1], better[1]) + 1
+    failures = 0
+
+    for compact in (False, True):
+
+        # The better solution is close to the worse elite, so it must replace it
+        pool = ElitePool(5, mindistance=close, compact=compact)
+        pool.push(*worse)
+        inserted = pool.push(*better)
+        ok = inserted and [e[0] for e in pool.elites()] == [better[0]] and consistent(pool)
+
+        # The worse solution is now rejected as too similar to the better elite
+        ok = ok and not pool.push(*worse) and pool.similar == 1 and consistent(pool)
+
+        failures += not ok
+        print(f"compact: {compact!s:<6} elites: {[e[0] for e in pool.elites()]} counters: {pool.counters()} {'' if ok else 'MISMATCH'}")
+
+    print(f"{failures} mismatches")
+
+    sys.exit(1 if failures else 0)
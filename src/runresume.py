@@ -0,0 +1,94 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import os
+import sys
+import random
+import tempfile
+
+import utils
+import solver
+from elites import ElitePool, decode, mapping_key, routes_key
+from checkpoint import Checkpoint
+
+
+
+def run (problem, alpha, filename, maxiter, interrupt=None, nelites=8, **kwargs):
+    """
+    The elites search and their optimisation with a checkpoint, eventually interrupted
+    after some iterations of the elites search.
+
+    :return: The elites (as revenue, mapping key, routes key), the counters of the pool,
+            and the revenue of the optimised solution.
+    """
+    random.seed(0)
+    calls = [0]
+    def stop ():
+        calls[0] += 1
+        return interrupt is not None and calls[0] > interrupt
+    pool = ElitePool(nelites, compact=kwargs.pop("compact", False))
+    elites = solver.multistart_keep_elites(problem, alpha, maxiter, stop=stop, checkpoint=Checkpoint(filename, every=7), pool=pool, **kwargs)
+    if interrupt is not None:
+        return None
+    revenue, _, _ = solver.optimise_elites(problem, elites, alpha, 10, checkpoint=Checkpoint(filename), **kwargs)
+    decoded = [decode(problem, e) for e in elites]
+    return [(r, mapping_key(m), routes_key(rs)) for r, m, rs in decoded], pool.counters(), revenue
+
+
+
+
+if __name__ == "__main__":
+
+    # Usage: python runresume.py [<instance> [<iterations>]]
+    filename = sys.argv[1] if len(sys.argv) > 1 else "g26_2_k.txt"
+    maxiter = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    problem = utils.read_multi_source(filename)
+    alpha = solver.alpha_optimisation(problem)
+    failures = 0
+
+    for name, kwargs in (("plain", {}), ("compact", {"compact": True}), ("seeded", {"seed": 7}),
+                         ("seeded compact", {"seed": 7, "compact": True})):
+
+        with tempfile.TemporaryDirectory() as directory:
+            reference = run(problem, alpha, os.path.join(directory, "reference.npz"), maxiter, **dict(kwargs))
+
+            # The search is killed in the middle and resumed from the last checkpoint
+            resumed = os.path.join(directory, "resumed.npz")
+            run(problem, alpha, resumed, maxiter, interrupt=maxiter // 2 + 3, **dict(kwargs))
+            result = run(problem, alpha, resumed, maxiter, **dict(kwargs))
+
+        ok = result == reference
+        failures += not ok
+        print(f"{name:<15} revenue: {reference[2]:<6} counters: {reference[1]} resumed: {result[1]} {'' if ok else 'MISMATCH'}")
+
+    # A search is never resumed with different parameters
+    for name, changed in (("alpha", {"alpha": alpha + 0.1}), ("maxiter", {"maxiter": maxiter + 10}),
+                          ("nelites", {"nelites": 5}), ("betarange", {"betarange": (0.2, 0.4)}), ("seed", {"seed": 8})):
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "resumed.npz")
+            run(problem, alpha, filename, maxiter, interrupt=maxiter // 2 + 3, seed=7)
+            arguments = {"problem": problem, "alpha": alpha, "filename": filename, "maxiter": maxiter, "seed": 7, **changed}
+            try:
+                run(**arguments)
+                refused = False
+            except Exception as error:
+                refused = "was saved with" in str(error)
+
+        failures += not refused
+        print(f"resumed with another {name:<10} {'refused' if refused else 'MISMATCH'}")
+
+    print(f"{failures} mismatches")
+
+    sys.exit(1 if failures else 0)
@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import functools
 import itertools
@@ -9,12 +10,46 @@ import iterators
 import solver
 from mapper import mapper
 from pjs import PJS, multistartPJS
+from cache import ResultCache, file_hash
+from streams import derive
+
+
+
+def timed (function, *args, **kwargs):
+    """ The revenue, the duration, and the cost of the solution returned by function. """
+    _start = time.time()
+    revenue, routes = function(*args, **kwargs)
+    duration = time.time() - _start
+    return revenue, duration, sum(r.cost for r in routes)
+
+
+
+def run (cache, key, function, *args, **kwargs):
+    """
+    The revenue, duration, and cost of a run (see timed), taken from the cache if key
+    is not None --i.e., the run is deterministic or seeded.
+    NOTE: The duration of a result taken from the cache is empty, because it is the one
+    of the run that computed the result, not a time measured now.
+    """
+    if key is None:
+        return timed(function, *args, **kwargs)
+    hits = cache.hits
+    revenue, duration, cost = cache.cached(key, functools.partial(timed, function, *args, **kwargs))
+    return revenue, "" if cache.hits > hits else duration, cost
 
 
 
 
 if __name__ == "__main__":
 
+    # Usage: python runtests.py [<seed>]
+    # With a seed the stochastic algorithms are reproducible and their results are cached
+    # as well (otherwise only the deterministic ones are). The times of the cached results
+    # are left empty in Times.csv.
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    cache = ResultCache("../cache/")
+    stochastic = lambda *parts, **params: None if seed is None else cache.key(*parts, seed=seed, **params)
+
     header = ",".join([
         "Problem",
         "P1",
@@ -60,7 +95,8 @@ if __name__ == "__main__":
 
         # Optimise alpha and set savings
         problem = utils.read_multi_source(filename)
-        alpha = solver.alpha_optimisation(problem)
+        instance = file_hash(filename, "../tests/multi/")
+        alpha = cache.cached(cache.key(instance, "alpha"), functools.partial(solver.alpha_optimisation, problem))
         solver.set_savings(problem, alpha=alpha)
 
 
@@ -111,18 +147,20 @@ if __name__ == "__main__":
             prob = utils.read_single_source(name)
             prob.Tmax = problem.Tmax
             solver.set_savings(prob, alpha)
-            _start = time.time()
-            routes = PJS(prob, prob.sources[0], prob.nodes, prob.depot, beta=0.9999)
-            duration = time.time() - _start
+            def _pjs ():
+                routes = PJS(prob, prob.sources[0], prob.nodes, prob.depot, beta=0.9999)
+                return sum(r.revenue for r in routes), routes
+            key = cache.key(file_hash(name, "../tests/single/"), "PJS", Tmax=prob.Tmax, alpha=alpha, beta=0.9999)
+            revenue, duration, cost = run(cache, key, _pjs)
 
             with open("Revenues.csv", "a") as file:
-                file.write(f"{sum(r.revenue for r in routes)},")
+                file.write(f"{revenue},")
 
             with open("Times.csv", "a") as file:
                 file.write(f"{duration},")
 
             with open("Distances.csv", "a") as file:
-                file.write(f"{sum(r.cost for r in routes)},")
+                file.write(f"{cost},")
 
 
         # Run the multi start PJS
@@ -141,9 +179,12 @@ if __name__ == "__main__":
             prob = utils.read_single_source(name)
             prob.Tmax = problem.Tmax
             solver.set_savings(prob, alpha)
-            _start = time.time()
-            routes, revenue = multistartPJS (prob, prob.sources[0], prob.nodes, prob.depot, alpha, maxiter=1000, betarange=(0.1,0.3))
-            duration = time.time() - _start
+            def _mspjs ():
+                routes, revenue = multistartPJS (prob, prob.sources[0], prob.nodes, prob.depot, alpha, maxiter=1000, betarange=(0.1,0.3),
+                                                 seed=None if seed is None else derive(seed, ord(i)))
+                return revenue, routes
+            key = stochastic(file_hash(name, "../tests/single/"), "multistartPJS", Tmax=prob.Tmax, alpha=alpha, maxiter=1000, betarange=(0.1,0.3))
+            revenue, duration, cost = run(cache, key, _mspjs)
 
             with open("Revenues.csv", "a") as file:
                 file.write(f"{revenue},")
@@ -152,16 +193,16 @@ if __name__ == "__main__":
                 file.write(f"{duration},")
 
             with open("Distances.csv", "a") as file:
-                file.write(f"{sum(r.cost for r in routes)},")
+                file.write(f"{cost},")
 
 
 
         # Run the Multi Source Heuristic
-        _start = time.time()
-
-        revenue, mapping, routes = solver.heuristic(problem, iterators.greedy, alpha)
+        def _heuristic ():
+            revenue, mapping, routes = solver.heuristic(problem, iterators.greedy, alpha)
+            return revenue, routes
 
-        duration = time.time() - _start
+        revenue, duration, cost = run(cache, cache.key(instance, "heuristic", alpha=alpha), _heuristic)
 
         with open("Revenues.csv", "a") as file:
             file.write(f"{revenue},")
@@ -170,17 +211,18 @@ if __name__ == "__main__":
             file.write(f"{duration},")
 
         with open("Distances.csv", "a") as file:
-            file.write(f"{sum(r.cost for r in routes)},")
+            file.write(f"{cost},")
 
 
 
 
         # Run the multi start heuristic
-        _start = time.time()
-
-        revenue, mapping, routes = solver.multistart(problem, alpha, maxiter=1000, betarange=(0.1, 0.3))
+        def _multistart ():
+            revenue, mapping, routes = solver.multistart(problem, alpha, maxiter=1000, betarange=(0.1, 0.3), seed=seed)
+            return revenue, routes
 
-        duration = time.time() - _start
+        key = stochastic(instance, "multistart", alpha=alpha, maxiter=1000, betarange=(0.1, 0.3))
+        revenue, duration, cost = run(cache, key, _multistart)
 
         with open("Revenues.csv", "a") as file:
             file.write(f"{revenue},")
@@ -189,17 +231,17 @@ if __name__ == "__main__":
             file.write(f"{duration},")
 
         with open("Distances.csv", "a") as file:
-            file.write(f"{sum(r.cost for r in routes)},")
+            file.write(f"{cost},")
 
 
         # Run the long run optimization on the elite solutions
-        _start = time.time()
+        def _elites ():
+            elite_solutions = solver.multistart_keep_elites(problem, alpha, maxiter=1000, betarange=(0.1, 0.3), nelites=5, seed=seed)
+            revenue, mapping, routes = solver.optimise_elites(problem, elite_solutions, alpha, maxiter=3000, betarange=(0.1, 0.3), seed=seed)
+            return revenue, routes
 
-        elite_solutions = solver.multistart_keep_elites(problem, alpha, maxiter=1000, betarange=(0.1, 0.3), nelites=5)
-
-        revenue, mapping, routes = solver.optimise_elites(problem, elite_solutions, alpha, maxiter=3000, betarange=(0.1, 0.3))
-
-        duration = time.time() - _start
+        key = stochastic(instance, "elites", alpha=alpha, maxiter=(1000, 3000), betarange=(0.1, 0.3), nelites=5)
+        revenue, duration, cost = run(cache, key, _elites)
 
         with open("Revenues.csv", "a") as file:
             file.write(f"{revenue},\n")
@@ -208,12 +250,14 @@ if __name__ == "__main__":
             file.write(f"{duration},\n")
 
         with open("Distances.csv", "a") as file:
-            file.write(f"{sum(r.cost for r in routes)},\n")
+            file.write(f"{cost},\n")
+
+        #output.plot(problem, mapping=mapping, routes=routes)
 
-        #utils.plot(problem, mapping=mapping, routes=routes)
 
 
 
 
+    print(cache.report())
 
     print("Program concluded \u2764\uFE0F")
@@ -0,0 +1,362 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+
+A long-running solve service speaking JSON lines over stdin/stdout or a Unix socket.
+
+Requests (one JSON object per line):
+
+    {"op": "solve", "id": 1, "problem": "g12_4_k.txt", "algorithm": "multistart",
+     "maxiter": 1000, "betarange": [0.1, 0.3], "deadline": 5.0}
+    {"op": "cancel", "id": 2, "job": 1}
+    {"op": "metrics", "id": 3}
+
+The optional fields of a solve request are "path" (by default ../tests/multi/),
+"single" (true for single-source files), "algorithm" (heuristic, multistart, or
+optimise_elites), "maxiter", "betarange", "nelites", and "deadline" (seconds
+from the submission after which the best solution found so far is returned).
+The id of a solve request is required, it is the id of the job (e.g., to cancel it),
+and it cannot be the one of a job still active.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+import collections
+import concurrent.futures
+
+import utils
+import iterators
+import solver
+
+
+
+class ProblemCache:
+    """
+    An instance of this class keeps the problems already read, together with their
+    tuned alpha, so that following requests do not pay for reading the file, building
+    the problem and optimising alpha again.
+    The least recently used problem is evicted when the cache is full.
+    """
+    def __init__(self, maxsize=16):
+        """
+        Initialise.
+
+        :param maxsize: The maximum number of problems kept in memory.
+
+        :attr hits: The number of requests served from the cache.
+        :attr misses: The number of problems built.
+        :attr evictions: The number of problems evicted.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get (self, filename, path, single=False):
+        """
+        This method returns a problem and its tuned alpha, building them if needed.
+
+        NOTE: Solving changes the nodes of a problem in place, so each entry comes
+        with a lock the caller must hold while solving.
+
+        :param filename: The name of the file.
+        :param path: The path where the file is.
+        :param single: True if the file is a single-source instance.
+        :return: The problem, the alpha, and the lock of the problem.
+        """
+        fullpath = os.path.join(path, filename)
+        key = (fullpath, single, os.path.getmtime(fullpath))
+        build = False
+        with self._lock:
+            future = self._entries.get(key)
+            if future is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                # NOTE: The entry is a future, so the same problem is never built twice,
+                # but it is built without holding the lock of the cache (i.e., the requests
+                # of other problems are not blocked, those of this problem wait the future).
+                self.misses += 1
+                future = self._entries[key] = concurrent.futures.Future()
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+                build = True
+        if not build:
+            return future.result()
+        try:
+            read = utils.read_single_source if single else utils.read_multi_source
+            problem = read(filename, path=path if path.endswith("/") else path + "/")
+            alpha = solver.alpha_optimisation(problem)
+        except Exception as error:
+            # The failed entry is removed, so that a following request tries again
+            with self._lock:
+                if self._entries.get(key) is future:
+                    del self._entries[key]
+            future.set_exception(error)
+            raise
+        future.set_result((problem, alpha, threading.Lock()))
+        return future.result()
+
+
+
+class Job:
+    """
+    An instance of this class represents a solve request in the queue.
+    """
+    def __init__(self, request):
+        """
+        Initialise.
+
+        :param request: The solve request.
+
+        :attr submitted: The time the job was received.
+        :attr started: The time the job was picked by a worker.
+        :attr deadline: The time after which the search is interrupted.
+        :attr cancelled: Set when the job is cancelled.
+        :attr interrupted: True if the search has been interrupted.
+        """
+        self.request = request
+        self.submitted = time.monotonic()
+        self.started = None
+        deadline = request.get("deadline")
+        self.deadline = None if deadline is None else self.submitted + float(deadline)
+        self.cancelled = threading.Event()
+        self.interrupted = False
+
+    def stop (self):
+        """ True if the search must be interrupted. """
+        if self.cancelled.is_set() or (self.deadline is not None and time.monotonic() > self.deadline):
+            self.interrupted = True
+        return self.interrupted
+
+
+
+class Service:
+    """
+    An instance of this class receives the requests, queues the jobs on a pool of
+    worker threads, and keeps the metrics of the service.
+
+    NOTE: Jobs on the same problem are executed one at a time; jobs on different
+    problems are executed by different threads, but the solver is pure Python and
+    holds the GIL, so they take turns on a single core: the threads keep the service
+    responsive (e.g., metrics, cancellations, and requests of problems already in
+    the cache are not queued behind a long job), they do not make it faster. To use
+    more cores run a service for each core, or solve the instances with batch.py
+    (a pool of processes).
+    """
+    def __init__(self, workers=4, cache_size=16, routes_cache_size=10000):
+        """
+        Initialise.
+
+        :param workers: The number of worker threads.
+        :param cache_size: The maximum number of problems kept in memory.
+        :param routes_cache_size: The maximum number of routes of the deterministic PJS kept
+                    for each problem (see Problem.routes_cache): when a job concludes, the
+                    routes of its problem are forgotten if they are more.
+        """
+        self.cache = ProblemCache(cache_size)
+        self.routes_cache_size = routes_cache_size
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self.jobs = {}
+        self.started = time.monotonic()
+        self.counters = collections.Counter()
+        self.queue_times = collections.deque(maxlen=1000)
+        self.solve_times = collections.deque(maxlen=1000)
+
+    def _solve (self, job):
+        """ Execute a job (called by the worker threads). """
+        job.started = time.monotonic()
+        self.queue_times.append(job.started - job.submitted)
+        request = job.request
+        if job.stop():
+            return {"status": "cancelled" if job.cancelled.is_set() else "timeout"}
+
+        problem, alpha, lock = self.cache.get(request["problem"], request.get("path", "../tests/multi/"),
+                                              request.get("single", False))
+        algorithm = request.get("algorithm", "heuristic")
+        maxiter = int(request.get("maxiter", 1000))
+        betarange = tuple(request.get("betarange", (0.1, 0.3)))
+
+        with lock:
+            if algorithm == "heuristic":
+                revenue, mapping, routes = solver.heuristic(problem, iterators.greedy, alpha)
+            elif algorithm == "multistart":
+                revenue, mapping, routes = solver.multistart(problem, alpha, maxiter, betarange, stop=job.stop)
+            elif algorithm == "optimise_elites":
+                elites = solver.multistart_keep_elites(problem, alpha, maxiter, betarange,
+                                                       int(request.get("nelites", 5)), stop=job.stop)
+                revenue, mapping, routes = solver.optimise_elites(problem, elites, alpha, maxiter, betarange, stop=job.stop)
+            else:
+                raise Exception(f"Unknown algorithm {algorithm}.")
+            # NOTE: The problem stays in memory as long as the service runs, so the routes
+            # cached by the jobs must not grow without limits
+            if len(problem.routes_cache) > self.routes_cache_size:
+                problem.routes_cache.clear()
+
+        self.solve_times.append(time.monotonic() - job.started)
+        status = "cancelled" if job.cancelled.is_set() else "timeout" if job.interrupted else "done"
+        return {
+            "status": status,
+            "revenue": int(revenue),
+            "cost": float(sum(r.cost for r in routes)),
+            "alpha": float(alpha),
+            "routes": [{"source": r.source.id, "nodes": [n.id for n in r.nodes]} for r in routes],
+            "queue_time": job.started - job.submitted,
+            "solve_time": self.solve_times[-1],
+        }
+
+    async def submit (self, request):
+        """
+        This method queues a solve request and waits for its result.
+
+        NOTE: The jobs are identified by the id of their request (e.g., to cancel them),
+        so a request without an id or with the id of a job still active is rejected.
+
+        :param request: The solve request.
+        :return: The response.
+        """
+        job_id = request.get("id")
+        if job_id is None or job_id in self.jobs:
+            self.counters["error"] += 1
+            return {"status": "error", "error": "A solve request needs an id." if job_id is None else f"The job {job_id} is still active."}
+        job = Job(request)
+        self.jobs[job_id] = job
+        self.counters["submitted"] += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self._solve, job)
+        except Exception as error:
+            result = {"status": "error", "error": str(error)}
+        finally:
+            self.jobs.pop(job_id, None)
+        self.counters[result["status"]] += 1
+        return result
+
+    def cancel (self, job_id):
+        """ Cancel a queued or running job. """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return {"status": "unknown job"}
+        job.cancelled.set()
+        return {"status": "cancelling"}
+
+    def metrics (self):
+        """ The metrics of the service. """
+        uptime = time.monotonic() - self.started
+        solved = self.counters["done"] + self.counters["timeout"] + self.counters["cancelled"]
+        return {
+            "uptime": uptime,
+            "queued": sum(job.started is None for job in self.jobs.values()),
+            "running": sum(job.started is not None for job in self.jobs.values()),
+            "jobs": dict(self.counters),
+            "throughput": solved / uptime,
+            "queue_time_mean": statistics.fmean(self.queue_times) if self.queue_times else 0.0,
+            "queue_time_max": max(self.queue_times, default=0.0),
+            "solve_time_mean": statistics.fmean(self.solve_times) if self.solve_times else 0.0,
+            "cache": {"size": len(self.cache._entries), "hits": self.cache.hits,
+                      "misses": self.cache.misses, "evictions": self.cache.evictions},
+        }
+
+    async def handle (self, line, write):
+        """
+        This method handles a request line.
+
+        :param line: The JSON line of the request.
+        :param write: The coroutine function used to send a response.
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as error:
+            await write({"status": "error", "error": str(error)})
+            return
+        op, response = request.get("op", "solve"), None
+        if op == "solve":
+            response = await self.submit(request)
+        elif op == "cancel":
+            response = self.cancel(request.get("job"))
+        elif op == "metrics":
+            response = self.metrics()
+        else:
+            response = {"status": "error", "error": f"Unknown op {op}."}
+        response["id"] = request.get("id")
+        await write(response)
+
+    async def serve (self, reader, writer_function):
+        """
+        This method reads the requests line by line and handles them concurrently.
+
+        :param reader: The stream of the requests.
+        :param writer_function: The coroutine function used to send a response.
+        """
+        tasks = set()
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            task = asyncio.create_task(self.handle(line, writer_function))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+
+async def _serve_stdio (service):
+    """ Serve the requests from stdin writing the responses on stdout. """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    async def write (response):
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    await service.serve(reader, write)
+
+
+
+async def _serve_socket (service, path):
+    """ Serve the requests received by a Unix socket. """
+    async def connection (reader, writer):
+        async def write (response):
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+        await service.serve(reader, write)
+        writer.close()
+
+    server = await asyncio.start_unix_server(connection, path=path)
+    async with server:
+        await server.serve_forever()
+
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="MSTOP solve service (JSON lines).")
+    parser.add_argument("--socket", help="Path of the Unix socket (stdin/stdout are used if not given).")
+    parser.add_argument("--workers", type=int, default=4, help="Number of worker threads (they share a core, see Service).")
+    parser.add_argument("--cache-size", type=int, default=16, help="Maximum number of problems kept in memory.")
+    parser.add_argument("--routes-cache-size", type=int, default=10000, help="Maximum number of cached routes of each problem.")
+    args = parser.parse_args()
+
+    service = Service(args.workers, args.cache_size, args.routes_cache_size)
+    if args.socket:
+        asyncio.run(_serve_socket(service, args.socket))
+    else:
+        asyncio.run(_serve_stdio(service))
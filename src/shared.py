@@ -0,0 +1,327 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import sys
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+import node
+import utils
+import pjs
+import solver
+
+
+# Codes used to store the kind of each node
+NODE, SOURCE, DEPOT = 0, 1, 2
+
+
+
+def _attach_block (name):
+    """
+    Attach to an existing shared memory block without taking its ownership.
+
+    NOTE: From Python 3.13 the block can be opened without registering it
+    to the resource tracker, which would otherwise unlink it when a process
+    not started by multiprocessing exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+
+class SharedProblem:
+    """
+    An instance of this class keeps the numeric data of a problem (i.e., coordinates,
+    revenues, vehicles, distances, arrays of the edges, and savings) in shared memory blocks, so that
+    worker processes can attach to them by name instead of receiving a pickled copy
+    of the problem.
+
+    The process that creates it is the owner of the blocks and it is in charge of
+    releasing them (it can be used as a context manager).
+    """
+    def __init__(self, problem):
+        """
+        Initialise.
+
+        :param problem: The problem to share. If the savings of the edges are
+                        already set, they are shared too.
+
+        :attr problem: The shared problem (available only to the owner).
+        :attr blocks: The shared memory blocks by array name.
+        :attr spec: A small picklable description of the shared problem used by
+                    the workers to attach to it (see attach).
+        """
+        if problem.lazy:
+            raise Exception("A problem with lazy distances cannot be shared.")
+        self.problem = problem
+        allnodes = tuple(problem.iternodes())
+        iids, jids, costs, edges_revenues = problem.edges_arrays()
+        S, E = len(problem.sources), len(iids)
+
+        # Compute the arrays to share
+        kinds = [SOURCE if n.issource else DEPOT if n.isdepot else NODE for n in allnodes]
+        savings = np.zeros((S, E), dtype=problem.dists.dtype)
+        if problem.savings is not None:
+            savings = problem.savings
+        arrays = {
+            "ids": np.array([n.id for n in allnodes], dtype="int32"),
+            "kinds": np.array(kinds, dtype="int8"),
+            "coords": np.array([(n.x, n.y) for n in allnodes], dtype="float64").reshape(-1, 2),
+            "revenues": np.array([n.revenue for n in allnodes], dtype="int64"),
+            "vehicles": np.array([n.vehicles for n in allnodes], dtype="int32"),
+            "dists": np.asarray(problem.dists),
+            "iids": iids,
+            "jids": jids,
+            "costs": costs,
+            "edges_revenues": edges_revenues,
+            "savings": np.ascontiguousarray(savings),
+        }
+
+        # Copy the arrays into the shared memory blocks
+        self.blocks, layout = {}, {}
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks[key] = block
+            layout[key] = (block.name, array.shape, array.dtype.str)
+
+        self.spec = {
+            "name": problem.name,
+            "n_nodes": problem.n_nodes,
+            "n_vehicles": problem.n_vehicles,
+            "Tmax": problem.Tmax,
+            "savings": problem.savings is not None,
+            "alpha": problem.alpha,
+            "layout": layout,
+        }
+
+    def close (self):
+        """ Release the shared memory blocks. """
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, *args):
+        self.close()
+
+
+
+def attach (spec):
+    """
+    This method attaches to a shared problem and rebuilds a standard Problem
+    instance on top of it.
+    The matrix of distances, the arrays of the edges, and the savings are views on
+    the shared memory (no copy is made): only the nodes are rebuilt, the edges are
+    not instantiated (the PJS works on their arrays, see pjs._sorted_edges).
+
+    :param spec: The spec of a SharedProblem.
+    :return: The problem instance.
+    """
+    # Attach to the blocks
+    blocks, arrays = {}, {}
+    for key, (name, shape, dtype) in spec["layout"].items():
+        block = _attach_block(name)
+        blocks[key] = block
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    # Rebuild the nodes
+    sources, nodes, depot = [], [], None
+    coords, revenues, vehicles = arrays["coords"].tolist(), arrays["revenues"].tolist(), arrays["vehicles"].tolist()
+    for i, (id, kind) in enumerate(zip(arrays["ids"].tolist(), arrays["kinds"].tolist())):
+        x, y = coords[i]
+        if kind == SOURCE:
+            sources.append(node.Source(id, x, y, revenues[i], vehicles=vehicles[i]))
+        elif kind == DEPOT:
+            depot = node.Node(id, x, y, revenues[i], isdepot=True)
+        else:
+            nodes.append(node.Node(id, x, y, revenues[i]))
+
+    edges_arrays = (arrays["iids"], arrays["jids"], arrays["costs"], arrays["edges_revenues"])
+    problem = utils.Problem(spec["name"], spec["n_nodes"], spec["n_vehicles"], spec["Tmax"],
+                            tuple(sources), tuple(nodes), depot, dists=arrays["dists"], edges_arrays=edges_arrays)
+    if spec["savings"]:
+        problem.savings, problem.alpha = arrays["savings"], spec["alpha"]
+    # NOTE: The blocks are kept alive as long as the problem is
+    problem.shared_blocks = blocks
+    return problem
+
+
+
+# The problem attached by the current worker process
+_worker_problem = None
+
+
+def initializer (spec):
+    """
+    Initializer of the worker processes of a pool: it attaches each worker
+    to the shared problem only once.
+
+    :param spec: The spec of a SharedProblem.
+    """
+    global _worker_problem
+    _worker_problem = attach(spec)
+
+
+def worker_problem ():
+    """ The problem the current worker process is attached to. """
+    return _worker_problem
+
+
+
+def _multistart_task (alpha, maxiter, betarange, seed, first, implementation=None):
+    """
+    Multistart executed by a worker on its attached problem (the iterations
+    from first to first + maxiter of the seeded multistart).
+
+    NOTE: Routes reference the nodes of the worker, so they are sent back
+    as (source id, nodes ids, revenue, cost).
+    """
+    revenue, mapping, routes = solver.multistart(_worker_problem, alpha, maxiter, betarange, seed=seed, first=first, pjs=implementation)
+    return revenue, mapping, tuple((r.source.id, tuple(n.id for n in r.nodes), r.revenue, r.cost) for r in routes)
+
+
+
+def _rebuild_route (problem, source_id, nodes_ids, revenue, cost):
+    """ Rebuild a route sent back by a worker on the nodes of the given problem. """
+    allnodes = {n.id: n for n in problem.iternodes()}
+    return pjs.build_route(allnodes[source_id], problem.depot, (allnodes[i] for i in nodes_ids), revenue, cost)
+
+
+
+def parallel_multistart (shared, alpha, maxiter=1000, betarange=(0.1, 0.3), processes=None, seed=0, implementation=None):
+    """
+    Parallel execution of the multistart: the iterations are split among
+    a pool of processes attached to the same shared problem.
+
+    :param shared: The SharedProblem owned by this process (its savings must be already set).
+    :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param maxiter: The total number of iterations.
+    :param betarange: The range of the beta parameter to use in the biased randomisation.
+    :param processes: The number of processes (by default the number of cores).
+    :param seed: The master seed of the multistart.
+    :param implementation: The implementation of the PJS (see solver.heuristic).
+    :return: The best solution found with the respective mapping and revenue.
+
+    NOTE: Each iteration draws from its own random stream (see solver.multistart), so the
+    solution is the same of solver.multistart(..., seed=seed), whatever the number of processes.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    counts = [maxiter // processes + (i < maxiter % processes) for i in range(processes)]
+    tasks = [(alpha, count, betarange, seed, sum(counts[:i]), implementation) for i, count in enumerate(counts)]
+    with multiprocessing.Pool(processes, initializer=initializer, initargs=(shared.spec,)) as pool:
+        results = pool.starmap(_multistart_task, tasks)
+    revenue, mapping, routes = max(results, key=lambda result: result[0])
+    return revenue, mapping, tuple(_rebuild_route(shared.problem, *r) for r in routes)
+
+
+
+def _route_task (source_id, nodes_ids, alpha, implementation=None):
+    """ Deterministic PJS of a source executed by a worker (see SourcePool.route). """
+    allnodes = {n.id: n for n in _worker_problem.iternodes()}
+    routes = pjs.PJS_cache(_worker_problem, allnodes[source_id], tuple(allnodes[i] for i in nodes_ids), _worker_problem.depot, alpha,
+                           implementation)
+    return tuple((r.source.id, tuple(n.id for n in r.nodes), r.revenue, r.cost) for r in routes)
+
+
+
+def _optimise_task (source_id, nodes_ids, alpha, maxiter, betarange, seed, implementation):
+    """ Multistart PJS of a source executed by a worker (see SourcePool.optimise). """
+    allnodes = {n.id: n for n in _worker_problem.iternodes()}
+    routes, revenue = pjs.multistartPJS(_worker_problem, allnodes[source_id], tuple(allnodes[i] for i in nodes_ids),
+                                        _worker_problem.depot, alpha, maxiter, betarange, seed=seed, pjs=implementation)
+    return tuple((r.source.id, tuple(n.id for n in r.nodes), r.revenue, r.cost) for r in routes), revenue
+
+
+
+class SourcePool:
+    """
+    An instance of this class is a persistent pool of processes attached to a shared
+    problem, which routes the sources of a solution in parallel (see solver.heuristic
+    and solver.optimise_elite).
+
+    The routes are the same computed by a single process, because the workers
+    solve the same problem and receive the nodes of each source in the same order.
+    """
+    def __init__(self, shared, processes=None):
+        """
+        Initialise.
+
+        :param shared: The SharedProblem owned by this process (its savings must be already set).
+        :param processes: The number of processes (by default the number of cores).
+        """
+        if not shared.spec["savings"]:
+            raise Exception("The savings must be set before sharing the problem.")
+        self.shared = shared
+        self.alpha = shared.spec["alpha"]
+        self.pool = multiprocessing.Pool(processes or multiprocessing.cpu_count(), initializer=initializer, initargs=(shared.spec,))
+        self._allnodes = {n.id: n for n in shared.problem.iternodes()}
+
+    def _rebuild (self, routes):
+        allnodes, depot = self._allnodes, self.shared.problem.depot
+        return [pjs.build_route(allnodes[s], depot, (allnodes[i] for i in nodes), revenue, cost) for s, nodes, revenue, cost in routes]
+
+    def _check (self, problem, alpha):
+        if problem is not self.shared.problem:
+            raise Exception("The pool is attached to another problem.")
+        # NOTE: The workers have the savings of the alpha the problem was shared with
+        if alpha != self.alpha:
+            raise Exception(f"The problem was shared with the savings of alpha {self.alpha}, not {alpha}.")
+
+    def route (self, problem, groups, alpha, implementation=None):
+        """
+        This method executes the deterministic PJS (see pjs.PJS_cache) of some sources in parallel.
+
+        :param problem: The problem (i.e., the one shared).
+        :param groups: The sources with the nodes assigned to each of them.
+        :param alpha: The alpha value used to calculate edges savings.
+        :param implementation: The implementation of the PJS (see pjs.PJS_cache).
+        :return: The routes of each source.
+        """
+        self._check(problem, alpha)
+        tasks = [(source.id, tuple(n.id for n in nodes), alpha, implementation) for source, nodes in groups]
+        return [self._rebuild(r) for r in self.pool.starmap(_route_task, tasks)]
+
+    def optimise (self, problem, groups, alpha, maxiter, betarange, seeds, implementation=None):
+        """
+        This method executes the multistart PJS (see pjs.multistartPJS) of some sources in parallel.
+
+        :param problem: The problem (i.e., the one shared).
+        :param groups: The sources with the nodes assigned to each of them.
+        :param alpha: The alpha value used to calculate edges savings.
+        :param maxiter: The number of iterations of each multistart PJS.
+        :param betarange: The range of beta.
+        :param seeds: The master seed of each multistart PJS (see streams).
+        :param implementation: The implementation of the PJS (see pjs.multistartPJS).
+        :return: The routes and the revenue of each source.
+        """
+        self._check(problem, alpha)
+        tasks = [(source.id, tuple(n.id for n in nodes), alpha, maxiter, betarange, seed, implementation)
+                 for (source, nodes), seed in zip(groups, seeds)]
+        return [(self._rebuild(r), revenue) for r, revenue in self.pool.starmap(_optimise_task, tasks)]
+
+    def close (self):
+        """ Terminate the processes. """
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, *args):
+        self.close()
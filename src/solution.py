@@ -0,0 +1,93 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import numpy as np
+
+import pjs
+
+
+
+class CompactSolution:
+    """
+    An instance of this class is a solution (mapping and routes) encoded in a few
+    small arrays, so that many solutions can be kept in memory.
+
+    The mapping is stored as the source each node is assigned to, and the routes
+    as a single array with the ids of their nodes, where route k goes from
+    offsets[k] to offsets[k + 1].
+    """
+    __slots__ = ("revenue", "n_sources", "assignment", "sources", "offsets", "nodes", "costs", "revenues")
+
+    def __init__(self, revenue, mapping, routes):
+        """
+        Initialise.
+
+        :param revenue: The revenue of the solution.
+        :param mapping: The mapping (see mapper).
+        :param routes: The routes.
+
+        :attr n_sources: The number of sources (i.e., rows of the mapping).
+        :attr assignment: The source of each column of the mapping (-1 if none).
+        :attr sources: The source id of each route.
+        :attr offsets: The offset of each route in nodes (plus the end of the last one).
+        :attr nodes: The ids of the nodes of all the routes.
+        :attr costs: The cost of each route.
+        :attr revenues: The revenue of each route.
+        """
+        self.revenue = revenue
+        self.n_sources = mapping.shape[0]
+        assigned = mapping.any(axis=0)
+        self.assignment = np.where(assigned, mapping.argmax(axis=0), -1).astype("int16")
+        self.sources = np.fromiter((r.source.id for r in routes), dtype="int32", count=len(routes))
+        self.offsets = np.zeros(len(routes) + 1, dtype="int32")
+        np.cumsum([len(r.nodes) for r in routes], out=self.offsets[1:])
+        self.nodes = np.fromiter((n.id for r in routes for n in r.nodes), dtype="int32", count=int(self.offsets[-1]))
+        self.costs = np.fromiter((r.cost for r in routes), dtype="float64", count=len(routes))
+        self.revenues = np.fromiter((r.revenue for r in routes), dtype="int64", count=len(routes))
+
+    def __len__ (self):
+        """ The number of routes. """
+        return len(self.sources)
+
+    @property
+    def nbytes (self):
+        """ The memory used by the arrays. """
+        return sum(getattr(self, key).nbytes for key in ("assignment", "sources", "offsets", "nodes", "costs", "revenues"))
+
+    def mapping (self):
+        """ The mapping as a matrix (see mapper). """
+        mapping = np.zeros((self.n_sources, len(self.assignment)))
+        columns = np.flatnonzero(self.assignment >= 0)
+        mapping[self.assignment[columns], columns] = 1
+        return mapping
+
+    def routes (self, problem):
+        """
+        This method converts the routes back to Route instances (e.g., for output.plot).
+
+        :param problem: The problem instance the routes refer to.
+        :return: The routes.
+        """
+        allnodes = {n.id: n for n in problem.iternodes()}
+        offsets, nodes = self.offsets.tolist(), self.nodes.tolist()
+        return tuple(pjs.build_route(allnodes[s], problem.depot, [allnodes[i] for i in nodes[offsets[k]:offsets[k + 1]]], r, c)
+                     for k, (s, r, c) in enumerate(zip(self.sources.tolist(), self.revenues.tolist(), self.costs.tolist())))
+
+    def mapping_key (self):
+        """ The hashable key of the mapping (see elites.mapping_key). """
+        return self.assignment.tobytes()
+
+    def routes_key (self):
+        """ The hashable key of the routes (see elites.routes_key). """
+        offsets, nodes = self.offsets.tolist(), self.nodes.tolist()
+        return frozenset(tuple(nodes[offsets[k]:offsets[k + 1]]) for k in range(len(self.sources)))
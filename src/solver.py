@@ -19,7 +19,20 @@ import heapq
 
 from iterators import greedy, BRA
 from mapper import mapper
-from pjs import PJS, PJS_cache, multistartPJS
+from pjs import PJS, PJS_cache, multistartPJS, revenue_bound
+from elites import ElitePool, CompactSolution, decode, mapping_key, routes_key
+from streams import SeededSolution, stream, derive
+from checkpoint import pack_solutions, unpack_solutions, set_rng_state
+
+
+
+def _native ():
+    """
+    The module of the C++ version, imported only when the native backend
+    is used (it may compile the library the first time).
+    """
+    import native
+    return native
 
 
 
@@ -27,19 +40,27 @@ def set_savings (problem, alpha=0.3):
     """
     This method calculate the saving of edges according to the given alpha.
 
-    NOTE: Edges are modified in place.
+    NOTE: The problem is modified in place.
 
     :param problem: The instance of the problem to solve.
     :param alpha: The alpha parameter of the PJS.
     :return: The problem instance modified in place.
     """
     dists, depot = problem.dists, problem.depot
-    for edge in problem.edges:
-        cost, inode, jnode = edge.cost, edge.inode, edge.jnode
-        revenue = inode.revenue + jnode.revenue
-        edge.savings = {
-            source.id : (1.0 - alpha)*(dists[inode.id, depot.id] + dists[source.id, jnode.id] - cost) + alpha*revenue
-        for source in problem.sources}
+    problem.alpha = alpha
+    # NOTE: With lazy distances the edges are not instantiated, so the PJS computes
+    # the savings of the edges it needs by using problem.alpha (see pjs.sorted_edges).
+    if problem.lazy:
+        return problem
+    # Extract the edges characteristics
+    iids, jids, costs, revenues = problem.edges_arrays()
+    sids = np.array([source.id for source in problem.sources], dtype="int64")
+    # Compute the savings of all the edges for all the sources (one row per source)
+    # NOTE: Savings are computed in float64 and then stored with the precision of the distances.
+    savings = (1.0 - alpha)*(dists[iids, depot.id].astype("float64") + dists[sids[:, None], jids].astype("float64") - costs) + alpha*revenues
+    # NOTE: Sources ids go from 0 to S-1 (see the mapping), so the row of a source is its id.
+    # The savings are kept only in this matrix (the PJS sorts the edges on it, see pjs._sorted_edges).
+    problem.savings = savings.astype(dists.dtype)
     return problem
 
 
@@ -62,7 +83,7 @@ def alpha_optimisation (problem, alpha_range=np.arange(0.0, 1.1, 0.1)):
     The value of alpha that provides the best deterministic solution
     is kept.
 
-    NOTE: This method also changes in place the savings of the edges.
+    NOTE: This method also changes in place the savings of the problem.
 
     :param problem: The problem instance to solve .
     :param alpha_range: The levels of alpha to test.
@@ -100,7 +121,7 @@ def alpha_optimisation (problem, alpha_range=np.arange(0.0, 1.1, 0.1)):
 
 
 
-def heuristic (problem, iterator, alpha):
+def heuristic (problem, iterator, alpha, backend="python", incumbent=None, pool=None, delta=None, pjs=None):
     """
     This is the main executiom of the solver.
     It can be deterministic of stochastic depending on the iterator
@@ -109,15 +130,56 @@ def heuristic (problem, iterator, alpha):
     :param problem: The problem instance to solve.
     :param iterator: The iterator to be passed to the mapper.
     :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param backend: "python" or "native" to use the C++ version (only with the greedy iterator
+                and without incumbent, pool, delta, and pjs).
+    :param incumbent: If given, the revenue of the solution to beat: after the mapping, the
+                    routing is abandoned as soon as the revenue of the routes built so far plus
+                    the upper bounds of the remaining sources (see pjs.revenue_bound) is not
+                    higher than it, and the revenue returned is None.
+    :param pool: An optional shared.SourcePool attached to the problem, used to route the
+                sources in parallel (the routes are the same).
+    :param delta: An optional delta.DeltaRouter used instead of the PJS: the routes of each
+                source are updated from those of its previous call when the nodes changed a little.
+    :param pjs: The implementation of the PJS used to route the sources (see pjs.PJS_cache), e.g.
+                pjs.PJS_array, whose compiled kernel is faster (its routes may differ).
     :return: The solution as a set of routes, their total revenue, the mapping represented a matrix.
     """
+    if backend == "native":
+        if iterator is not greedy:
+            raise Exception("The native backend supports only the greedy iterator.")
+        # NOTE: The C++ version has none of these options, so they must not be silently ignored
+        unsupported = [name for name, value in (("incumbent", incumbent), ("pool", pool), ("delta", delta), ("pjs", pjs))
+                       if value is not None]
+        if unsupported:
+            raise Exception(f"The native backend does not support {', '.join(unsupported)}.")
+        return _native().solve(problem, "heuristic", alpha)
     # Mapping
     mapping = mapper(problem, iterator)
+    # Eventually route all the sources in parallel
+    if pool is not None:
+        if incumbent is not None or delta is not None:
+            raise Exception("The routing cannot be abandoned or updated when the sources are routed in parallel.")
+        routes = [r for rs in pool.route(problem, [(s, tuple(s.nodes)) for s in problem.sources], alpha, pjs) for r in rs]
+        return sum(r.revenue for r in routes), mapping, tuple(routes)
+    # Upper bounds of the revenue of each source
+    if incumbent is not None:
+        bounds = [revenue_bound(problem, source, source.nodes, problem.depot) for source in problem.sources]
+        remaining, partial = sum(bounds), 0
     # PJS on routes
     routes = []
-    for source in problem.sources:
-        r = PJS_cache(problem, source, tuple(source.nodes), problem.depot, alpha)
+    for i, source in enumerate(problem.sources):
+        # Eventually abandon the mapping
+        if incumbent is not None:
+            if partial + remaining <= incumbent:
+                return None, mapping, tuple(routes)
+            remaining -= bounds[i]
+        if delta is not None:
+            r = delta.route(problem, source, tuple(source.nodes), problem.depot, alpha, pjs)
+        else:
+            r = PJS_cache(problem, source, tuple(source.nodes), problem.depot, alpha, pjs)
         routes.extend(r)
+        if incumbent is not None:
+            partial += sum(route.revenue for route in r)
     # Calculate total revenue
     revenue = sum(r.revenue for r in routes)
     # Return the mapping, the routes and the revenue
@@ -126,7 +188,8 @@ def heuristic (problem, iterator, alpha):
 
 
 
-def multistart (problem, alpha, maxiter=1000, betarange=(0.1, 0.3)):
+def multistart (problem, alpha, maxiter=1000, betarange=(0.1, 0.3), backend="python", stop=None, prune=False, stats=None, reactive=None,
+                seed=None, first=0, delta=None, trace=None, pjs=None):
     """
     This is the multistart execution of the PJS algorithm.
     At each iteration a new solution is generated by introducing
@@ -139,31 +202,93 @@ def multistart (problem, alpha, maxiter=1000, betarange=(0.1, 0.3)):
     :param maxiter: The maximum number of iterations and different
                     mapping tested.
     :param betarange: The range of the beta parameter to use in the biased randomisation.
+    :param backend: "python" or "native" to use the C++ version (only with seed and the
+                default values of the other options, otherwise an exception is raised).
+    :param stop: A function called at each iteration: when it returns True the search is
+                interrupted (e.g., deadline or cancellation) and the best solution found
+                so far is returned.
+    :param prune: If True, the routing of a mapping is abandoned as soon as it cannot beat
+                the best solution (see the incumbent of the heuristic). The result does not
+                change, since only solutions that would be discarded are skipped.
+    :param stats: An optional dictionary filled with the number of "iterations" executed,
+                of mappings "pruned", the "pruning_rate", and the iteration the best
+                solution was found at ("best_iteration", 0 for the greedy one).
+    :param reactive: An optional ReactiveBeta used to generate beta instead of the uniform
+                distribution over betarange (at the end it holds the learned distribution),
+                betarange must be the default one or the range of the reactive beta.
+    :param seed: If given, the iteration i draws its random numbers from stream(seed, i)
+                instead of the random module, so it gives the same solution whatever was
+                executed before (e.g., the iterations can be split among processes).
+    :param first: The index of the first iteration (only with a seed).
+    :param delta: An optional delta.DeltaRouter used to route the mappings (see heuristic):
+                each iteration starts from the routes of the previous one, which is faster
+                but gives worse routes than the PJS (at the end it holds the stats).
+    :param trace: An optional anytime.Trajectory where the greedy solution and every
+                iteration are recorded (i.e., the improvements of the best revenue).
+    :param pjs: The implementation of the PJS used to route the mappings (see heuristic).
 
     :return: The best solution found so far with the respective mapping and revenue.
     """
     # Check the values provided for the beta parameter
     if betarange[0] > betarange[1]:
         raise Exception("Min beta should be higher than max beta.")
+    if reactive is not None:
+        reactive.check(betarange)
+
+    if backend == "native":
+        # NOTE: The C++ version has none of these options, so they must not be silently ignored
+        unsupported = [name for name, value in (("stop", stop), ("stats", stats), ("reactive", reactive), ("delta", delta),
+                                                ("trace", trace), ("pjs", pjs)) if value is not None]
+        unsupported += [name for name, value in (("prune", prune), ("first", first)) if value]
+        if unsupported:
+            raise Exception(f"The native backend does not support {', '.join(unsupported)}.")
+        return _native().solve(problem, "metaheuristic", alpha, maxiter, betarange, seed=seed)
 
     # Save beta ranges
     minbeta, maxbeta = betarange
 
     # Initialise the starting solution as the greedy one
-    brevenue, bmapping, broutes = heuristic(problem, iterator=greedy, alpha=alpha)
+    brevenue, bmapping, broutes = heuristic(problem, iterator=greedy, alpha=alpha, delta=delta, pjs=pjs)
+    iterations, pruned, best_iteration = 0, 0, 0
+    if trace is not None:
+        trace.record(brevenue, iterations=0)
 
     # Iterated Local Search
     for i in range(maxiter):
 
+        # Eventually interrupt the search
+        if stop is not None and stop():
+            break
+
         # Initialise the biased randomised iterator
-        _bra = functools.partial(BRA, beta=random.uniform(minbeta, maxbeta))
+        rng = random if seed is None else stream(seed, first + i)
+        if reactive is not None:
+            bucket, beta = reactive.sample(rng)
+        else:
+            beta = rng.uniform(minbeta, maxbeta)
+        _bra = functools.partial(BRA, beta=beta, rng=rng)
 
         # Generate a new solution
-        revenue, mapping, routes = heuristic(problem, iterator=_bra, alpha=alpha)
+        revenue, mapping, routes = heuristic(problem, iterator=_bra, alpha=alpha, incumbent=brevenue if prune else None, delta=delta,
+                                             pjs=pjs)
+        iterations += 1
+        if trace is not None:
+            trace.record(revenue)
+
+        # NOTE: Pruned solutions are recorded as not improving, their revenue is unknown
+        if reactive is not None:
+            reactive.update(bucket, revenue, revenue is not None and revenue > brevenue)
 
         # Eventually update the best
-        if revenue > brevenue:
+        if revenue is None:
+            pruned += 1
+        elif revenue > brevenue:
             brevenue, bmapping, broutes = revenue, mapping, routes
+            best_iteration = iterations
+
+    if stats is not None:
+        stats.update(iterations=iterations, pruned=pruned, pruning_rate=pruned / iterations if iterations else 0.0,
+                     best_iteration=best_iteration)
 
     # Return the best solution found so far
     return brevenue, bmapping, broutes
@@ -171,10 +296,13 @@ def multistart (problem, alpha, maxiter=1000, betarange=(0.1, 0.3)):
 
 
 
-def multistart_keep_elites (problem, alpha, maxiter=1000, betarange=(0.1, 0.3), nelites=5):
+def multistart_keep_elites (problem, alpha, maxiter=1000, betarange=(0.1, 0.3), nelites=5, mindistance=0, stop=None, checkpoint=None,
+                            pool=None, compact=False, seed=None, trace=None):
     """
     Same as the multistart, but instead of saving just the best solution, we keep
     track of the nelites best ones storing them in a heap.
+    Duplicated solutions (i.e., same mapping or same routes) are never kept twice,
+    so that the elites optimisation only runs on distinct solutions.
 
     :param problem: The problem instance to solve.
     :param alpha: The alpha value used to calculate edges savings (used only for caching)
@@ -182,8 +310,24 @@ def multistart_keep_elites (problem, alpha, maxiter=1000, betarange=(0.1, 0.3),
                     mapping tested.
     :param betarange: The range of the beta parameter to use in the biased randomisation.
     :param nelites: The number of elite solutions we keep in memory.
-
-    :return: The best solution found so far with the respective mapping and revenue.
+    :param mindistance: The minimum number of nodes that must be assigned to a different
+                        source between two elites (0 means that only duplicates are rejected).
+    :param stop: A function called at each iteration to eventually interrupt the search (see multistart).
+    :param checkpoint: An optional Checkpoint where the elites, the iteration, and the state
+                    of the random module are saved every checkpoint.every iterations (and when
+                    the search is interrupted or concluded). If it already contains the state of
+                    this phase, the search is resumed from there.
+    :param pool: An optional ElitePool to update instead of a new one (e.g., to continue a
+                previous search); the greedy solution is only inserted if it is empty.
+    :param compact: If True the elites are stored as CompactSolution (see ElitePool).
+    :param seed: If given, the iteration i draws its random numbers from stream(seed, i) (see
+                multistart), and the elites are stored as SeededSolution --i.e., only the
+                iteration is kept and the solution is rebuilt on demand (see elites.decode).
+    :param trace: An optional anytime.Trajectory where the greedy solution and every
+                iteration are recorded (see multistart).
+
+    :return: The elite solutions as tuples (revenue, count, mapping, routes), or
+            (revenue, count, solution) if compact or seeded.
     """
     # Check the values provided for the beta parameter
     if betarange[0] > betarange[1]:
@@ -192,79 +336,196 @@ def multistart_keep_elites (problem, alpha, maxiter=1000, betarange=(0.1, 0.3),
     # Save beta ranges
     minbeta, maxbeta = betarange
 
-    # Initialise the heap of the best solutions
-    bestsolutions = []
+    # Initialise the pool of the best solutions
+    if pool is None:
+        pool = ElitePool(nelites, mindistance, compact)
+
+    # The parameters the search is resumed with must be the ones of the checkpoint
+    parameters = dict(alpha=float(alpha), maxiter=int(maxiter), nelites=pool.nelites,
+                      betarange=(float(minbeta), float(maxbeta)), seed=seed)
+
+    def _save (iteration):
+        elites = pool.elites()
+        seeded = [(e[2].iteration, e[2].beta or 0.0) for e in elites] if seed is not None else []
+        checkpoint.save("elites", problem, parameters, iteration=np.int64(iteration), counts=np.array([e[1] for e in elites], dtype="int64"),
+                        pool=np.array(pool.counters(), dtype="int64"), seeded=np.array(seeded, dtype="float64").reshape(-1, 2),
+                        **pack_solutions(decode(problem, e) for e in elites))
+
+    def _elite (revenue, count, mapping, routes, iteration=None, beta=None):
+        # Build an elite as it is stored in the pool (used to restore the pool)
+        if seed is not None:
+            # NOTE: The keys are hashed as in ElitePool.push
+            seeded = SeededSolution(seed, iteration, beta, alpha)
+            seeded.keys = (hash(mapping_key(mapping)), hash(routes_key(routes)))
+            return revenue, count, seeded
+        if pool.compact:
+            return revenue, count, CompactSolution(revenue, mapping, routes)
+        return revenue, count, mapping, routes
+
+    state = None if checkpoint is None else checkpoint.load("elites", problem, parameters)
+    if state is not None:
+        # Resume the search from the checkpoint
+        start = int(state["iteration"])
+        solutions = unpack_solutions(problem, state)
+        seeded = [(int(it), beta) for it, beta in state["seeded"].tolist()] if seed is not None else [()] * len(solutions)
+        if len(seeded) != len(solutions):
+            raise Exception(f"The checkpoint {checkpoint.filename} does not contain the seeded elites.")
+        pool.restore((_elite(r, c, m, rs, *sd) for (r, m, rs), c, sd in zip(solutions, state["counts"].tolist(), seeded)),
+                     *state["pool"].tolist())
+        set_rng_state(state["rng"], state["gauss"])
+    else:
+        # Initialise the starting solution as the greedy one
+        start = 0
+        if len(pool) == 0:
+            revenue, mapping, routes = heuristic(problem, iterator=greedy, alpha=alpha)
+            pool.push(revenue, mapping, routes, seeded=None if seed is None else SeededSolution(seed, -1, None, alpha))
+            if trace is not None:
+                trace.record(revenue, iterations=0)
 
-    # Initialise the count of insered solutions to avoid comparison of not comparable
-    # elements into the heap
-    count = 0
-
-    # Initialise the starting solution as the greedy one (i.e., brevenue, bmapping, broutes)
-    revenue, routes, mapping = heuristic(problem, iterator=greedy, alpha=alpha)
+    # Iterated Local Search
+    for i in range(start, maxiter):
 
-    # Update the heap
-    heapq.heappush(bestsolutions, (revenue, count, routes, mapping ))
-    count += 1
+        # Eventually save the state
+        if checkpoint is not None and i > start and i % checkpoint.every == 0:
+            _save(i)
 
-    # Iterated Local Search
-    for i in range(maxiter):
+        # Eventually interrupt the search
+        if stop is not None and stop():
+            break
 
         # Initialise the biased randomised iterator
-        _bra = functools.partial(BRA, beta=random.uniform(minbeta, maxbeta))
+        rng = random if seed is None else stream(seed, i)
+        beta = rng.uniform(minbeta, maxbeta)
+        _bra = functools.partial(BRA, beta=beta, rng=rng)
 
-        # Generate a new solution (i.e., revenue, mapping, routes)
-        revenue, routes, mapping = heuristic(problem, iterator=_bra, alpha=alpha)
+        # Generate a new solution
+        revenue, mapping, routes = heuristic(problem, iterator=_bra, alpha=alpha)
 
-        # Eventually update the best
-        if len(bestsolutions) == nelites and revenue > bestsolutions[0][0]:
-            heapq.heappushpop(bestsolutions, (revenue, count, routes, mapping))
-            count += 1
+        # Eventually update the elites
+        pool.push(revenue, mapping, routes, seeded=None if seed is None else SeededSolution(seed, i, beta, alpha))
+        if trace is not None:
+            trace.record(revenue)
+    else:
+        i = maxiter
 
-        # Update the heap if its capacity is not saturated
-        if len(bestsolutions) < nelites:
-            heapq.heappush(bestsolutions, (revenue, count, routes, mapping))
-            count += 1
+    if checkpoint is not None:
+        _save(i)
 
-    # Return the best solution found so far
-    return tuple(bestsolutions)
+    # Return the best solutions found so far
+    return pool.elites()
 
 
 
-def optimise_elites (problem, elites, alpha, maxiter=1000, betarange=(0.1, 0.3)):
+def optimise_elite (problem, elite, index, alpha, maxiter=1000, betarange=(0.1, 0.3), stop=None, seed=None, pjs=None, pool=None):
     """
-    This process is used to optimise the elite solutions using a multistart PJS.
+    This method optimises an elite solution keeping its mapping and running a multistart
+    PJS on the nodes assigned to each source.
 
     :param problem: The problem instance to solve.
-    :param elites: The elite solutions presented as sets of routes.
-    :param alpha: The alpha value used to calculate edges savings (used only for caching)
-    :param maxiter: The number of solutions explored.
-    :param betarange: The range of beta used for the generation of different solutions
-                        with a biased randomised approach.
-    :return: The best solution chosen among the optimised elites.
+    :param elite: The elite solution (see multistart_keep_elites).
+    :param index: The index of the elite (used to derive the seeds).
+    :param seed: If given, the multistart PJS of the source s uses the master seed
+                derive(seed, index, s) (see multistartPJS).
+    :param pjs: The implementation of the PJS (see multistartPJS).
+    :param pool: An optional shared.SourcePool attached to the problem, used to run the multistart
+                PJS of the sources in parallel (a seed is needed, and stop is not checked).
+    :return: The revenue, the mapping, and the routes of the optimised elite.
     """
-    # Initialise the current best
-    bestroutes, bestrevenue, bestmapping = elites[0][3], elites[0][0], elites[0][2]
-
     S = len(problem.sources)
 
-    for _, _, mapping, _ in elites:
+    # Init the optimised routes and revenue
+    total_routes, total_revenue, mapping = [], 0, decode(problem, elite)[1]
+
+    # Eventually optimise all the sources in parallel
+    if pool is not None:
+        if seed is None:
+            raise Exception("A seed is needed to optimise the sources in parallel.")
+        groups = [(source, tuple(node for node, v in zip(problem.nodes, mapping[i, S:]) if v == 1))
+                  for i, source in enumerate(problem.sources)]
+        seeds = [derive(seed, index, i) for i in range(S)]
+        for routes, revenue in pool.optimise(problem, groups, alpha, maxiter, betarange, seeds, pjs):
+            total_routes.extend(routes)
+            total_revenue += revenue
+        return total_revenue, mapping, total_routes
 
-        # Init the optimised routes and revenue
-        total_routes, total_revenue = [], 0
+    # Run a multi start PJS on each group of nodes assigned to a single source
+    for i, source in enumerate(problem.sources):
 
-        # Run a multi start PJS on each group of nodes assigned to a single source
-        for i, source in enumerate(problem.sources):
+        nodes = tuple(node for node, v in zip(problem.nodes, mapping[i, S:]) if v == 1)
 
-            nodes = tuple(node for node, v in zip(problem.nodes, mapping[i, S:]) if v == 1)
+        routes, revenue = multistartPJS(problem, source, nodes, problem.depot, alpha, maxiter, betarange, stop,
+                                        seed=None if seed is None else derive(seed, index, i), pjs=pjs)
 
-            routes, revenue = multistartPJS(problem, source, nodes, problem.depot, alpha, maxiter, betarange)
+        total_routes.extend(routes)
+        total_revenue += revenue
 
-            total_routes.extend(routes)
-            total_revenue += revenue
+    return total_revenue, mapping, total_routes
+
+
+
+def optimise_elites (problem, elites, alpha, maxiter=1000, betarange=(0.1, 0.3), stop=None, checkpoint=None, seed=None, pjs=None,
+                     pool=None, trace=None):
+    """
+    This process is used to optimise the elite solutions using a multistart PJS.
+
+    :param problem: The problem instance to solve.
+    :param elites: The elite solutions (see multistart_keep_elites).
+    :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param maxiter: The number of solutions explored.
+    :param betarange: The range of beta used for the generation of different solutions
+                        with a biased randomised approach.
+    :param stop: A function called at each iteration to eventually interrupt the search (see multistart).
+    :param checkpoint: An optional Checkpoint where the best solution, the number of elites
+                    already optimised, and the state of the random module are saved after each
+                    elite. If it already contains the state of this phase, the optimisation is
+                    resumed from there (the elites must be the same).
+    :param seed: If given, the multistart PJS of the elite e and the source s uses the master
+                seed derive(seed, e, s) (see multistartPJS).
+    :param pjs: The implementation of the PJS (see multistartPJS).
+    :param pool: An optional shared.SourcePool used to optimise the sources of each elite in
+                parallel (see optimise_elite).
+    :param trace: An optional anytime.Trajectory where each optimised elite is recorded as
+                maxiter iterations for each source (i.e., those of the multistart PJS).
+    :return: The best solution chosen among the optimised elites.
+    """
+    # Initialise the current best as the best elite (i.e., the solution returned
+    # if the search is interrupted)
+    bestrevenue, bestmapping, bestroutes = decode(problem, max(elites, key=lambda elite: elite[0]))
+
+    # The parameters the optimisation is resumed with must be the ones of the checkpoint
+    parameters = dict(alpha=float(alpha), maxiter=int(maxiter), nelites=len(elites),
+                      betarange=(float(betarange[0]), float(betarange[1])), seed=seed)
+
+    state, start = None if checkpoint is None else checkpoint.load("optimise", problem, parameters), 0
+    if state is not None:
+        # Resume the optimisation from the checkpoint
+        start = int(state["elite"])
+        (bestrevenue, bestmapping, bestroutes), = unpack_solutions(problem, state)
+        set_rng_state(state["rng"], state["gauss"])
+
+    for e, elite in enumerate(elites[start:], start):
+
+        # Eventually interrupt the search
+        if stop is not None and stop():
+            break
+
+        # Eventually save the state
+        # NOTE: The state is saved before optimising the elite and not when the search is
+        # interrupted, so an elite optimised only in part is optimised again on resume.
+        if checkpoint is not None:
+            checkpoint.save("optimise", problem, parameters, elite=np.int64(e), **pack_solutions(((bestrevenue, bestmapping, bestroutes),)))
+
+        # Optimise the elite
+        total_revenue, mapping, total_routes = optimise_elite(problem, elite, e, alpha, maxiter, betarange, stop, seed, pjs, pool)
+        if trace is not None:
+            trace.record(total_revenue, iterations=maxiter * len(problem.sources))
 
         # Eventually update the best
         if total_revenue > bestrevenue:
             bestroutes, bestrevenue, bestmapping = total_routes, total_revenue, mapping
+    else:
+        if checkpoint is not None:
+            checkpoint.save("optimise", problem, parameters, elite=np.int64(len(elites)), **pack_solutions(((bestrevenue, bestmapping, bestroutes),)))
 
     # Return the best routes, revenue, and mapping
     return bestrevenue, bestmapping, tuple(bestroutes)
@@ -0,0 +1,104 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import random
+import functools
+
+import iterators
+
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+
+def _splitmix (value):
+    """ The output function of the SplitMix64 generator (it scrambles a 64-bit integer). """
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+
+def derive (seed, *keys):
+    """
+    A new master seed derived from a master seed and some integer keys (e.g., to
+    give an independent seed to each multistart PJS executed by the same search).
+    """
+    for key in keys:
+        seed = _splitmix(_splitmix(seed & _MASK) ^ (key & _MASK))
+    return seed
+
+
+
+def stream (seed, iteration):
+    """
+    The random generator of an iteration.
+
+    The generator only depends on the master seed and on the iteration, so an
+    iteration can be executed again (or by another process) drawing exactly the
+    same numbers, whatever was executed before.
+
+    :param seed: The master seed.
+    :param iteration: The index of the iteration.
+    :return: A random.Random instance.
+    """
+    return random.Random(derive(seed, iteration))
+
+
+
+class SeededSolution:
+    """
+    An instance of this class represents a solution of the multistart by the
+    iteration that generated it, so that it can be rebuilt on demand instead of
+    being kept in memory.
+
+    NOTE: The problem must have the savings of the same alpha when the solution is rebuilt.
+    """
+    __slots__ = ("seed", "iteration", "beta", "alpha", "keys")
+
+    def __init__(self, seed, iteration, beta, alpha, keys=None):
+        """
+        Initialise.
+
+        :param seed: The master seed of the multistart.
+        :param iteration: The index of the iteration (-1 for the greedy solution).
+        :param beta: The beta of the biased randomised mapping.
+        :param alpha: The alpha used to calculate edges savings.
+        :param keys: The hashes of the mapping and routes keys (see ElitePool).
+        """
+        self.seed = seed
+        self.iteration = iteration
+        self.beta = beta
+        self.alpha = alpha
+        self.keys = keys
+
+    def iterator (self):
+        """ The iterator of the mapper used by the iteration. """
+        if self.iteration < 0:
+            return iterators.greedy
+        rng = stream(self.seed, self.iteration)
+        # NOTE: The first number of the stream was used to draw beta
+        rng.random()
+        return functools.partial(iterators.BRA, beta=self.beta, rng=rng)
+
+    def solve (self, problem):
+        """
+        This method rebuilds the solution.
+
+        :param problem: The problem instance.
+        :return: The revenue, the mapping, and the routes.
+        """
+        # NOTE: Imported here because the solver uses this module
+        import solver
+        return solver.heuristic(problem, self.iterator(), self.alpha)
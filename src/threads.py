@@ -0,0 +1,158 @@
+"""
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+This file is part of the collaboration with Universitat Oberta de Catalunya (UOC) on
+Multi-Source Team Orienteering Problem (MSTOP).
+The objective of the project is to develop an efficient algorithm to solve this extension
+of the classic team orienteering problem, in which the vehicles / paths may start from
+several different sources.
+
+Author: Mattia Neroni, Ph.D., Eng.
+Contact: mneroni@uoc.edu
+Date: January 2022
+%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
+"""
+import copy
+import queue
+import collections
+import concurrent.futures
+
+import utils
+import solver
+import shared
+from pjs import PJS_array
+from elites import decode
+
+
+
+def local_problem (problem):
+    """
+    A copy of the problem that can be solved by a thread while other threads solve
+    other copies: the nodes (i.e., the state changed by Mapper and PJS) are copied,
+    while distances, arrays of the edges, and savings are shared (they are only read).
+    Lazy distances are forked, so that each copy keeps its own rows (see
+    distances.LazyDistances.fork).
+
+    :param problem: The problem instance (its savings must be already set).
+    :return: The copy of the problem.
+    """
+    allnodes = {}
+    for n in problem.iternodes():
+        c = allnodes[n.id] = copy.copy(n)
+        c.route = None
+        if c.issource:
+            c.preferences, c.nodes = collections.deque(), collections.deque()
+
+    lazy = problem.lazy
+    local = utils.Problem(problem.name, problem.n_nodes, problem.n_vehicles, problem.Tmax,
+                          tuple(allnodes[s.id] for s in problem.sources), tuple(allnodes[n.id] for n in problem.nodes),
+                          allnodes[problem.depot.id], dists=problem.dists.fork() if lazy else problem.dists,
+                          edges_arrays=None if lazy else problem.edges_arrays())
+    local.savings, local.alpha = problem.savings, problem.alpha
+    return local
+
+
+
+def _execute (problem, task, arguments, threads, pjs):
+    """
+    Execute a task for each tuple of arguments on a pool of threads: each thread takes
+    a copy of the problem (see local_problem) that is not used by other threads, and
+    gives it back when the task is concluded.
+
+    NOTE: At most a copy for each thread is made, and the copies (together with the
+    routes cached in them) are released when all the tasks are concluded.
+
+    :return: The results of the tasks in the order of the arguments.
+    """
+    copies = queue.SimpleQueue()
+
+    def run (args):
+        try:
+            local = copies.get_nowait()
+        except queue.Empty:
+            local = local_problem(problem)
+        try:
+            return task(local, *args)
+        finally:
+            copies.put(local)
+
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(run, arguments))
+
+
+
+def _routes_ids (routes):
+    """ The routes as (source id, nodes ids, revenue, cost), so they can be rebuilt on another copy. """
+    return tuple((r.source.id, tuple(n.id for n in r.nodes), r.revenue, r.cost) for r in routes)
+
+
+
+def _multistart_task (local, alpha, maxiter, betarange, seed, first, pjs):
+    """ Multistart executed by a thread on its copy of the problem (see shared._multistart_task). """
+    revenue, mapping, routes = solver.multistart(local, alpha, maxiter, betarange, seed=seed, first=first, pjs=pjs)
+    return revenue, mapping, _routes_ids(routes)
+
+
+
+def threaded_multistart (problem, alpha, maxiter=1000, betarange=(0.1, 0.3), threads=4, seed=0, pjs=PJS_array):
+    """
+    Parallel execution of the multistart by a pool of threads (e.g., where worker processes
+    cannot be forked): the iterations are split among the threads as in shared.parallel_multistart.
+
+    NOTE: The threads run in parallel only where the GIL is released, i.e. in the compiled
+    kernel of pjs.PJS_array (the mapper is pure Python and holds it), while with pjs.PJS
+    they take turns. The solution is the same of solver.multistart(..., seed=seed, pjs=pjs)
+    whatever the number of threads.
+
+    :param problem: The problem instance (its savings must be already set).
+    :param alpha: The alpha value used to calculate edges savings (used only for caching)
+    :param maxiter: The total number of iterations.
+    :param betarange: The range of the beta parameter to use in the biased randomisation.
+    :param threads: The number of threads.
+    :param seed: The master seed of the multistart.
+    :param pjs: The implementation of the PJS (see solver.heuristic).
+    :return: The best solution found with the respective mapping and revenue.
+    """
+    counts = [maxiter // threads + (i < maxiter % threads) for i in range(threads)]
+    arguments = [(alpha, counts[i], betarange, seed, sum(counts[:i]), pjs) for i in range(threads)]
+    results = _execute(problem, _multistart_task, arguments, threads, pjs)
+    revenue, mapping, routes = max(results, key=lambda result: result[0])
+    return revenue, mapping, tuple(shared._rebuild_route(problem, *r) for r in routes)
+
+
+
+def _optimise_task (local, elite, index, alpha, maxiter, betarange, seed, pjs):
+    """ Optimisation of an elite executed by a thread on its copy of the problem. """
+    revenue, mapping, routes = solver.optimise_elite(local, elite, index, alpha, maxiter, betarange, seed=seed, pjs=pjs)
+    return revenue, mapping, _routes_ids(routes)
+
+
+
+def threaded_optimise_elites (problem, elites, alpha, maxiter=1000, betarange=(0.1, 0.3), threads=4, seed=0, pjs=PJS_array):
+    """
+    Parallel execution of solver.optimise_elites by a pool of threads: each thread
+    optimises some elites on its copy of the problem.
+
+    NOTE: The solution is the same of solver.optimise_elites(..., seed=seed, pjs=pjs) whatever
+    the number of threads, and with pjs.PJS_array most of the time is spent in a kernel
+    that releases the GIL.
+
+    :param problem: The problem instance (its savings must be already set).
+    :param elites: The elite solutions (see solver.multistart_keep_elites).
+    :param threads: The number of threads.
+    :param seed: The master seed of the multistart PJS (see solver.optimise_elite).
+    :param pjs: The implementation of the PJS (see pjs.multistartPJS).
+    :return: The best solution chosen among the optimised elites.
+    """
+    bestrevenue, bestmapping, bestroutes = decode(problem, max(elites, key=lambda elite: elite[0]))
+
+    # NOTE: Only the mappings of the elites are needed, so the seeded or compact elites are decoded
+    # here (the copies may not have the edges to rebuild them, see local_problem).
+    arguments = [((revenue, e, mapping, routes), e, alpha, maxiter, betarange, seed, pjs)
+                 for e, (revenue, mapping, routes) in enumerate(decode(problem, elite) for elite in elites)]
+    # NOTE: The elites are compared in order as in solver.optimise_elites
+    for revenue, mapping, routes in _execute(problem, _optimise_task, arguments, threads, pjs):
+        if revenue > bestrevenue:
+            bestrevenue, bestmapping = revenue, mapping
+            bestroutes = tuple(shared._rebuild_route(problem, *r) for r in routes)
+
+    return bestrevenue, bestmapping, tuple(bestroutes)
@@ -16,11 +16,10 @@ import math
 import itertools
 import collections
 import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
 
 import node
 import edge
+import distances
 
 
 # Single-source benchmarks
@@ -29,11 +28,6 @@ single_source_benchmarks = tuple(os.listdir("../tests/single/"))
 # Multi-source benchmarks
 multi_source_benchmarks = tuple(os.listdir("../tests/multi/"))
 
-# Default colors for nodes, source nodes, adn depot
-NODES_COLOR = '#FDDD71'
-SOURCES_COLORS = ('#8FDDF4', '#8DD631', '#A5A5A5', '#DB35EF', '#8153AB')
-DEPOT_COLOR = '#F78181'
-
 
 
 def euclidean (inode, jnode):
@@ -56,7 +50,8 @@ class Problem:
     version of it.
     """
 
-    def __init__(self, name, n_nodes, n_vehicles, Tmax, sources, nodes, depot):
+    def __init__(self, name, n_nodes, n_vehicles, Tmax, sources, nodes, depot, *, dists=None, edges=None, edges_arrays=None,
+                 dtype=None, lazy=False, maxrows=1024):
         """
         Initialise.
 
@@ -67,10 +62,31 @@ class Problem:
         :param sources: The source nodes.
         :param nodes: The nodes to visit.
         :param depot: The depot.
+        :param dists: The matrix of distances between nodes if already known
+                    (e.g., a view on a shared memory block). In this case it is
+                    not computed again.
+        :param edges: The edges connecting the nodes if already known. In this
+                    case they are not instantiated again (the matrix of distances
+                    must be given too).
+        :param edges_arrays: The arrays of the edges (see edges_arrays) if already known
+                    (e.g., views on shared memory blocks). In this case the edges are not
+                    instantiated at all (the matrix of distances must be given too).
+        :param dtype: The precision used to store the distances and the savings (e.g., "float32"
+                    to halve the memory they use), by default float64 or the precision of
+                    the given matrix of distances (a different one is not accepted). The
+                    costs of the edges are rounded to this precision.
+        :param lazy: If True the matrix of distances is replaced by a distances.LazyDistances
+                    and the edges are not instantiated (the PJS builds those it needs),
+                    so that the memory does not grow with the square of the nodes.
+        :param maxrows: The number of rows of distances kept in memory (only lazy).
 
         :attr dists: The matrix of distances between nodes.
         :attr positions: A dictionary of nodes positions.
-        :attr edges: The edges connecting the nodes.
+        :attr edges: The edges connecting the nodes (None if only their arrays are given).
+        :attr savings: The savings of the edges as a matrix with a row for each
+                    source and a column for each edge (set by solver.set_savings).
+        :attr alpha: The alpha used to calculate the savings (set by solver.set_savings).
+        :attr routes_cache: The routes of the deterministic PJS already built (see pjs.PJS_cache).
         """
         self.name = name
         self.n_nodes = n_nodes
@@ -80,24 +96,57 @@ class Problem:
         self.nodes = nodes
         self.depot = depot
 
-        # Initialise edges list and nodes positions
-        edges = collections.deque()
-        dists = np.zeros((n_nodes, n_nodes))
-        # Calculate the matrix of distances and instantiate the edges
-        # and define nodes colors and positions
-        source_id = 0
-        for node1, node2 in itertools.permutations(itertools.chain(sources, nodes, (depot,)), 2):
-            # Calculate the edge cost
-            id1, id2 = node1.id, node2.id
-            cost = euclidean(node1, node2)
-            # Compile the oriented matrix of distances
-            dists[id1, id2] = cost
-            # Create the edge
-            if not node1.isdepot and not node2.issource:
-                edges.append(edge.Edge(node1, node2, cost))
+        if dists is None and (edges is not None or edges_arrays is not None):
+            raise Exception("The edges can be given only together with the matrix of distances.")
+        if dists is not None and dtype is not None and np.dtype(dtype) != dists.dtype:
+            raise Exception(f"The distances are stored as {dists.dtype}, not as {dtype}.")
+        dtype = dtype or "float64"
+
+        if dists is None and lazy:
+            # The distances are computed when needed and the rows of sources and depot are kept
+            coords = np.zeros((n_nodes, 2))
+            for node in self.iternodes():
+                coords[node.id] = node.x, node.y
+            pinned = [s.id for s in sources] + [depot.id]
+            dists = distances.LazyDistances(coords, maxrows=maxrows, pinned=pinned, dtype=dtype)
+
+        elif dists is None:
+            # Initialise edges list and nodes positions
+            edges = collections.deque()
+            dists = np.zeros((n_nodes, n_nodes), dtype=dtype)
+            # Calculate the matrix of distances and instantiate the edges
+            # and define nodes colors and positions
+            for node1, node2 in itertools.permutations(self.iternodes(), 2):
+                # Calculate the edge cost
+                id1, id2 = node1.id, node2.id
+                cost = euclidean(node1, node2)
+                # Compile the oriented matrix of distances
+                dists[id1, id2] = cost
+                # Create the edge
+                if not node1.isdepot and not node2.issource:
+                    edges.append(edge.Edge(node1, node2, cost))
+            # Round the edges costs to the precision of the distances
+            if dists.dtype != np.float64:
+                for e in edges:
+                    e.cost = float(dists[e.inode.id, e.jnode.id])
+
+        elif edges is None and edges_arrays is None and not isinstance(dists, distances.LazyDistances):
+            # Instantiate the edges using the given matrix of distances
+            # NOTE: Same order of itertools.permutations, but each row is converted to a list of floats
+            # at once (much faster than reading the matrix an element at a time).
+            edges = collections.deque(
+                edge.Edge(node1, node2, costs[node2.id])
+                for node1, costs in ((n, dists[n.id].tolist()) for n in self.iternodes() if not n.isdepot)
+                for node2 in self.iternodes()
+                if node2 is not node1 and not node2.issource
+            )
 
         self.dists = dists
         self.edges = edges
+        self.savings = None
+        self.alpha = None
+        self.routes_cache = {}
+        self._edges_arrays = edges_arrays
 
 
     def __hash__(self):
@@ -115,6 +164,23 @@ class Problem:
         ---------------------------------------------
         """
 
+    @property
+    def tolerance (self):
+        """
+        The tolerance used in the comparisons with Tmax to absorb the rounding
+        of distances stored with reduced precision (it is 0 for float64).
+        """
+        if self.dists.dtype == np.float64:
+            return 0.0
+        return self.Tmax * 4 * float(np.finfo(self.dists.dtype).eps)
+
+
+    @property
+    def lazy (self):
+        """ A property that says if the distances are computed when needed (see distances). """
+        return isinstance(self.dists, distances.LazyDistances)
+
+
     @property
     def multi_source (self):
         """ A property that says if the problem is multi-source or not. """
@@ -126,93 +192,35 @@ class Problem:
         return itertools.chain(self.sources, self.nodes, (self.depot,))
 
 
-
-def plot (problem, *, routes=tuple(), mapping=None, figsize=(6,4), title=None):
-    """
-    This method is used to plot a problem using a graph representation that
-    makes it easy-to-read.
-
-    :param figsize: The size of the plot.
-    :param title: The title of the plot.
-    :param routes: The eventual routes found.
-    """
-    plt.figure(figsize=figsize)
-    if title:
-        plt.title(title)
-
-    # Build the graph of nodes
-    colors, pos = [], {}
-    G = nx.DiGraph()
-    source_id = 0
-
-    for node in problem.iternodes():
-        # Compile the graph
-        pos[node.id] = (node.x, node.y)
-        G.add_node(node.id)
-
-        # Define nodes colors
-        if node.issource:
-            colors.append(SOURCES_COLORS[source_id])
-            source_id += 1
-        elif node.isdepot:
-            colors.append(DEPOT_COLOR)
-        else:
-            if mapping is None:
-                colors.append(NODES_COLOR)
-            else:
-                for i in range(len(problem.sources)):
-                    if mapping[i, node.id] == 1:
-                        colors.append(SOURCES_COLORS[i] + "60")
-                        break
-
-    # Save the routes
-    edges = []
-    for r in routes:
-        # NOTE: Nodes of the route are supposed to always be in the order in which
-        # they are stored inside the deque.
-        nodes = tuple(r.nodes)
-        edges.extend([(r.source.id, nodes[0].id), (nodes[-1].id, r.depot.id)])
-        for n1, n2 in zip(nodes[:-1], nodes[1:]):
-            edges.append((n1.id, n2.id))
-
-    nx.draw(G, pos=pos, node_color=colors, edgelist=edges, with_labels=True, node_size=100, font_size=6, font_weight="bold")
-    plt.show()
-
-
-
-def export (problem, path):
-    """
-    This method exports the problem into a text file.
-
-    :param problem: The problem to export.
-    :param path: The directory where the problem will be saved.
-    """
-    with open(path + problem.name, 'w') as file:
-        # Export number of nodes, number of vehicles, and Tmax
-        file.write(f"n {problem.n_nodes}\n")
-        file.write(f"m {problem.n_vehicles}\n")
-        file.write(f"tmax {problem.Tmax}\n")
-        # For each node
-        for node in problem.iternodes():
-            # Export coordinates and reveneu
-            file.write(f"{round(node.x, 1)}\t{round(node.y, 1)}\t{node.revenue}\t")
-            # If multi-source import indicator of source nodes and number of
-            # vehicles starting from each source.
-            if problem.multi_source:
-                file.write(f"{int(node.issource)}\t{node.vehicles}")
-            file.write('\n')
-
-
+    def edges_arrays (self):
+        """
+        The edges as arrays (computed only once): the ids of the starting nodes,
+        the ids of the ending nodes, the costs, and the sum of the revenues of
+        the two nodes.
+        """
+        if self.lazy:
+            raise Exception("The edges of a problem with lazy distances are not instantiated.")
+        if self._edges_arrays is None:
+            edges, E = self.edges, len(self.edges)
+            self._edges_arrays = (
+                np.fromiter((e.inode.id for e in edges), dtype="int64", count=E),
+                np.fromiter((e.jnode.id for e in edges), dtype="int64", count=E),
+                np.fromiter((e.cost for e in edges), dtype="float64", count=E),
+                np.fromiter((e.inode.revenue + e.jnode.revenue for e in edges), dtype="float64", count=E),
+            )
+        return self._edges_arrays
 
 
 
-def read_single_source (filename, path="../tests/single/"):
+def read_single_source (filename, path="../tests/single/", *, dtype="float64", lazy=False):
     """
     This method is used to read a single-source Team Orienteering Problem
     from a file and returns a standard Problem instance.
 
     :param filename: The name of the file to read.
     :param path: The path where the file is.
+    :param dtype: The precision used to store the distances (see Problem).
+    :param lazy: If True the distances are computed when needed (see Problem).
     :return: The problem instance.
     """
     with open(path + filename, 'r') as file:
@@ -227,8 +235,8 @@ def read_single_source (filename, path="../tests/single/"):
             node_info = line.split('\t')
             if i == 0:
                 # Add a source node
-                sources.append(node.Node(i, float(node_info[0]), float(node_info[1]), int(node_info[2]),
-                              issource=True, vehicles=n_vehicles))
+                sources.append(node.Source(i, float(node_info[0]), float(node_info[1]), int(node_info[2]),
+                              vehicles=n_vehicles))
             elif i == n_nodes - 1:
                 # Add the depot
                 depot = node.Node(i, float(node_info[0]), float(node_info[1]), int(node_info[2]), isdepot=True)
@@ -237,17 +245,19 @@ def read_single_source (filename, path="../tests/single/"):
                 nodes.append(node.Node(i, float(node_info[0]), float(node_info[1]), int(node_info[2])))
 
         # Instantiate and return the problem
-        return Problem(filename, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot)
+        return Problem(filename, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot, dtype=dtype, lazy=lazy)
 
 
 
-def read_multi_source (filename, path="../tests/multi/"):
+def read_multi_source (filename, path="../tests/multi/", *, dtype="float64", lazy=False):
     """
     This method is used to read a multi-source Team Orienteering Problem
     from a file and returns a standard Problem instance.
 
     :param filename: The name of the file to read.
     :param path: The path where the file is.
+    :param dtype: The precision used to store the distances (see Problem).
+    :param lazy: If True the distances are computed when needed (see Problem).
     :return: The problem instance.
     """
     with open(path + filename, 'r') as file:
@@ -266,18 +276,65 @@ def read_multi_source (filename, path="../tests/multi/"):
                 continue
             # If the node is source
             if node_info[3] == '1':
-                sources.append(node.Node(i, float(node_info[0]), float(node_info[1]), int(node_info[2]),
-                              issource=True, vehicles=int(node_info[4])))
+                sources.append(node.Source(i, float(node_info[0]), float(node_info[1]), int(node_info[2]),
+                              vehicles=int(node_info[4])))
             else:
                 # Add a node to visit
                 nodes.append(node.Node(i, float(node_info[0]), float(node_info[1]), int(node_info[2])))
 
         # Instantiate and return the problem
-        return Problem(filename, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot)
+        return Problem(filename, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot, dtype=dtype, lazy=lazy)
+
+
+
+def _exact_translation (old, new):
+    """
+    True if the coordinates new are exactly (i.e., without rounding) the coordinates
+    old plus a constant, so that the differences between them and then the distances
+    are the same. The rounding error of each sum is calculated as in the TwoSum algorithm.
+    """
+    t = new[0] - old[0]
+    s = old + t
+    b = s - old
+    error = (old - (s - b)) + (t - b)
+    return bool(np.all(s == new) and np.all(error == 0))
 
 
 
-def merge (*problems, name="pmulti.txt", non_negative=False):
+def _merged_distances (problems, groups, coords, depot_id, dtype):
+    """
+    The matrix of distances of a merged problem (see merge).
+
+    The block of the distances between the nodes of a problem is taken from the problem
+    when it was translated exactly, the other blocks (i.e., between nodes of different
+    problems) are computed at once. The distances are the same that Problem would compute.
+
+    :param problems: The merged problems.
+    :param groups: For each problem, the old ids and the new ids of its nodes (except the depot).
+    :param coords: The coordinates of the merged nodes (a row for each new id).
+    :param depot_id: The id of the depot.
+    :param dtype: The precision of the distances.
+    :return: The matrix of distances.
+    """
+    n_nodes = len(coords)
+    calc = distances.LazyDistances(coords, dtype=dtype)
+    dists = np.zeros((n_nodes, n_nodes), dtype=dtype)
+    dists[depot_id] = dists[:, depot_id] = calc.compute(depot_id, slice(None))
+    for a, (problem, (old, new)) in enumerate(zip(problems, groups)):
+        for _, inew in groups[a + 1:]:
+            dists[np.ix_(new, inew)] = block = calc.compute(new[:, None], inew[None, :])
+            dists[np.ix_(inew, new)] = block.T
+        pdists = problem.dists
+        if (isinstance(pdists, np.ndarray) and pdists.dtype in (np.float64, np.dtype(dtype))
+                and _exact_translation(np.array([(n.x, n.y) for n in problem.iternodes() if not n.isdepot]), coords[new])):
+            dists[np.ix_(new, new)] = pdists[np.ix_(old, old)]
+        else:
+            dists[np.ix_(new, new)] = calc.compute(new[:, None], new[None, :])
+    return dists
+
+
+
+def merge (*problems, name="pmulti.txt", non_negative=False, dtype="float64", lazy=False):
     """
     This method merges many TOP problem instances to create a
     multi-source TOP problem instance.
@@ -289,7 +346,12 @@ def merge (*problems, name="pmulti.txt", non_negative=False):
     :param problems: The problem to merge.
     :param name: The name given to the new multi-source problem.
     :param non_negative: If True avoid negative coordinates (it does not have any real impact).
+    :param dtype: The precision used to store the distances (see Problem).
+    :param lazy: If True the distances are computed when needed (see Problem).
     :return: A new multi-source problem instance.
+
+    NOTE: The distances between the nodes of each problem are taken from it when possible
+    (see _merged_distances), so only those between different problems are computed.
     """
     # Init name and parameters of the new problem
     n_sources = sum(len(p.sources) for p in problems)
@@ -304,19 +366,22 @@ def merge (*problems, name="pmulti.txt", non_negative=False):
     source_id = 0
     node_id = n_sources
     # Find the sources and the nodes
-    sources, nodes = [], []
+    sources, nodes, groups = [], [], []
     for i, problem in enumerate(problems):
         # Calculate of how much the current problem must be
         # translated so that its depot match with that of the
         # other problems.
         dx = depot.x - problem.depot.x
         dy = depot.y - problem.depot.y
+        old_ids, new_ids = [], []
+        groups.append((old_ids, new_ids))
         # For each node...
         for node in problem.iternodes():
             # If the node is the depot there is no need to consider it
             if node.isdepot:
                 continue
             # Make a copy of the node
+            old_ids.append(node.id)
             node = node.__copy__()
             # Translate the node
             node.x += dx
@@ -325,11 +390,13 @@ def merge (*problems, name="pmulti.txt", non_negative=False):
             if node.issource:
                 sources.append(node)
                 node.id = source_id
+                new_ids.append(source_id)
                 source_id += 1
                 continue
             # If the node is not a source append it to normal nodes
             nodes.append(node)
             node.id = node_id
+            new_ids.append(node_id)
             node_id += 1
     # Eventually translate the graph to avoid negative coordinates
     if non_negative:
@@ -345,7 +412,15 @@ def merge (*problems, name="pmulti.txt", non_negative=False):
                 node.x += dx
                 node.y += dy
 
-    return Problem(name, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot)
+    if lazy:
+        return Problem(name, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot, dtype=dtype, lazy=lazy)
+
+    coords = np.zeros((n_nodes, 2))
+    for n in itertools.chain(sources, nodes, (depot,)):
+        coords[n.id] = n.x, n.y
+    groups = [(np.array(old, dtype=np.intp), np.array(new, dtype=np.intp)) for old, new in groups]
+    dists = _merged_distances(problems, groups, coords, depot.id, dtype)
+    return Problem(name, n_nodes, n_vehicles, Tmax, tuple(sources), tuple(nodes), depot, dists=dists)
 
 
 